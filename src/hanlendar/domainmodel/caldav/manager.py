@@ -99,6 +99,7 @@ class CalDAVManager( Manager ):
 
     def __init__(self, connector, ioDir=None):
         """Constructor."""
+        super().__init__()
         self._connector: CalDAVConnector = connector
         self._localManager = LocalManager( ioDir )
 
@@ -121,18 +122,18 @@ class CalDAVManager( Manager ):
         if calendar is None:
             return
 
-        self._localManager.tasks.clear()
-
         ### sync events
         all_events = calendar.events()
         dangling_children = []
-        ## event: caldav.objects.Event = None
-        for event in all_events:
-            iCalendar: icalendar.cal.Calendar = event.icalendar_instance
-            _, children = import_icalendar( self._localManager, iCalendar )
-            dangling_children.extend( children )
+        with self.batch():
+            self.tasks = list()
+            ## event: caldav.objects.Event = None
+            for event in all_events:
+                iCalendar: icalendar.cal.Calendar = event.icalendar_instance
+                _, children = import_icalendar( self, iCalendar )
+                dangling_children.extend( children )
 
-        fix_dangling_tasks( self._localManager, dangling_children )
+            fix_dangling_tasks( self, dangling_children )
 
         if len( dangling_children ) > 0:
             _LOGGER.warning( "not all children could be handled properly" )
@@ -141,7 +142,7 @@ class CalDAVManager( Manager ):
                 child, parent_uuid = item
                 print( "item:", child.UID, child.title, parent_uuid )
             print( "tasks:" )
-            for task in self._localManager.getTasksAll():
+            for task in self.getTasksAll():
                 print( "item:", task.UID, task.title )
 
     def saveToServer(self):
@@ -170,17 +171,39 @@ class CalDAVManager( Manager ):
 
     ## ======================================================================
 
+    ## items are attached to this manager -- forward changes to local manager,
+    ## otherwise it would not notice changes to store
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        super().itemChanged( item, field )
+        self._localManager.itemChanged( item, field )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        super().subItemAdded( parent, item )
+        self._localManager.subItemAdded( parent, item )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        super().subItemRemoved( parent, item )
+        self._localManager.subItemRemoved( parent, item )
+
+    ## overriden
+    def _collectNotesChange(self):
+        super()._collectNotesChange()
+        self._localManager._collectNotesChange()
+
+    ## ======================================================================
+
     # override
     def _getTasks( self ):
         return self._localManager._getTasks()
 
     # override
     def _setTasks( self, value ):
-        self._localManager._setTasks( value )
-
-    ## overriden
-    def getTasksAll(self):
-        return self._localManager.getTasksAll()
+        ## invalidates change trackers of local manager (items are attached back to this manager)
+        self._localManager.tasks = value
 
     # override
     def createEmptyTask(self):
@@ -192,11 +215,7 @@ class CalDAVManager( Manager ):
 
     ## overriden
     def _setToDos( self, value ):
-        self._localManager._setToDos( value )
-
-    ## overriden
-    def getTodosAll(self):
-        return self._localManager.getTodosAll()
+        self._localManager.todos = value
 
     # override
     def createEmptyToDo(self):
@@ -0,0 +1,130 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+from enum import Enum, unique, auto
+
+from datetime import date, datetime
+
+from hanlendar.domainmodel.item import Item
+from hanlendar.domainmodel.task import Task, DateRange
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@unique
+class ChangeType(Enum):
+    ADDED     = auto()
+    REMOVED   = auto()
+    MODIFIED  = auto()
+    MOVED     = auto()
+
+
+class ChangeEvent():
+    """Single change of item (with its subitems).
+
+    Date windows cover all days that could contain occurrences of item before
+    and after the change. Window with 'end' set to None is not bounded (endless recurrence).
+    """
+
+    def __init__(self, changeType: ChangeType, item: Item, oldWindow: DateRange = None, newWindow: DateRange = None):
+        self.changeType: ChangeType = changeType
+        self.item: Item             = item
+        self.oldWindow: DateRange   = oldWindow
+        self.newWindow: DateRange   = newWindow
+
+    @staticmethod
+    def added( item: Item ) -> 'ChangeEvent':
+        return ChangeEvent( ChangeType.ADDED, item, None, date_window( item ) )
+
+    @staticmethod
+    def removed( item: Item ) -> 'ChangeEvent':
+        return ChangeEvent( ChangeType.REMOVED, item, date_window( item ), None )
+
+    @staticmethod
+    def modified( item: Item, oldWindow: DateRange ) -> 'ChangeEvent':
+        return ChangeEvent( ChangeType.MODIFIED, item, oldWindow, date_window( item ) )
+
+    @staticmethod
+    def moved( item: Item, oldWindow: DateRange ) -> 'ChangeEvent':
+        ## moved item can inherit recurrence from new parent
+        return ChangeEvent( ChangeType.MOVED, item, oldWindow, date_window( item ) )
+
+    def isStructural(self) -> bool:
+        """Return True if position of item in tree changed."""
+        return self.changeType is not ChangeType.MODIFIED
+
+    def getDateWindows(self):
+        return [ window for window in ( self.oldWindow, self.newWindow ) if window is not None ]
+
+    def affectsDates(self, startDate: date, endDate: date) -> bool:
+        """Check if change could modify occurrences in given range of days (inclusive)."""
+        for window in self.getDateWindows():
+            if window.end is not None and window.end < startDate:
+                continue
+            if window.start > endDate:
+                continue
+            return True
+        return False
+
+    def __str__(self):
+        return "[%s %s old:%s new:%s]" % ( self.changeType.name, self.item.title, self.oldWindow, self.newWindow )
+
+
+def date_window( item: Item ) -> DateRange:
+    """Return range of days covering occurrences of item and its subitems or None if item has no dates."""
+    windowStart: date = None
+    windowEnd: date   = None
+    unbounded = False
+    for subItem in Item.getAllSubItemsFromList( [ item ] ):
+        if isinstance( subItem, Task ) is False:
+            continue
+        dateRange = subItem.getDateTimeRange()
+        itemDates = [ to_date( value ) for value in ( dateRange.start, dateRange.end ) if value is not None ]
+        if not itemDates:
+            continue
+        itemStart = min( itemDates )
+        itemEnd   = max( itemDates )
+        recurrence = subItem.getAppliedRecurrence()
+        if recurrence is not None and recurrence.isValid():
+            if recurrence.endDate is None:
+                unbounded = True
+            else:
+                ## last occurrence can start at end of recurrence
+                itemEnd = max( itemEnd, recurrence.endDate + ( itemEnd - itemStart ) )
+        if windowStart is None or itemStart < windowStart:
+            windowStart = itemStart
+        if windowEnd is None or itemEnd > windowEnd:
+            windowEnd = itemEnd
+    if windowStart is None:
+        return None
+    if unbounded:
+        windowEnd = None
+    return DateRange( windowStart, windowEnd )
+
+
+def to_date( value ) -> date:
+    if isinstance( value, datetime ):
+        return value.date()
+    return value
@@ -0,0 +1,61 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+
+from typing import Set
+
+from hanlendar.domainmodel.item import Item
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ChangeSet():
+    """Items affected by batch of modifications (see 'Manager.batch()')."""
+
+    def __init__(self):
+        self.taskUIDs: Set[str] = set()
+        self.todoUIDs: Set[str] = set()
+        self.notesChanged = False
+
+    def addTask(self, item: Item):
+        self.taskUIDs.add( item.UID )
+
+    def addToDo(self, item: Item):
+        self.todoUIDs.add( item.UID )
+
+    def getUIDs(self) -> Set[str]:
+        return self.taskUIDs | self.todoUIDs
+
+    def isEmpty(self):
+        if self.taskUIDs:
+            return False
+        if self.todoUIDs:
+            return False
+        if self.notesChanged:
+            return False
+        return True
+
+    def __str__(self):
+        return "[tasks:%s todos:%s notes:%s]" % ( len( self.taskUIDs ), len( self.todoUIDs ), self.notesChanged )
@@ -0,0 +1,212 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import heapq
+import itertools
+
+from typing import Dict, List
+from datetime import datetime
+
+from hanlendar.domainmodel.item import Item, ItemListener
+from hanlendar.domainmodel.task import Task
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TaskHeap():
+    """Min-heap of tasks with removal of entries.
+
+    Removed entries are marked and skipped (lazy deletion).
+    """
+
+    def __init__(self):
+        self._heap: List[list] = list()
+        self._entries: Dict[Task, list] = dict()
+        self._counter = itertools.count()
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+
+    def __len__(self):
+        return len( self._entries )
+
+    def push(self, task: Task, key):
+        self.remove( task )
+        if key is None:
+            return
+        entry = [ key, next( self._counter ), task ]
+        self._entries[ task ] = entry
+        heapq.heappush( self._heap, entry )
+
+    def remove(self, task: Task):
+        entry = self._entries.pop( task, None )
+        if entry is None:
+            return
+        entry[2] = None
+        if len( self._heap ) > 2 * len( self._entries ) + 32:
+            ## too many removed entries -- compact
+            self._heap = [ item for item in self._heap if item[2] is not None ]
+            heapq.heapify( self._heap )
+
+    def getKey(self, task: Task):
+        entry = self._entries.get( task, None )
+        if entry is None:
+            return None
+        return entry[0]
+
+    def top(self) -> Task:
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop( heap )
+        if not heap:
+            return None
+        return heap[0][2]
+
+    def getBelow(self, limit, inclusive=False) -> List[Task]:
+        """Return tasks with key lower than limit ordered by key."""
+        found = list()
+        heap = self._heap
+        stack = [ 0 ]
+        while stack:
+            index = stack.pop()
+            if index >= len( heap ):
+                continue
+            entry = heap[ index ]
+            if entry[0] > limit or ( entry[0] == limit and inclusive is False ):
+                ## children have greater keys
+                continue
+            if entry[2] is not None:
+                found.append( entry )
+            stack.append( 2 * index + 1 )
+            stack.append( 2 * index + 2 )
+        found.sort()
+        return [ entry[2] for entry in found ]
+
+
+class DeadlineScheduler( ItemListener ):
+    """Keeps not completed tasks ordered by time of due and time of first reminder."""
+
+    ## changes of fields that require update of task
+    TIME_FIELDS = frozenset( [ "startDateTime", "dueDateTime", "recurrentOffset", "reminderList" ] )
+
+    def __init__(self):
+        self._valid = False
+        self._dueHeap    = TaskHeap()
+        self._remindHeap = TaskHeap()
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self._dueHeap.clear()
+        self._remindHeap.clear()
+
+    def build(self, tasksList: List[Task]):
+        self.invalidate()
+        for task in tasksList:
+            self.updateTask( task )
+        self._valid = True
+
+    def getNextDeadline(self) -> Task:
+        return self._dueHeap.top()
+
+    def getDeadlinedTasks(self, currTime: datetime = None) -> List[Task]:
+        if currTime is None:
+            currTime = datetime.today()
+        return self._dueHeap.getBelow( currTime )
+
+    def getRemindedTasks(self, currTime: datetime = None) -> List[Task]:
+        if currTime is None:
+            currTime = datetime.today()
+        return self._remindHeap.getBelow( currTime, inclusive=True )
+
+    ## ======================================================================
+
+    def updateTask(self, task: Task):
+        if task.isCompleted():
+            self.removeTask( task )
+            return
+        ## occurrence due moves forward with each completed occurrence of recurrent task
+        dueTime = task.occurrenceDue
+        self._dueHeap.push( task, dueTime )
+        remindTime = None
+        if dueTime is not None:
+            remindOffset = task.getReminderGreatest()
+            if remindOffset is not None:
+                remindTime = dueTime - remindOffset
+        self._remindHeap.push( task, remindTime )
+
+    def removeTask(self, task: Task):
+        self._dueHeap.remove( task )
+        self._remindHeap.remove( task )
+
+    def updateTaskTree(self, task: Task):
+        self.updateTask( task )
+        for subTask in task.getAllSubItems():
+            self.updateTask( subTask )
+
+    def removeTaskTree(self, task: Task):
+        self.removeTask( task )
+        for subTask in task.getAllSubItems():
+            self.removeTask( subTask )
+
+    def updateAncestors(self, item: Item):
+        ## completion of task depends on completion of subtasks
+        while item is not None:
+            self.updateTask( item )
+            item = item.getParent()
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        if self._valid is False:
+            return
+        if field == "recurrence":
+            ## subtasks can inherit recurrence
+            self.updateTaskTree( item )
+            return
+        if field == "completed":
+            self.updateAncestors( item )
+            return
+        if field in self.TIME_FIELDS:
+            self.updateTask( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.updateTaskTree( item )
+        self.updateAncestors( parent )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.removeTaskTree( item )
+        self.updateAncestors( parent )
@@ -122,14 +122,15 @@ def import_icalendar_content( manager: Manager, content: str ):
         dangling_children = []
         extracted_ical = extract_ical( content )
         calendar: icalendar.cal.Calendar = icalendar.cal.Calendar.from_ical( extracted_ical )
-        tasks, children = import_icalendar( manager, calendar )
-        dangling_children.extend( children )
-        for task in tasks:
-            if task.reminderList is None:
-                continue
-            if len(task.reminderList) > 0:
-                continue
-            task.addReminderDays( 1 )
+        with manager.batch():
+            tasks, children = _import_icalendar( manager, calendar )
+            dangling_children.extend( children )
+            for task in tasks:
+                if task.reminderList is None:
+                    continue
+                if len(task.reminderList) > 0:
+                    continue
+                task.addReminderDays( 1 )
         return tasks, dangling_children
     except ValueError as ex:
         _LOGGER.warning( "unable to import calendar data: %s", ex )
@@ -137,6 +138,11 @@ def import_icalendar_content( manager: Manager, content: str ):
 
 
 def import_icalendar( manager: Manager, calendar: icalendar.cal.Calendar ):
+    with manager.batch():
+        return _import_icalendar( manager, calendar )
+
+
+def _import_icalendar( manager: Manager, calendar: icalendar.cal.Calendar ):
     tasks = []
     dangling_children = []
     for component in calendar.walk():
@@ -208,6 +214,11 @@ def import_icalendar( manager: Manager, calendar: icalendar.cal.Calendar ):
 
 
 def fix_dangling_tasks( manager: Manager, dangling_children ):
+    with manager.batch():
+        _fix_dangling_tasks( manager, dangling_children )
+
+
+def _fix_dangling_tasks( manager: Manager, dangling_children ):
     ## handle dangling children
     while len(dangling_children) > 0:
         handled = False
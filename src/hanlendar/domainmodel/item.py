@@ -33,9 +33,38 @@ def generate_uid():
     return str( uuid.uuid4() ) + "@hanlendar"
 
 
+class ItemListener():
+    """Receiver of notifications about changes in items tree.
+
+    Listener is attached to root item and receives notifications from
+    all items in the tree.
+    """
+
+    @abc.abstractmethod
+    def itemChanged(self, item: 'Item', field: str):
+        raise NotImplementedError('You need to define this method in derived class!')
+
+    @abc.abstractmethod
+    def subItemAdded(self, parent: 'Item', item: 'Item'):
+        raise NotImplementedError('You need to define this method in derived class!')
+
+    @abc.abstractmethod
+    def subItemRemoved(self, parent: 'Item', item: 'Item'):
+        raise NotImplementedError('You need to define this method in derived class!')
+
+
 class Item():
     """Base class for Task and ToDo."""
 
+    ## fields not persisted
+    _transient_fields = ( "_listener", "_completedState" )
+
+    ## listener of changes (set only on root items)
+    _listener: ItemListener = None
+
+    ## cached result of 'isCompleted()' (None if not calculated)
+    _completedState: bool = None
+
     @abc.abstractmethod
     def getParent(self):
         raise NotImplementedError('You need to define this method in derived class!')
@@ -68,6 +97,7 @@ class Item():
 
     def setUID(self, value):
         self._setUID( value )
+        self._notifyChanged( "UID" )
 
     @property
     def UID(self):
@@ -92,6 +122,7 @@ class Item():
 
     def setTitle(self, value):
         self._setTitle( value )
+        self._notifyChanged( "title" )
 
     @property
     def title(self):
@@ -116,6 +147,7 @@ class Item():
 
     def setDescription(self, value):
         self._setDescription( value )
+        self._notifyChanged( "description" )
 
     @property
     def description(self):
@@ -144,6 +176,8 @@ class Item():
         elif value > 100:
             value = 100
         self._setCompleted( value )
+        self._invalidateCompleted()
+        self._notifyChanged( "completed" )
 
     @property
     def completed(self):
@@ -154,6 +188,18 @@ class Item():
         self.setCompleted( value )
 
     def isCompleted(self):
+        """Return True if item and all its subitems are completed.
+
+        State is cached and dropped on change of completion or subitems of
+        the item or any of its descendants.
+        """
+        state = self._completedState
+        if state is None:
+            state = self._calculateCompleted()
+            self._completedState = state
+        return state
+
+    def _calculateCompleted(self):
         if self.completed < 100:
             return False
         subitems = self.getSubitems()
@@ -164,6 +210,14 @@ class Item():
                 return False
         return True
 
+    def _invalidateCompleted(self):
+        ## item state is calculated from subitems, so cached ancestor
+        ## always has cached state of subitems it depends on
+        currItem = self
+        while currItem is not None and currItem._completedState is not None:
+            currItem._completedState = None
+            currItem = currItem.getParent()
+
     ## ========================================================================
 
     @abc.abstractmethod
@@ -181,6 +235,7 @@ class Item():
         if value > 9:
             value = 9
         self._setPriority( value )
+        self._notifyChanged( "priority" )
 
     @property
     def priority(self):
@@ -190,6 +245,34 @@ class Item():
     def priority(self, value):
         self.setPriority( value )
 
+    ## ========================================================================
+
+    def getListener(self) -> ItemListener:
+        """Return listener of tree containing the item."""
+        rootItem = self.getRootItem()
+        if rootItem is None:
+            return None
+        return rootItem._listener
+
+    def setListener(self, listener: ItemListener):
+        """Attach listener to item. Takes effect only on root items."""
+        self._listener = listener
+
+    def _notifyChanged(self, field: str):
+        listener = self.getListener()
+        if listener is not None:
+            listener.itemChanged( self, field )
+
+    def _notifySubItemAdded(self, item: 'Item'):
+        listener = self.getListener()
+        if listener is not None:
+            listener.subItemAdded( self, item )
+
+    def _notifySubItemRemoved(self, item: 'Item'):
+        listener = self.getListener()
+        if listener is not None:
+            listener.subItemRemoved( self, item )
+
     ## ========================================================================
     ## ========================================================================
 
@@ -236,6 +319,9 @@ class Item():
         else:
             subitems.insert( index, item )
             item.setParent( self )
+        item.setListener( None )
+        self._invalidateCompleted()
+        self._notifySubItemAdded( item )
         return item
 
     def removeSubItem(self, item):
@@ -258,42 +344,109 @@ class Item():
     @staticmethod
     def getAllSubItemsFromList( itemList ):
         """Return all sub items from tree."""
-        if itemList is None:
-            return list()
         retList = list()
+        Item._appendSubItems( itemList, retList )
+        return retList
+
+    @staticmethod
+    def _appendSubItems( itemList, retList ):
+        if itemList is None:
+            return
         for item in itemList:
             retList.append( item )
-            retList += item.getAllSubItems()
-        return retList
+            Item._appendSubItems( item.getSubitems(), retList )
 
     @staticmethod
     def removeSubItemFromList( itemList, item ):
         if itemList is None:
             return None
-        for i, _ in enumerate(itemList):
-            currItem = itemList[i]
-            if currItem == item:
-                popped = itemList.pop( i )
-                popped.setParent( None )
-                return popped
-            removed = currItem.removeSubItem( item )
-            if removed is not None:
-                return removed
-        return None
+        position = Item.findItemPosition( itemList, item )
+        if position is None:
+            return None
+        ownerList, i = position
+        popped = ownerList.pop( i )
+        parent = popped.getParent()
+        popped.setParent( None )
+        if parent is not None:
+            parent._invalidateCompleted()
+            parent._notifySubItemRemoved( popped )
+        return popped
 
     @staticmethod
     def replaceSubItemInList( itemList, oldItem, newItem ):
         if itemList is None:
             return None
-        for i, _ in enumerate(itemList):
-            currItem = itemList[i]
-            if currItem == oldItem:
-                newItem.setParent( oldItem.getParent() )
-                itemList[i] = newItem
-                return True
-            if currItem.replaceSubItem( oldItem, newItem ) is True:
-                return True
-        return False
+        position = Item.findItemPosition( itemList, oldItem )
+        if position is None:
+            return False
+        ownerList, i = position
+        parent = oldItem.getParent()
+        newItem.setParent( parent )
+        ownerList[i] = newItem
+        if parent is not None:
+            parent._invalidateCompleted()
+            parent._notifySubItemRemoved( oldItem )
+            parent._notifySubItemAdded( newItem )
+        return True
+
+    @staticmethod
+    def findItemPosition( itemList, item ):
+        """Return pair of list containing the item and index in the list.
+
+        Item is searched in tree of given list. Returns None if item is not found.
+        """
+        position = Item._findPositionByParent( itemList, item )
+        if position is not None:
+            return position
+        ## parent links are not consistent with lists -- search whole tree
+        return Item._searchPosition( itemList, item )
+
+    @staticmethod
+    def _findPositionByParent( itemList, item ):
+        if not itemList:
+            return None
+        ## all items of list share the same parent
+        listOwner = itemList[0].getParent()
+        currItem = item
+        visitedItems = set()
+        while True:
+            if currItem is None or currItem in visitedItems:
+                return None
+            visitedItems.add( currItem )
+            currParent = currItem.getParent()
+            if currParent is listOwner:
+                break
+            currItem = currParent
+        if listOwner is None:
+            rootIndex = find_index( itemList, currItem )
+            if rootIndex < 0:
+                ## item belongs to other tree
+                return None
+            if currItem is item:
+                return ( itemList, rootIndex )
+        parent = item.getParent()
+        if parent is None:
+            ownerList = itemList
+        else:
+            ownerList = parent.getSubitems()
+            if ownerList is None:
+                return None
+        i = find_index( ownerList, item )
+        if i < 0:
+            return None
+        return ( ownerList, i )
+
+    @staticmethod
+    def _searchPosition( itemList, item ):
+        if itemList is None:
+            return None
+        for i, currItem in enumerate(itemList):
+            if currItem == item:
+                return ( itemList, i )
+            position = Item._searchPosition( currItem.getSubitems(), item )
+            if position is not None:
+                return position
+        return None
 
     @staticmethod
     def getItemCoords( itemsList, item ):
@@ -347,9 +500,21 @@ class Item():
         item = itemsList[ elemIndex ]
         if not itemCoords:
             itemsList.pop( elemIndex )
+            parent = item.getParent()
+            if parent is not None:
+                parent._invalidateCompleted()
+                parent._notifySubItemRemoved( item )
             return item
         return item.detachChildByCoords( itemCoords )
 
     @staticmethod
     def sortByPriority( item ):
         return item.priority
+
+
+def find_index( itemList, item ) -> int:
+    """Return index of item in list or -1 if not found."""
+    try:
+        return itemList.index( item )
+    except ValueError:
+        return -1
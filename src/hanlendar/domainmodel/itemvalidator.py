@@ -0,0 +1,137 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+
+from typing import Dict, List, Tuple
+
+from hanlendar.domainmodel.item import Item
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ValidationReport():
+    """Repairs made while validating tree of items."""
+
+    def __init__(self):
+        self.addedRoots: List[Item]   = list()      ## roots of parent chains missing in root list
+        self.removedRoots: List[Item] = list()      ## items with parent removed from root list
+        self.reparented: List[ Tuple[Item, Item, Item] ] = list()     ## item, old parent, new parent
+
+    def isEmpty(self):
+        if self.addedRoots:
+            return False
+        if self.removedRoots:
+            return False
+        if self.reparented:
+            return False
+        return True
+
+    def __str__(self):
+        return "[added roots:%s removed roots:%s reparented:%s]" % ( len( self.addedRoots ),
+                                                                    len( self.removedRoots ),
+                                                                    len( self.reparented ) )
+
+
+def validate_items( rootList: List[Item], addRoot ) -> ValidationReport:
+    """Check links between items and fix found problems.
+
+    Lists of subitems are treated as source of truth for parent links.
+    'addRoot' is called to add missing root item to 'rootList'.
+    """
+    report = ValidationReport()
+    rootSet = set( rootList )
+
+    ## roots of parent chains not present in root list
+    rootsCache: Dict[ Item, Item ] = dict()
+    for item in Item.getAllSubItemsFromList( rootList ):
+        rootItem = find_root( item, rootsCache )
+        if rootItem is None or rootItem in rootSet:
+            continue
+        _LOGGER.warning( "fixing task ancestor -- adding root task %s %s", rootItem.title, rootItem.UID )
+        addRoot( rootItem )
+        rootSet.add( rootItem )
+        report.addedRoots.append( rootItem )
+
+    ## items with parent placed in root list
+    validRoots = list()
+    for item in rootList:
+        if item.getParent() is None:
+            validRoots.append( item )
+            continue
+        _LOGGER.warning( "fixing root tasks -- removing child %s %s", item.title, item.UID )
+        item.setListener( None )
+        report.removedRoots.append( item )
+    if report.removedRoots:
+        rootList[:] = validRoots
+
+    ## parent links not matching lists of subitems
+    visited = set( rootList )
+    stack = list( rootList )
+    while stack:
+        item = stack.pop()
+        subitems = item.getSubitems()
+        if not subitems:
+            continue
+        for child in subitems:
+            if child in visited:
+                _LOGGER.warning( "item '%s' found more than once in tree", child.title )
+                continue
+            visited.add( child )
+            stack.append( child )
+            childParent = child.getParent()
+            if childParent is item:
+                continue
+            _LOGGER.warning( "task '%s' have invalid parent -- moved to task %s", child.title, item.title )
+            child.setParent( item )
+            report.reparented.append( ( child, childParent, item ) )
+
+    return report
+
+
+def find_root( item: Item, rootsCache: Dict[ Item, Item ] ) -> Item:
+    """Return root of item following parent links or None in case of cycle.
+
+    Found roots are stored in 'rootsCache', so each link is followed only once.
+    """
+    path = list()
+    pathSet = set()
+    currItem = item
+    while True:
+        if currItem in rootsCache:
+            rootItem = rootsCache[ currItem ]
+            break
+        if currItem in pathSet:
+            _LOGGER.warning( "cycle detected -- unable to find root item" )
+            rootItem = None
+            break
+        path.append( currItem )
+        pathSet.add( currItem )
+        currParent = currItem.getParent()
+        if currParent is None:
+            rootItem = currItem
+            break
+        currItem = currParent
+    for pathItem in path:
+        rootsCache[ pathItem ] = rootItem
+    return rootItem
@@ -0,0 +1,397 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from datetime import datetime
+
+import os
+import logging
+import pickle
+import struct
+import hashlib
+import threading
+
+from typing import Dict, List
+
+from hanlendar import persist
+from hanlendar.domainmodel.item import Item, ItemListener
+from hanlendar.domainmodel.local.task import LocalTask
+from hanlendar.domainmodel.local.todo import LocalToDo
+from hanlendar.domainmodel.local.journal import get_fields
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+MANIFEST_EXTENSION = ".manifest"
+
+## pack record header: hash of blob and size of blob
+RECORD_HEADER = struct.Struct( ">32sI" )
+
+## maximum number of hashes in node of list tree
+LIST_NODE_SIZE = 64
+
+
+class ItemHashCache( ItemListener ):
+    """Hashes of items stored in history.
+
+    Hash of item depends on its fields and hashes of its subitems, so change
+    of item drops hashes of the item and all its ancestors.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[ Item, bytes ] = dict()
+
+    def get(self, item: Item) -> bytes:
+        return self._hashes.get( item, None )
+
+    def set(self, item: Item, itemHash: bytes):
+        self._hashes[ item ] = itemHash
+
+    def isValid(self):
+        return True
+
+    def invalidate(self):
+        self._hashes.clear()
+
+    def _dropPath(self, item: Item):
+        while item is not None:
+            self._hashes.pop( item, None )
+            item = item.getParent()
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        self._dropPath( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        self._dropPath( parent )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        self._dropPath( parent )
+
+
+class HistoryStore():
+    """Deduplicated history of data.
+
+    Each item (with hashes of its subitems) and each note is stored once in
+    pack file under hash of its content. Lists of root items are stored as
+    trees of nodes containing up to LIST_NODE_SIZE hashes, so nodes of unchanged
+    part of list are shared between entries. History entry is manifest containing
+    hashes of roots of the trees, notes and archive, so new entry takes space of
+    changed items and nodes on their paths only.
+    """
+
+    def __init__(self, historyDir):
+        self.historyDir = historyDir
+        self._packFile = os.path.join( historyDir, "objects.pack" )
+        self._index: Dict[ bytes, tuple ] = None        ## hash to pair of offset and size of blob in pack file
+        self._lastManifest = None
+        self._lock = threading.Lock()
+
+    def listEntries(self) -> List[persist.BackupEntry]:
+        """Return history entries starting from the most recent."""
+        return persist.list_backups( self.historyDir, MANIFEST_EXTENSION )
+
+    def addEntry( self, version, tasks, todos, notes, archiveDigest=None, loadArchive=None,
+                  hashCache: ItemHashCache = None ):
+        """Store state of data as new history entry. Return path of entry or None if data did not change.
+
+        archiveDigest -- checksum of archive file (None if there is no archive)
+        loadArchive   -- function returning archived tasks, called only if archive is not in history yet
+        """
+        if hashCache is None:
+            hashCache = ItemHashCache()
+        with self._lock:
+            os.makedirs( self.historyDir, exist_ok=True )
+            index = self._getIndex()
+            with open( self._packFile, 'ab' ) as packFile:
+                writer = PackWriter( packFile, index )
+                manifest = { "version": version,
+                             "tasks": writer.addItemsList( tasks, hashCache ),
+                             "todos": writer.addItemsList( todos, hashCache ),
+                             "notes": [ ( title, writer.addBlob( pickle.dumps( content ) ) )
+                                        for title, content in notes.items() ],
+                             "archived": self._addArchive( writer, archiveDigest, loadArchive ),
+                             "archiveDigest": archiveDigest }
+                if writer.isEmpty() is False:
+                    packFile.flush()
+                    os.fsync( packFile.fileno() )
+
+            if manifest == self._getLastManifest():
+                _LOGGER.info( "no new data to store in history" )
+                return None
+
+            entries = self.listEntries()
+            sequence = 1
+            if entries:
+                sequence = entries[0].sequence + 1
+            manifestFile = persist.get_backup_path( self.historyDir, sequence, datetime.now(), MANIFEST_EXTENSION )
+            _LOGGER.info( "storing history entry: %s", manifestFile )
+            persist.store_object( manifest, manifestFile )
+            self._lastManifest = manifest
+            return manifestFile
+
+    def loadEntry( self, manifestFile, class_mapper_factory=None ):
+        """Reconstruct data of history entry.
+
+        class_mapper_factory -- function returning class mapper for given version of data
+        """
+        with self._lock:
+            manifest = persist.load_object( manifestFile )
+            mngrVersion = manifest[ "version" ]
+            mapperObject = None
+            if class_mapper_factory is not None:
+                mapperObject = class_mapper_factory( mngrVersion )
+            index = self._getIndex()
+            with open( self._packFile, 'rb' ) as packFile:
+                reader = PackReader( packFile, index, mapperObject )
+                tasksHashes = reader.readList( manifest[ "tasks" ] )
+                tasks = [ reader.readItem( itemHash, LocalTask ) for itemHash in tasksHashes ]
+                todosHashes = reader.readList( manifest[ "todos" ] )
+                todos = [ reader.readItem( itemHash, LocalToDo ) for itemHash in todosHashes ]
+                notes = { title: reader.readObject( noteHash ) for title, noteHash in manifest[ "notes" ] }
+                archivedHash = manifest[ "archived" ]
+                if archivedHash is not None:
+                    for itemHash in reader.readList( archivedHash ):
+                        tasks.append( reader.readItem( itemHash, LocalTask ) )
+        return { 'file': manifestFile,
+                 'version': mngrVersion,
+                 'tasks': tasks,
+                 'todos': todos,
+                 'notes': notes
+                 }
+
+    def prune( self, policy: persist.RetentionPolicy ):
+        """Remove entries according to retention policy and drop blobs not used by remaining entries."""
+        with self._lock:
+            removed = persist.prune_backups( self.historyDir, policy, extension=MANIFEST_EXTENSION )
+        if not removed:
+            return removed
+        self.collectGarbage()
+        return removed
+
+    def collectGarbage( self ):
+        """Rewrite pack file if most of blobs are not referenced by any entry."""
+        with self._lock:
+            index = self._getIndex()
+            used = set()
+            with open( self._packFile, 'rb' ) as packFile:
+                reader = PackReader( packFile, index )
+                for entry in self.listEntries():
+                    manifest = persist.load_object( entry.path )
+                    for listHash in ( manifest[ "tasks" ], manifest[ "todos" ] ):
+                        for itemHash in reader.markList( listHash, used ):
+                            reader.markItem( itemHash, used )
+                    used.update( noteHash for _, noteHash in manifest[ "notes" ] )
+                    archivedHash = manifest[ "archived" ]
+                    if archivedHash is not None:
+                        for itemHash in reader.markList( archivedHash, used ):
+                            reader.markItem( itemHash, used )
+            if len( used ) * 2 > len( index ):
+                return
+            _LOGGER.info( "compacting history pack: %s of %s blobs used", len( used ), len( index ) )
+            tmpFile = self._packFile + "_tmp"
+            newIndex = dict()
+            with open( self._packFile, 'rb' ) as packFile, open( tmpFile, 'wb' ) as outputFile:
+                for blobHash, ( offset, size ) in index.items():
+                    if blobHash not in used:
+                        continue
+                    packFile.seek( offset )
+                    newIndex[ blobHash ] = ( outputFile.tell() + RECORD_HEADER.size, size )
+                    outputFile.write( RECORD_HEADER.pack( blobHash, size ) + packFile.read( size ) )
+                outputFile.flush()
+                os.fsync( outputFile.fileno() )
+            os.replace( tmpFile, self._packFile )
+            self._index = newIndex
+
+    def _addArchive( self, writer: 'PackWriter', archiveDigest, loadArchive ) -> bytes:
+        """Add archived tasks. Return hash of root node of list or None if there is no archive.
+
+        Manifest keeps digest of archive file, so archive not changed since
+        previous entry is not loaded.
+        """
+        if archiveDigest is None:
+            return None
+        lastManifest = self._getLastManifest()
+        if lastManifest is not None and lastManifest.get( "archiveDigest", None ) == archiveDigest:
+            archivedHash = lastManifest[ "archived" ]
+            if archivedHash in self._getIndex():
+                return archivedHash
+        ## archived items are not tracked by manager
+        return writer.addItemsList( loadArchive(), ItemHashCache() )
+
+    def _getIndex( self ):
+        if self._index is None:
+            self._index = read_pack_index( self._packFile )
+        return self._index
+
+    def _getLastManifest( self ):
+        if self._lastManifest is None:
+            entries = self.listEntries()
+            if entries:
+                self._lastManifest = persist.load_object( entries[0].path )
+        return self._lastManifest
+
+
+## ========================================================================
+
+
+class PackWriter():
+    """Appends blobs missing in pack file."""
+
+    def __init__(self, packFile, index):
+        self._packFile = packFile
+        self._index = index
+        self._added = 0
+
+    def isEmpty(self):
+        return self._added == 0
+
+    def addItem( self, item: Item, hashCache: ItemHashCache ) -> bytes:
+        itemHash = hashCache.get( item )
+        if itemHash in self._index:
+            ## blob of item and its subitems is already in pack
+            return itemHash
+        subitems = item.getSubitems()
+        childrenHashes = None
+        if subitems is not None:
+            childrenHashes = [ self.addItem( subItem, hashCache ) for subItem in subitems ]
+        itemHash = self.addBlob( pickle.dumps( ( get_fields( item ), childrenHashes ) ) )
+        hashCache.set( item, itemHash )
+        return itemHash
+
+    def addItemsList( self, itemsList: List[Item], hashCache: ItemHashCache ) -> bytes:
+        """Add items and tree of list of their hashes. Return hash of root node of the tree."""
+        return self.addList( [ self.addItem( item, hashCache ) for item in itemsList ] )
+
+    def addList( self, hashes: List[bytes] ) -> bytes:
+        """Add list of hashes as tree of nodes. Return hash of root node.
+
+        Node is pair of level and list of hashes -- items on level 0, nodes of
+        lower level otherwise.
+        """
+        level = 0
+        nodes = [ self.addBlob( pickle.dumps( ( level, chunk ) ) ) for chunk in split_list( hashes ) ]
+        while len( nodes ) > 1:
+            level += 1
+            nodes = [ self.addBlob( pickle.dumps( ( level, chunk ) ) ) for chunk in split_list( nodes ) ]
+        return nodes[0]
+
+    def addBlob( self, content ) -> bytes:
+        blobHash = hashlib.sha256( content ).digest()
+        if blobHash in self._index:
+            return blobHash
+        self._packFile.write( RECORD_HEADER.pack( blobHash, len( content ) ) )
+        self._index[ blobHash ] = ( self._packFile.tell(), len( content ) )
+        self._packFile.write( content )
+        self._added += 1
+        return blobHash
+
+
+class PackReader():
+    """Reads blobs from pack file."""
+
+    def __init__(self, packFile, index, class_mapper=None):
+        self._packFile = packFile
+        self._index = index
+        self._mapper = class_mapper
+
+    def readBlob( self, blobHash ) -> bytes:
+        offset, size = self._index[ blobHash ]
+        self._packFile.seek( offset )
+        return self._packFile.read( size )
+
+    def readObject( self, blobHash ):
+        return persist.load_data( self.readBlob( blobHash ), class_mapper=self._mapper )
+
+    def readItem( self, itemHash, itemClass ) -> Item:
+        state, childrenHashes = self.readObject( itemHash )
+        item = itemClass.__new__( itemClass )
+        state[ "_parent" ] = None
+        state[ "subitems" ] = None
+        item.__setstate__( state )
+        if childrenHashes is not None:
+            subitems = [ self.readItem( childHash, itemClass ) for childHash in childrenHashes ]
+            item.setSubitems( subitems )
+            for subItem in subitems:
+                subItem.setParent( item )
+        return item
+
+    def readList( self, listHash ) -> List[bytes]:
+        """Return list of hashes stored in tree of given root node."""
+        level, hashes = self.readObject( listHash )
+        if level == 0:
+            return hashes
+        ret = list()
+        for nodeHash in hashes:
+            ret.extend( self.readList( nodeHash ) )
+        return ret
+
+    def markList( self, listHash, used ) -> List[bytes]:
+        """Mark nodes of list tree as used. Return list of hashes stored in tree."""
+        used.add( listHash )
+        level, hashes = self.readObject( listHash )
+        if level == 0:
+            return hashes
+        ret = list()
+        for nodeHash in hashes:
+            ret.extend( self.markList( nodeHash, used ) )
+        return ret
+
+    def markItem( self, itemHash, used ):
+        if itemHash in used:
+            return
+        used.add( itemHash )
+        _, childrenHashes = self.readObject( itemHash )
+        for childHash in childrenHashes or []:
+            self.markItem( childHash, used )
+
+
+def split_list( hashes: List[bytes] ) -> List[List[bytes]]:
+    """Split list to nodes of list tree. Empty list gives single empty node."""
+    if not hashes:
+        return [ list() ]
+    return [ hashes[ i:i + LIST_NODE_SIZE ] for i in range( 0, len( hashes ), LIST_NODE_SIZE ) ]
+
+
+def read_pack_index( packFile ):
+    """Return map of hash to pair of offset and size of blob. Interrupted record at the end is removed."""
+    index = dict()
+    if os.path.isfile( packFile ) is False:
+        return index
+    packSize = os.path.getsize( packFile )
+    with open( packFile, 'rb' ) as fp:
+        position = 0
+        while position + RECORD_HEADER.size <= packSize:
+            blobHash, size = RECORD_HEADER.unpack( fp.read( RECORD_HEADER.size ) )
+            offset = position + RECORD_HEADER.size
+            if offset + size > packSize:
+                break
+            index[ blobHash ] = ( offset, size )
+            position = offset + size
+            fp.seek( position )
+    if position != packSize:
+        _LOGGER.warning( "found broken record in %s at position %s -- removing tail", packFile, position )
+        os.truncate( packFile, position )
+    return index
@@ -0,0 +1,360 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import os
+import logging
+import pickle
+import struct
+import zlib
+
+from typing import Dict, Set
+
+from hanlendar import persist
+from hanlendar.domainmodel.item import Item, ItemListener
+from hanlendar.domainmodel.task import Task
+from hanlendar.domainmodel.local.task import LocalTask
+from hanlendar.domainmodel.local.todo import LocalToDo
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+KIND_TASK = "task"
+KIND_TODO = "todo"
+
+## record header: payload length and crc32 of payload
+RECORD_HEADER = struct.Struct( ">II" )
+
+
+class ChangeJournal( ItemListener ):
+    """Tracker of items changed since last commit to journal.
+
+    Journal contains item-level changes made after data snapshot. Each commit
+    is appended to journal file as single record (transaction) of entries:
+        ( "put", kind, id, state, childrenIds )     -- item fields and order of subitems
+        ( "del", kind, id )                         -- item removed
+        ( "roots", kind, rootIds )                  -- order of root items
+        ( "notes", notesDict )                      -- notes content
+
+    Items are identified by journal ids, because UIDs can be duplicated. Items
+    of snapshot are numbered in tree order (see 'assign_ids()'), new items get
+    next free numbers.
+
+    First transaction starts with ( "base", checksums ) entry identifying snapshot
+    the journal applies to.
+
+    Invalid journal (e.g. after data replaced) requires storing snapshot.
+    """
+
+    def __init__(self):
+        self._valid = False
+        self._items: Set[Item] = set()                      ## changed items (including parents of added/removed items)
+        self._removed: Set[Item] = set()                    ## removed items with their subitems
+        self._roots: Set[str] = set()                       ## kinds of changed root lists
+        self._notes = None                                  ## copy of last committed notes
+        self._ids: Dict[ Item, int ] = dict()
+        self._nextId = 0
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self._clear()
+        self._ids = dict()
+
+    def build(self, notes, itemIds: Dict[ Item, int ] = None):
+        """Start tracking changes made after given state of data.
+
+        itemIds -- journal ids of items of the state (see 'assign_ids()')
+        """
+        self._clear()
+        self._notes = dict( notes )
+        self._ids = dict()
+        if itemIds is not None:
+            self._ids = dict( itemIds )
+        self._nextId = max( self._ids.values(), default=-1 ) + 1
+        self._valid = True
+
+    def isEmpty(self):
+        if self._items:
+            return False
+        if self._roots:
+            return False
+        if self._removed:
+            return False
+        return True
+
+    def collectChanges(self, manager) -> list:
+        """Return changes tracked so far and start new transaction.
+
+        Changes have form of journal entries referring items instead of UIDs:
+            ( "del", kind, item ), ( "put", kind, item ), ( "roots", kind, items ), ( "notes", notesDict )
+        """
+        changes = list()
+        for item in self._removed:
+            changes.append( ( "del", get_kind( item ), item ) )
+        for item in self._items:
+            if item in self._removed:
+                continue
+            changes.append( ( "put", get_kind( item ), item ) )
+        if KIND_TASK in self._roots:
+            changes.append( ( "roots", KIND_TASK, list( manager.getTasks() ) ) )
+        if KIND_TODO in self._roots:
+            changes.append( ( "roots", KIND_TODO, list( manager.getToDos() ) ) )
+        notes = manager.getNotes()
+        if notes != self._notes:
+            changes.append( ( "notes", dict( notes ) ) )
+        self._clear()
+        self._notes = dict( notes )
+        return changes
+
+    def collectEntries(self, manager) -> list:
+        """Return journal entries of changes tracked so far and start new transaction."""
+        entries = list()
+        for change in self.collectChanges( manager ):
+            operation = change[0]
+            if operation == "del":
+                _, kind, item = change
+                itemId = self._ids.pop( item, None )
+                if itemId is None:
+                    ## item added and removed before commit
+                    continue
+                entries.append( ( "del", kind, itemId ) )
+            elif operation == "put":
+                _, kind, item = change
+                entries.append( ( "put", kind, self._getId( item ), get_fields( item ), self._getChildrenIds( item ) ) )
+            elif operation == "roots":
+                _, kind, items = change
+                entries.append( ( "roots", kind, [ self._getId( item ) for item in items ] ) )
+            else:
+                entries.append( change )
+        return entries
+
+    def _getId(self, item: Item):
+        itemId = self._ids.get( item, None )
+        if itemId is None:
+            itemId = self._nextId
+            self._nextId += 1
+            self._ids[ item ] = itemId
+        return itemId
+
+    def _getChildrenIds(self, item: Item):
+        subitems = item.getSubitems()
+        if subitems is None:
+            return None
+        return [ self._getId( subItem ) for subItem in subitems ]
+
+    def _clear(self):
+        self._items.clear()
+        self._removed.clear()
+        self._roots.clear()
+        self._notes = None
+
+    def _markChanged(self, parent: Item, item: Item):
+        if parent is not None:
+            self._items.add( parent )
+        else:
+            self._roots.add( get_kind( item ) )
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        if self._valid is False:
+            return
+        self._items.add( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self._markChanged( parent, item )
+        subItems = item.getAllSubItems()
+        ## moved item is not removed
+        self._removed.discard( item )
+        self._removed.difference_update( subItems )
+        self._items.add( item )
+        self._items.update( subItems )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self._markChanged( parent, item )
+        self._removed.add( item )
+        self._removed.update( item.getAllSubItems() )
+
+
+## ========================================================================
+
+
+def get_kind( item: Item ):
+    if isinstance( item, Task ):
+        return KIND_TASK
+    return KIND_TODO
+
+
+def get_fields( item: Item ):
+    """Return persistent state of item without links to other items."""
+    state = item.__getstate__()
+    state.pop( "subitems", None )
+    state.pop( "_parent", None )
+    return state
+
+
+def assign_ids( tasks, todos ) -> Dict[ Item, int ]:
+    """Number items of both lists in tree order."""
+    itemIds = dict()
+    for itemsList in ( tasks, todos ):
+        for item in Item.getAllSubItemsFromList( itemsList ):
+            itemIds[ item ] = len( itemIds )
+    return itemIds
+
+
+## ========================================================================
+
+
+def append_journal( journalFile, entries ):
+    """Append transaction to journal and flush it to disk. Return size of journal file."""
+    payload = pickle.dumps( entries )
+    header = RECORD_HEADER.pack( len( payload ), zlib.crc32( payload ) )
+    with open( journalFile, 'ab' ) as fp:
+        fp.write( header + payload )
+        fp.flush()
+        os.fsync( fp.fileno() )
+        return fp.tell()
+
+
+def read_journal( journalFile, class_mapper=None ):
+    """Return pair of list of transactions and size of valid part of journal.
+
+    Reading stops on first incomplete or corrupted record (e.g. interrupted write).
+    """
+    if os.path.isfile( journalFile ) is False:
+        return ( list(), 0 )
+    _LOGGER.info( "loading journal from: %s", journalFile )
+    with open( journalFile, 'rb' ) as fp:
+        content = fp.read()
+    transactions = list()
+    pos = 0
+    contentSize = len( content )
+    while pos + RECORD_HEADER.size <= contentSize:
+        payloadSize, checksum = RECORD_HEADER.unpack_from( content, pos )
+        payloadStart = pos + RECORD_HEADER.size
+        payload = content[ payloadStart:payloadStart + payloadSize ]
+        if len( payload ) != payloadSize or zlib.crc32( payload ) != checksum:
+            break
+        transactions.append( persist.load_data( payload, class_mapper=class_mapper ) )
+        pos = payloadStart + payloadSize
+    if pos != contentSize:
+        _LOGGER.warning( "found broken record in journal %s at position %s -- skipping tail", journalFile, pos )
+    return ( transactions, pos )
+
+
+def get_base( transactions ):
+    """Return checksums of snapshot the journal was started from or None."""
+    if not transactions:
+        return None
+    firstTransaction = transactions[0]
+    if not firstTransaction:
+        return None
+    entry = firstTransaction[0]
+    if entry[0] != "base":
+        return None
+    return entry[1]
+
+
+def clear_journal( journalFile ):
+    if os.path.isfile( journalFile ):
+        os.remove( journalFile )
+
+
+def replay_journal( transactions, tasks, todos, notes ):
+    """Apply journal transactions to snapshot data. Return tuple of tasks, todos, notes and journal ids of items."""
+    itemIds = assign_ids( tasks, todos )
+    roots = { KIND_TASK: tasks, KIND_TODO: todos }
+    itemsMap = dict()
+    children = dict()
+    for kind, itemsList in roots.items():
+        itemsMap[ kind ] = { itemIds[ item ]: item for item in Item.getAllSubItemsFromList( itemsList ) }
+        children[ kind ] = dict()
+    rootKeys = dict()
+
+    for transaction in transactions:
+        for entry in transaction:
+            operation = entry[0]
+            if operation == "put":
+                _, kind, itemKey, state, childrenKeys = entry
+                mapping = itemsMap[ kind ]
+                item = mapping.get( itemKey, None )
+                state = dict( state )
+                if item is None:
+                    itemClass = LocalTask if kind == KIND_TASK else LocalToDo
+                    item = itemClass.__new__( itemClass )
+                    mapping[ itemKey ] = item
+                    state[ "subitems" ] = None
+                    state[ "_parent" ] = None
+                else:
+                    state[ "subitems" ] = item.getSubitems()
+                    state[ "_parent" ] = item.getParent()
+                item.__setstate__( state )
+                children[ kind ][ itemKey ] = childrenKeys
+            elif operation == "del":
+                _, kind, itemKey = entry
+                itemsMap[ kind ].pop( itemKey, None )
+                children[ kind ].pop( itemKey, None )
+            elif operation == "roots":
+                _, kind, keys = entry
+                rootKeys[ kind ] = keys
+            elif operation == "notes":
+                notes = entry[1]
+            elif operation == "base":
+                continue
+            else:
+                _LOGGER.warning( "unknown journal entry: %s", operation )
+
+    for kind, mapping in itemsMap.items():
+        for itemKey, childrenKeys in children[ kind ].items():
+            parent = mapping[ itemKey ]
+            if childrenKeys is None:
+                parent.setSubitems( None )
+                continue
+            subitems = [ mapping[ childKey ] for childKey in childrenKeys if childKey in mapping ]
+            parent.setSubitems( subitems )
+            for subItem in subitems:
+                subItem.setParent( parent )
+        keys = rootKeys.get( kind, None )
+        if keys is None:
+            continue
+        itemsList = [ mapping[ itemKey ] for itemKey in keys if itemKey in mapping ]
+        for item in itemsList:
+            item.setParent( None )
+        roots[ kind ] = itemsList
+
+    itemIds = dict()
+    for mapping in itemsMap.values():
+        for itemId, item in mapping.items():
+            itemIds[ item ] = itemId
+    return ( roots[ KIND_TASK ], roots[ KIND_TODO ], notes, itemIds )
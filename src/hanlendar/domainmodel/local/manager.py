@@ -21,23 +21,27 @@
 # SOFTWARE.
 #
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 import os
 import logging
+import threading
 from typing import List
 
-import glob
 from icalendar import cal
 
 from hanlendar import persist
 from hanlendar.domainmodel.manager import Manager
-from hanlendar.domainmodel.item import Item
+from hanlendar.domainmodel.item import Item, ItemListener
 from hanlendar.domainmodel.task import Task
 from hanlendar.domainmodel.reminder import Notification
 from hanlendar.domainmodel.task import TaskOccurrence
 from hanlendar.domainmodel.local.task import LocalTask
 from hanlendar.domainmodel.local.todo import LocalToDo
+from hanlendar.domainmodel.local import journal
+from hanlendar.domainmodel.local.journal import ChangeJournal
+from hanlendar.domainmodel.local.history import HistoryStore, ItemHashCache
+from hanlendar.domainmodel.changeevent import date_window
 import icalendar
 
 
@@ -87,6 +91,35 @@ class ModuleMapper():
         return (module, name)
 
 
+class ChangeCounter( ItemListener ):
+    """Counter of changes of items tree (dirty flag of stored data)."""
+
+    def __init__(self):
+        self._revision = 0
+
+    def getRevision(self):
+        return self._revision
+
+    def isValid(self):
+        return True
+
+    def invalidate(self):
+        ## whole list replaced or repaired
+        self._revision += 1
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        self._revision += 1
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        self._revision += 1
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        self._revision += 1
+
+
 class LocalManager( Manager ):
     """Root class for domain data structure."""
 
@@ -102,13 +135,53 @@ class LocalManager( Manager ):
 
     def __init__(self, ioDir=None):
         """Constructor."""
+        super().__init__()
         self._tasks = list()
         self._todos = list()
-        self.notes = { "notes": "" }        ## default notes
+        self._notes = { "notes": "" }       ## default notes
 
         self._ioDir = ioDir                 ## do not persist
 
+        ## skip check of tasks on load if they were validated before previous save
+        self.skipValidated = True
+
+        ## completed, non-recurring tasks older than given age are moved to archive on load (None disables)
+        self.archiveAge: timedelta = timedelta( days=90 )
+        self._archiveLoaded = False         ## archived tasks are present in tasks list
+        self._archivePending = list()       ## tasks moved to archive but not stored yet
+
+        ## changes are appended to journal until its size exceeds limit, then snapshot is stored (None disables)
+        self.journalLimit = 1024 * 1024
+        self._journal = ChangeJournal()
+        self._journalBase = None            ## checksums of snapshot files the journal applies to
+        self._tasksListeners.append( self._journal )
+        self._tasksBatchListeners.append( self._journal )
+        self._todosListeners.append( self._journal )
+
+        ## unchanged lists are not serialized on store
+        self._objectStore = persist.ObjectStore()
+        self._tasksCounter = ChangeCounter()
+        self._todosCounter = ChangeCounter()
+        self._storedRevisions = dict()      ## revision of counter for each stored file
+        self._tasksListeners.append( self._tasksCounter )
+        self._tasksBatchListeners.append( self._tasksCounter )
+        self._todosListeners.append( self._todosCounter )
+
+        ## each change of data is stored in history
+        self._history: HistoryStore = None
+        self._hashCache = ItemHashCache()
+        self._tasksListeners.append( self._hashCache )
+        self._tasksBatchListeners.append( self._hashCache )
+        self._todosListeners.append( self._hashCache )
+
+        ## old history entries are removed in background after new entry is stored (None disables)
+        self.backupRetention = persist.RetentionPolicy()
+        self._pruneThread: threading.Thread = None
+
     def store( self, outputDir ):
+        if outputDir != self._ioDir:
+            ## journal refers to snapshot in previous directory
+            self._journal.invalidate()
         self._ioDir = outputDir
         self.storeData()
 
@@ -123,28 +196,123 @@ class LocalManager( Manager ):
         changed = False
 
         outputFile = os.path.join( outputDir, "version.obj" )
-        if persist.store_object( self._class_version, outputFile ) is True:
+        if self._objectStore.store( self._class_version, outputFile ) is True:
             changed = True
 
-        outputFile = os.path.join( outputDir, "tasks.obj" )
-        if persist.store_object( self.tasks, outputFile ) is True:
+        ## split of tasks to archive depends on current date
+        referenceDate = date.today()
+        activeTasks, archiveChanged = self._storeArchive( outputDir, referenceDate )
+        if archiveChanged is True:
+            changed = True
+
+        if self._storeItems( outputDir, activeTasks, referenceDate ) is True:
+            changed = True
+
+        ## store history
+        history = self._getHistory()
+        if changed or not history.listEntries():
+            archiveDigest = self._objectStore.getDigest( os.path.join( outputDir, "archive.obj" ) )
+            entryFile = history.addEntry( self._class_version, activeTasks, self.todos, self.notes,
+                                          archiveDigest, lambda: self._loadArchiveFile( outputDir ),
+                                          self._hashCache )
+            if entryFile is not None:
+                self.pruneBackups()
+
+        return changed
+
+    def _storeItems( self, outputDir, activeTasks, referenceDate: date ):
+        """Store tasks, todos and notes in journal or snapshot. Return True if any file changed."""
+        changed = False
+
+        journalFile = os.path.join( outputDir, "data.journal" )
+        if self._isJournalAvailable( outputDir ):
+            if self._storeJournal( journalFile ) is False:
+                ## nothing appended -- journal file could be not created yet
+                return changed
             changed = True
+            if os.path.getsize( journalFile ) <= self.journalLimit:
+                return changed
+            _LOGGER.info( "compacting journal %s", journalFile )
 
+        ## store snapshot -- tasks file is written last, so interrupted store invalidates journal
         outputFile = os.path.join( outputDir, "todos.obj" )
-        if persist.store_object( self.todos, outputFile ) is True:
+        if self._storeSection( self.todos, outputFile, self._todosCounter.getRevision() ) is True:
             changed = True
 
         outputFile = os.path.join( outputDir, "notes.obj" )
-        if persist.store_object( self.notes, outputFile ) is True:
+        if self._storeSection( self.notes, outputFile, self.getNotesRevision() ) is True:
+            changed = True
+
+        outputFile = os.path.join( outputDir, "tasks.obj" )
+        if self._storeSection( activeTasks, outputFile, self._getTasksRevision( referenceDate ) ) is True:
             changed = True
+        self._storeValidatedChecksum( outputDir )
 
-        ## backup data
-        objFiles = glob.glob( outputDir + "/*.obj" )
-        storedZipFile = os.path.join( outputDir, "data.zip" )
-        persist.backup_files( objFiles, storedZipFile )
+        journal.clear_journal( journalFile )
+        self._journalBase = self._getSnapshotChecksum( outputDir )
+        self._journal.build( self.notes, journal.assign_ids( activeTasks, self.todos ) )
+
+        return changed
 
+    def pruneBackups( self, background=True ):
+        """Remove history entries and backups according to retention policy."""
+        if self.backupRetention is None or self._ioDir is None:
+            return
+        if background is False:
+            self._pruneBackups( self._ioDir, self._getHistory(), self.backupRetention )
+            return
+        if self._pruneThread is not None and self._pruneThread.is_alive():
+            return
+        self._pruneThread = threading.Thread( target=self._pruneBackups,
+                                              args=( self._ioDir, self._getHistory(), self.backupRetention ),
+                                              daemon=True )
+        self._pruneThread.start()
+
+    @staticmethod
+    def _pruneBackups( dataDir, history: HistoryStore, policy: persist.RetentionPolicy ):
+        history.prune( policy )
+        ## backups of previous versions
+        persist.prune_backups( dataDir, policy )
+
+    def _getHistory( self ) -> HistoryStore:
+        historyDir = os.path.join( self._ioDir, "history" )
+        if self._history is None or self._history.historyDir != historyDir:
+            self._history = HistoryStore( historyDir )
+        return self._history
+
+    def _storeSection( self, data, outputFile, revision ):
+        """Store data if its revision changed since previous store."""
+        if self._storedRevisions.get( outputFile, None ) == revision and os.path.isfile( outputFile ):
+            _LOGGER.info( "no changes to store in %s", outputFile )
+            return False
+        changed = self._objectStore.store( data, outputFile )
+        self._storedRevisions[ outputFile ] = revision
         return changed
 
+    def _isJournalAvailable( self, outputDir ):
+        if self.journalLimit is None:
+            return False
+        if self._journal.isValid() is False:
+            return False
+        if self.isValidated() is False:
+            ## repaired data has to be stored in snapshot
+            return False
+        if self._archiveLoaded:
+            ## tasks are split to working set and archive on store
+            return False
+        return os.path.isfile( os.path.join( outputDir, "tasks.obj" ) )
+
+    def _storeJournal( self, journalFile ):
+        entries = self._journal.collectEntries( self )
+        if not entries:
+            _LOGGER.info( "no new data to store in %s", journalFile )
+            return False
+        if os.path.isfile( journalFile ) is False:
+            entries.insert( 0, ( "base", self._journalBase ) )
+        _LOGGER.info( "appending %s changes to: %s", len( entries ), journalFile )
+        journal.append_journal( journalFile, entries )
+        return True
+
     def load( self, inputDir ):
         self._ioDir = inputDir
         self.loadData()
@@ -158,7 +326,7 @@ class LocalManager( Manager ):
         inputDir = self._ioDir
 
         inputFile = os.path.join( inputDir, "version.obj" )
-        mngrVersion = persist.load_object( inputFile )
+        mngrVersion = self._objectStore.load( inputFile )
         if mngrVersion != self. _class_version:
             _LOGGER.info( "converting object from version %s to %s", mngrVersion, self._class_version )
             ## do nothing for now
@@ -166,28 +334,179 @@ class LocalManager( Manager ):
         mapperObject = ModuleMapper( mngrVersion )
 
         inputFile = os.path.join( inputDir, "tasks.obj" )
-        self.tasks = persist.load_object( inputFile, class_mapper=mapperObject )
-        if self.tasks is None:
-            self.tasks = list()
+        tasks = self._objectStore.load( inputFile, class_mapper=mapperObject )
+        if tasks is None:
+            tasks = list()
+        self._archiveLoaded = False
+        self._archivePending = list()
 
         inputFile = os.path.join( inputDir, "todos.obj" )
-        self.todos = persist.load_object( inputFile, class_mapper=mapperObject )
-        if self.todos is None:
-            self.todos = list()
+        todos = self._objectStore.load( inputFile, class_mapper=mapperObject )
+        if todos is None:
+            todos = list()
 
         inputFile = os.path.join( inputDir, "notes.obj" )
-        self.notes = persist.load_object( inputFile, class_mapper=mapperObject )
-        if self.notes is None:
-            self.notes = { "notes": "" }
+        notes = self._objectStore.load( inputFile, class_mapper=mapperObject )
+        if notes is None:
+            notes = { "notes": "" }
+
+        tasks, todos, notes, itemIds = self._loadJournal( inputDir, mapperObject, tasks, todos, notes )
+        self.tasks = tasks
+        self.todos = todos
+        self.notes = notes
 
-        self.fixData()
+        if self.skipValidated and self._isValidatedChecksum( inputDir ):
+            _LOGGER.info( "tasks validated before previous save -- skipping check" )
+            self.markValidated()
+            self._journal.build( self.notes, itemIds )
+        else:
+            ## possible repairs are stored in snapshot
+            self.fixData()
+
+        self.archiveTasks()
+
+    def _loadJournal( self, inputDir, mapperObject, tasks, todos, notes ):
+        """Replay journal on snapshot data. Return tuple of tasks, todos, notes and journal ids of items."""
+        self._journalBase = self._getSnapshotChecksum( inputDir )
+        journalFile = os.path.join( inputDir, "data.journal" )
+        transactions, validSize = journal.read_journal( journalFile, class_mapper=mapperObject )
+        if not transactions:
+            journal.clear_journal( journalFile )
+            return ( tasks, todos, notes, journal.assign_ids( tasks, todos ) )
+        if journal.get_base( transactions ) != self._journalBase:
+            ## snapshot was stored after journal -- changes are already in snapshot
+            _LOGGER.info( "journal does not match snapshot -- skipping" )
+            journal.clear_journal( journalFile )
+            return ( tasks, todos, notes, journal.assign_ids( tasks, todos ) )
+        if validSize != os.path.getsize( journalFile ):
+            ## remove interrupted record, so next records can be appended
+            os.truncate( journalFile, validSize )
+        _LOGGER.info( "replaying %s transactions from journal", len( transactions ) )
+        return journal.replay_journal( transactions, tasks, todos, notes )
+
+    ## ======================================================================
+
+    def findArchivable( self, referenceDate: date = None ) -> List[Task]:
+        """Return root tasks completed before 'archiveAge' with all subtasks and without recurrence."""
+        if self.archiveAge is None:
+            return list()
+        if referenceDate is None:
+            referenceDate = date.today()
+        limitDate = referenceDate - self.archiveAge
+        ret = list()
+        for task in self.tasks:
+            if is_archivable( task, limitDate ):
+                ret.append( task )
+        return ret
+
+    def archiveTasks( self, referenceDate: date = None ) -> List[Task]:
+        """Move old completed tasks out of working set. They are written to archive on next store."""
+        if self._archiveLoaded:
+            ## user works with archived tasks -- split is done on store
+            return list()
+        archived = self.findArchivable( referenceDate )
+        if not archived:
+            return archived
+        _LOGGER.info( "moving %s tasks to archive", len( archived ) )
+        with self.batch():
+            for task in archived:
+                self.removeTask( task )
+        self._archivePending.extend( archived )
+        return archived
+
+    # override
+    def loadArchive( self ):
+        if self._archiveLoaded:
+            return False
+        self._archiveLoaded = True
+        archived = list()
+        if self._ioDir is not None:
+            archived = self._loadArchiveFile( self._ioDir )
+        archived.extend( self._archivePending )
+        self._archivePending = list()
+        if not archived:
+            return False
+        _LOGGER.info( "loading %s archived tasks", len( archived ) )
+        with self.batch():
+            for task in archived:
+                self.addTask( task )
+        return True
+
+    def isArchiveLoaded( self ):
+        return self._archiveLoaded
+
+    def _storeArchive( self, outputDir, referenceDate: date ):
+        """Store archive file. Return list of tasks for working set file and flag of archive change."""
+        archiveFile = os.path.join( outputDir, "archive.obj" )
+        if self._archiveLoaded:
+            ## whole archive is in memory -- split tasks
+            archived = self.findArchivable( referenceDate )
+            if not archived and os.path.isfile( archiveFile ) is False:
+                return ( self.tasks, False )
+            archivedSet = set( archived )
+            activeTasks = [ task for task in self.tasks if task not in archivedSet ]
+            changed = self._storeSection( archived, archiveFile, self._getTasksRevision( referenceDate ) )
+            return ( activeTasks, changed )
+        if not self._archivePending:
+            return ( self.tasks, False )
+        archived = self._loadArchiveFile( outputDir )
+        archived.extend( self._archivePending )
+        changed = self._objectStore.store( archived, archiveFile )
+        self._storedRevisions.pop( archiveFile, None )
+        self._archivePending = list()
+        return ( self.tasks, changed )
+
+    def _getTasksRevision( self, referenceDate: date ):
+        """Return revision of tasks files."""
+        revision = self._tasksCounter.getRevision()
+        if self._archiveLoaded:
+            ## tasks are split to working set and archive depending on date
+            return ( revision, referenceDate, self.archiveAge )
+        return revision
+
+    def _loadArchiveFile( self, inputDir ) -> List[Task]:
+        archiveFile = os.path.join( inputDir, "archive.obj" )
+        if os.path.isfile( archiveFile ) is False:
+            return list()
+        versionFile = os.path.join( inputDir, "version.obj" )
+        mapperObject = ModuleMapper( self._objectStore.load( versionFile ) )
+        archived = self._objectStore.load( archiveFile, class_mapper=mapperObject )
+        if archived is None:
+            return list()
+        return archived
+
+    def _storeValidatedChecksum( self, outputDir ):
+        checksumFile = os.path.join( outputDir, "tasks.validated" )
+        if self.isValidated() is False:
+            if os.path.isfile( checksumFile ):
+                os.remove( checksumFile )
+            return
+        checksum = self._objectStore.getDigest( os.path.join( outputDir, "tasks.obj" ) )
+        self._objectStore.store( checksum, checksumFile )
+
+    def _isValidatedChecksum( self, inputDir ):
+        checksumFile = os.path.join( inputDir, "tasks.validated" )
+        if os.path.isfile( checksumFile ) is False:
+            return False
+        checksum = persist.load_object( checksumFile )
+        if checksum is None:
+            return False
+        return checksum == self._objectStore.getDigest( os.path.join( inputDir, "tasks.obj" ) )
+
+    def _getSnapshotChecksum( self, dataDir ):
+        """Return checksums of files of snapshot stored in given directory."""
+        return tuple( self._objectStore.getDigest( os.path.join( dataDir, fileName ) )
+                      for fileName in ( "tasks.obj", "todos.obj", "notes.obj" ) )
 
     ## index meaning:
     ##    negative: current
-    ##           0: first history entry
-    ##    positive: history entry by index
+    ##           0: the most recent history entry
+    ##    positive: history entry by index (greater index -- older entry)
+    ## entries of history store are followed by backup archives of previous versions
+    ## returns None if there is no entry of given index
     def loadHistory( self, index=-1 ):
         if index < 0:
+            ## archive is loaded on demand (e.g. showing completed tasks)
             self.loadData()
             ret_dict = { 'file': None,
                          'version': self. _class_version,
@@ -197,11 +516,18 @@ class LocalManager( Manager ):
                          }
             return ret_dict
 
+        history = self._getHistory()
+        entries = history.listEntries()
+        if index < len( entries ):
+            return history.loadEntry( entries[ index ].path, ModuleMapper )
+        index -= len( entries )
+
         outputDir = self._ioDir
-        if index <= 0:
-            storedZipFile = os.path.join( outputDir, "data.zip" )
-        else:
-            storedZipFile = os.path.join( outputDir, "data.zip.%s" % index )
+        persist.convert_legacy_backups( outputDir )
+        backups = persist.list_backups( outputDir )
+        if index >= len( backups ):
+            return None
+        storedZipFile = backups[ index ].path
 
         hist_data_raw = persist.load_backup( storedZipFile )
 
@@ -218,6 +544,12 @@ class LocalManager( Manager ):
         if tasks is None:
             tasks = list()
 
+        archive_raw = hist_data_raw.get( "archive.obj", None )
+        if archive_raw is not None:
+            archived = persist.load_data( archive_raw, class_mapper=mapperObject )
+            if archived is not None:
+                tasks.extend( archived )
+
         todos_raw = hist_data_raw.get( "todos.obj", None )
         todos = persist.load_data( todos_raw, class_mapper=mapperObject )
         if todos is None:
@@ -237,7 +569,9 @@ class LocalManager( Manager ):
         return ret_dict
 
     def restoreTaskByTitle( self, history_index, task_title ):
-        data_dict = self.loadHistory( 160 )
+        data_dict = self.loadHistory( history_index )
+        if data_dict is None:
+            return False
         tasks: List[ Task ] = data_dict.get( 'tasks', [] )
         found_task = self.findTaskByTitle( tasks, task_title )
         if found_task is not None:
@@ -263,10 +597,6 @@ class LocalManager( Manager ):
     def _setTasks( self, value ):
         self._tasks = value
 
-    # override
-    def getTasksAll(self):
-        return Item.getAllSubItemsFromList( self.tasks )
-
     # override
     def createEmptyTask(self):
         return LocalTask()
@@ -279,14 +609,19 @@ class LocalManager( Manager ):
     def _setToDos( self, value ):
         self._todos = value
 
-    # override
-    def getTodosAll(self):
-        return Item.getAllSubItemsFromList( self.todos )
-
     # override
     def createEmptyToDo(self) -> LocalToDo:
         return LocalToDo()
 
+    @property
+    def notes(self):
+        return self._notes
+
+    @notes.setter
+    def notes(self, value):
+        self._notes = value
+        self._notesRevision += 1
+
     # override
     def _getNotes(self):
         return self.notes
@@ -294,3 +629,17 @@ class LocalManager( Manager ):
     # override
     def _setNotes(self, value):
         self.notes = value
+
+
+def is_archivable( task: Task, limitDate: date ) -> bool:
+    if task.isCompleted() is False:
+        return False
+    for item in Item.getAllSubItemsFromList( [ task ] ):
+        recurrence = item.getAppliedRecurrence()
+        if recurrence is not None and recurrence.isValid():
+            return False
+    window = date_window( task )
+    if window is None:
+        ## no dates -- age unknown
+        return False
+    return window.end < limitDate
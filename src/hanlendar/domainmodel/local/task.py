@@ -122,7 +122,11 @@ class LocalTask( Task, persist.Versionable ):
 
     ## overrided
     def setParent(self, parentItem=None):
+        oldParent = self._parent
         self._parent = parentItem
+        self.invalidateAppliedRecurrence()
+        if oldParent is not parentItem:
+            Task.invalidateSubitemsDates( oldParent )
 
     ## return mutable reference
     ## overrided
@@ -26,7 +26,10 @@ from datetime import date, datetime
 import logging
 
 import abc
-from typing import List
+import contextlib
+import heapq
+import operator
+from typing import List, Dict
 
 import glob
 
@@ -34,7 +37,16 @@ import icalendar
 
 from hanlendar.domainmodel.reminder import Notification
 from hanlendar.domainmodel.task import Task, TaskOccurrence
-from hanlendar.domainmodel.item import Item
+from hanlendar.domainmodel.item import Item, ItemListener
+from hanlendar.domainmodel.occurrenceindex import OccurrenceIndex
+from hanlendar.domainmodel.occurrencearray import create_occurrence_index
+from hanlendar.domainmodel.uidindex import UIDIndex
+from hanlendar.domainmodel.pathindex import PathIndex
+from hanlendar.domainmodel.itemvalidator import ValidationReport, validate_items
+from hanlendar.domainmodel.changeset import ChangeSet
+from hanlendar.domainmodel.searchindex import SearchHit, ItemSearchIndex, NotesSearchIndex
+from hanlendar.domainmodel.deadlinescheduler import DeadlineScheduler
+from hanlendar.domainmodel.notificationtimeline import NotificationTimeline
 from hanlendar.domainmodel.local.todo import LocalToDo
 # from hanlendar import persist
 # from hanlendar.domainmodel.item import Item
@@ -48,9 +60,45 @@ _LOGGER = logging.getLogger(__name__)
 ## ======================================================
 
 
-class Manager():
+class Manager( ItemListener ):
     """Root class for domain data structure."""
 
+    def __init__(self):
+        ## index is built on demand and then kept up to date by notifications from items
+        self._occurrenceIndex   = create_occurrence_index()
+        self._taskUIDIndex      = UIDIndex()
+        self._deadlineScheduler = DeadlineScheduler()
+        self._notifTimeline     = NotificationTimeline()
+        self._taskPathIndex     = PathIndex()
+        self._todoUIDIndex      = UIDIndex()
+        self._todoPathIndex     = PathIndex()
+        self._taskSearchIndex   = ItemSearchIndex()
+        self._todoSearchIndex   = ItemSearchIndex()
+        self._noteSearchIndex   = NotesSearchIndex()
+
+        ## listeners receiving notifications about changes of tasks and todos
+        self._tasksListeners = [ self._occurrenceIndex, self._taskUIDIndex, self._deadlineScheduler,
+                                 self._notifTimeline, self._taskPathIndex, self._taskSearchIndex ]
+        self._todosListeners = [ self._todoUIDIndex, self._todoPathIndex, self._todoSearchIndex ]
+
+        ## listeners not updated during batch of modifications -- rebuilt on demand after batch
+        self._deferredListeners = [ self._occurrenceIndex, self._deadlineScheduler, self._notifTimeline,
+                                    self._taskSearchIndex ]
+        self._tasksBatchListeners = [ item for item in self._tasksListeners if item not in self._deferredListeners ]
+
+        ## changes collected by active batch (see 'batch()')
+        self._batchChanges: ChangeSet = None
+        self._batchLevel = 0
+
+        ## revision is incremented on each change of data
+        self._revision = 0
+        self._tasksAllCache = None          ## pair of revision and flattened list
+        self._todosAllCache = None          ## pair of revision and flattened list
+        self._notesRevision = 0             ## incremented on each change of notes
+
+        ## is data checked by 'fixData()' (data set from outside is not)
+        self._validated = True
+
     @abc.abstractmethod
     def storeData( self ):
         """ retrun bool: True if new data saved, otherwise False """
@@ -64,11 +112,11 @@ class Manager():
 
     def setData( self, manager: 'Manager' ):
         tasks = manager._getTasks()
-        self._setTasks( tasks )
+        self.tasks = tasks
         todos = manager._getToDos()
-        self._setToDos( todos )
+        self.todos = todos
         notes = manager._getNotes()
-        self._setNotes( notes )
+        self.setNotes( notes )
 
     @abc.abstractmethod
     def _getTasks( self ):
@@ -78,10 +126,9 @@ class Manager():
     def _setTasks( self, value ):
         raise NotImplementedError('You need to define this method in derived class!')
 
-    @abc.abstractmethod
     def getTasksAll(self) -> List[Task]:
         """Return tasks and all subtasks from tree."""
-        raise NotImplementedError('You need to define this method in derived class!')
+        return list( self._getTasksAll() )
 
     ## return shallow copy (of list)
     def getTasks( self ):
@@ -94,7 +141,14 @@ class Manager():
 
     @tasks.setter
     def tasks(self, newList):
+        self._collectReplaced( self._getTasks(), newList )
+        self._detachItems( self._getTasks() )
         self._setTasks( newList )
+        self._attachItems( newList )
+        self._revision += 1
+        self._validated = False
+        for listener in self._tasksListeners:
+            listener.invalidate()
 
     @abc.abstractmethod
     def createEmptyTask(self) -> Task:
@@ -108,10 +162,9 @@ class Manager():
     def _setToDos( self, value ):
         raise NotImplementedError('You need to define this method in derived class!')
 
-    @abc.abstractmethod
     def getTodosAll(self):
-        """Return tasks and all subtasks from tree."""
-        raise NotImplementedError('You need to define this method in derived class!')
+        """Return todos and all subtodos from tree."""
+        return list( self._getToDosAll() )
 
     ## return shallow copy (of list)
     def getToDos( self, includeCompleted=True ):
@@ -125,7 +178,14 @@ class Manager():
 
     @todos.setter
     def todos(self, newList):
+        self._collectReplaced( self._getToDos(), newList )
+        self._detachItems( self._getToDos() )
         self._setToDos( newList )
+        self._attachItems( newList )
+        self._revision += 1
+        self._validated = False
+        for listener in self._todosListeners:
+            listener.invalidate()
 
     @abc.abstractmethod
     def createEmptyToDo(self) -> LocalToDo:
@@ -144,67 +204,83 @@ class Manager():
 
     def setNotes(self, notesDict):
         self._setNotes( notesDict )
+        self._collectNotesChange()
+
+    def getNotesRevision(self):
+        return self._notesRevision
 
     ## ======================================================================
 
     def findTaskByUID(self, uid) -> Task:
-        allTasks = self.getTasksAll()
-        for task in allTasks:
-            if task.UID == uid:
-                return task
-        return None
+        if self._taskUIDIndex.isValid() is False:
+            self._taskUIDIndex.build( self._getTasksAll() )
+        return self._taskUIDIndex.findByUID( uid )
+
+    def findToDoByUID(self, uid) -> LocalToDo:
+        if self._todoUIDIndex.isValid() is False:
+            self._todoUIDIndex.build( self._getToDosAll() )
+        return self._todoUIDIndex.findByUID( uid )
+
+    def search(self, query: str, limit: int = 100) -> List[SearchHit]:
+        """Find tasks, todos and notes containing all words of query.
+
+        Words are matched exactly, by prefix or by substring (at least 3 characters).
+        Hits are sorted by score (best first).
+        """
+        self._noteSearchIndex.update( self._getNotes() )
+        scoreKey = operator.itemgetter( 1 )
+        found = list()
+        for index in ( self._getTaskSearchIndex(), self._getToDoSearchIndex(), self._noteSearchIndex ):
+            scores = index.search( query, limit )
+            if limit is not None and len( scores ) > limit:
+                found.extend( heapq.nlargest( limit, scores.items(), key=scoreKey ) )
+            else:
+                found.extend( scores.items() )
+        found.sort( key=scoreKey, reverse=True )
+        if limit is not None:
+            found = found[ :limit ]
+        hits = list()
+        for key, score in found:
+            if isinstance( key, Item ):
+                hits.append( SearchHit( score, item=key ) )
+            else:
+                hits.append( SearchHit( score, note=key ) )
+        return hits
 
     def getTaskOccurrencesForDate(self, taskDate: date, includeCompleted=True):
         retList = list()
-        allTasks = self.getTasksAll()
-        for task in allTasks:
-            entry = task.getTaskOccurrenceForDate( taskDate )
-            if entry is None:
-                continue
+        occurrences = self._getOccurrenceIndex().getOccurrencesForDate( taskDate )
+        for entry in occurrences:
             if includeCompleted is False:
                 if entry.isCompleted():
                     continue
             retList.append( entry )
         return retList
 
+    def getTaskOccurrencesForRange(self, startDate: date, endDate: date,
+                                   includeCompleted=True) -> Dict[ date, List[TaskOccurrence] ]:
+        """Return occurrences grouped by days of given range (inclusive)."""
+        retDict = self._getOccurrenceIndex().getOccurrencesForRange( startDate, endDate )
+        if includeCompleted is False:
+            for currDate, occurrences in retDict.items():
+                retDict[ currDate ] = [ entry for entry in occurrences if not entry.isCompleted() ]
+        return retDict
+
     def getNextDeadline(self) -> Task:
-        retTask: Task = None
-        allTasks = self.getTasksAll()
-        for task in allTasks:
-            if task.isCompleted():
-                continue
-            if task.occurrenceDue is None:
-                continue
-            if retTask is None:
-                retTask = task
-            elif task.occurrenceDue < retTask.occurrenceDue:
-                retTask = task
-        return retTask
+        return self._getDeadlineScheduler().getNextDeadline()
 
     def getDeadlinedTasks(self):
-        retTasks = list()
-        allTasks = self.getTasksAll()
-        for task in allTasks:
-            occurrence: TaskOccurrence = task.currentOccurrence()
-            if occurrence.isCompleted():
-                continue
-            if occurrence.isTimedout():
-                retTasks.append( task )
-        return retTasks
+        return self._getDeadlineScheduler().getDeadlinedTasks()
 
     def getRemindedTasks(self):
-        retTasks = list()
-        allTasks = self.getTasksAll()
-        for task in allTasks:
-            occurrence: TaskOccurrence = task.currentOccurrence()
-            if occurrence.isCompleted():
-                continue
-            if occurrence.isReminded():
-                retTasks.append( task )
-        return retTasks
+        return self._getDeadlineScheduler().getRemindedTasks()
 
     def getTaskCoords(self, task):
-        return Item.getItemCoords( self.tasks, task )
+        return self._getTaskPathIndex().getCoords( task )
+
+    def getTaskRow(self, task) -> int:
+        """Return position of task in list of its siblings."""
+        return self._getTaskPathIndex().getRow( task )
 
     def getTaskByCoords(self, task):
         return Item.getItemFromCoords( self.tasks, task )
@@ -212,6 +288,7 @@ class Manager():
     def insertTask( self, task: Task, taskCoords ):
         if taskCoords is None:
             self.tasks.append( task )
+            self._attachItem( task )
             return
         taskCoords = list( taskCoords )     ## make copy
         listPos = taskCoords.pop()
@@ -220,12 +297,14 @@ class Manager():
             parentTask.addSubItem( task, listPos )
         else:
             self.tasks.insert( listPos, task )
+            self._attachItem( task )
 
     def addTask( self, task: Task = None ):
         if task is None:
             task = self.createEmptyTask()
         self.tasks.append( task )
         task.setParent( None )
+        self._attachItem( task )
         return task
 
     def addNewTask( self, taskdate: date, title ):
@@ -243,58 +322,35 @@ class Manager():
         return task
 
     def removeTask( self, task: Task ):
-        return Item.removeSubItemFromList(self.tasks, task)
+        return self._removeItem( self.tasks, task, self._getTaskPathIndex() )
 
     def replaceTask( self, oldTask: Task, newTask: Task ):
-        return Item.replaceSubItemInList(self.tasks, oldTask, newTask)
-
-    ### check if ancestor of task is added to root tasks
-    def fixData(self):
-        self.fixTaskParents()
-        self.fixTaskRoots()
-        self.fixTaskChildren()
-
-    def fixTaskParents(self):
-        rootTasks = self._getTasks()
-        allTasks = self.getTasksAll()
-        for task in allTasks:
-            rootItem = task.getRootItem()
-            if rootItem is None:
-                continue
-            if rootItem in rootTasks:
-                continue
-            ## invalid case -- root item not added to tasks
-            _LOGGER.warning( "fixing task ancestor -- adding root task %s %s", rootItem.title, rootItem.UID )
-            self.addTask( rootItem )
-
-    def fixTaskRoots(self):
-        rootTasks = self._getTasks()
-        for index in range(len(rootTasks) - 1, -1, -1):
-            task = rootTasks[ index ]
-            if task.getParent() is not None:
-                ## invalid case -- task with parent added to root tasks
-                _LOGGER.warning( "fixing root tasks -- removing child %s %s", task.title, task.UID )
-                del rootTasks[ index ]
-
-    def fixTaskChildren(self):
-        allTasks = self.getTasksAll()
-        for task in allTasks:
-            taskParent: Task = task.getParent()
-            if taskParent is not None:
-                subitems = taskParent.getSubitems()
-                if task not in subitems:
-                    ## invalid case
-                    _LOGGER.warning( "task '%s' have invalid parent -- moved to task %s", task.title, taskParent.title )
-                    task.setParent( taskParent )
-            children = task.getSubitems()
-            if children is None:
-                continue
-            for child in children:
-                childParent = child.getParent()
-                if childParent is not task:
-                    ## invalid case
-                    _LOGGER.warning( "task '%s' have invalid parent -- moved to task %s", child.title, task.title )
-                    task.setParent( taskParent )
+        return self._replaceItem( self.tasks, oldTask, newTask )
+
+    def fixData(self) -> ValidationReport:
+        """Check links between tasks and fix found problems."""
+        report = validate_items( self._getTasks(), self.addTask )
+        if report.isEmpty() is False:
+            _LOGGER.warning( "fixed tasks data: %s", report )
+            self._revision += 1
+        for listener in self._tasksListeners:
+            listener.invalidate()
+        for listener in self._todosListeners:
+            listener.invalidate()
+        self._validated = True
+        return report
+
+    def loadArchive(self) -> bool:
+        """Load tasks moved out of working set. Return True if tasks were added."""
+        return False
+
+    def markValidated(self):
+        """Mark data as valid without checking (e.g. when data is confirmed by checksum)."""
+        self._validated = True
+
+    def isValidated(self) -> bool:
+        """Return True if data passed 'fixData()' and was modified only through manager since then."""
+        return self._validated
 
     def printTasks(self):
         retStr = ""
@@ -320,10 +376,20 @@ class Manager():
         ret.sort( key=Notification.sortByTime )
         return ret
 
+    def getNotificationTimeline(self) -> NotificationTimeline:
+        """Return queue of upcoming notifications updated on changes of tasks."""
+        if self._notifTimeline.isValid() is False:
+            self._notifTimeline.build( self._getTasks() )
+        return self._notifTimeline
+
     ## ========================================================
 
     def getToDoCoords(self, todo):
-        return Item.getItemCoords( self.todos, todo )
+        return self._getToDoPathIndex().getCoords( todo )
+
+    def getToDoRow(self, todo) -> int:
+        """Return position of todo in list of its siblings."""
+        return self._getToDoPathIndex().getRow( todo )
 
     def getToDoByCoords(self, todo):
         return Item.getItemFromCoords( self.todos, todo )
@@ -331,6 +397,7 @@ class Manager():
     def insertToDo( self, todo: LocalToDo, todoCoords ):
         if todoCoords is None:
             self.todos.append( todo )
+            self._attachItem( todo )
             return
         todoCoords = list( todoCoords )     ## make copy
         listPos = todoCoords.pop()
@@ -339,12 +406,14 @@ class Manager():
             parentToDo.addSubItem( todo, listPos )
         else:
             self.todos.insert( listPos, todo )
+            self._attachItem( todo )
 
     def addToDo( self, todo: LocalToDo = None ):
         if todo is None:
             todo = self.createEmptyToDo()
         self.todos.append( todo )
         todo.setParent( None )
+        self._attachItem( todo )
         return todo
 
     def addNewToDo( self, title ):
@@ -354,14 +423,14 @@ class Manager():
         return todo
 
     def removeToDo( self, todo: LocalToDo ):
-        return Item.removeSubItemFromList(self.todos, todo)
+        return self._removeItem( self.todos, todo, self._getToDoPathIndex() )
 
     def replaceToDo( self, oldToDo: LocalToDo, newToDo: LocalToDo ):
-        return Item.replaceSubItemInList(self.todos, oldToDo, newToDo)
+        return self._replaceItem( self.todos, oldToDo, newToDo )
 
     def getNextToDo(self) -> LocalToDo:
         nextToDo = None
-        allItems = self.getTodosAll()
+        allItems = self._getToDosAll()
         for item in allItems:
             if item.isCompleted():
                 continue
@@ -377,14 +446,199 @@ class Manager():
     def addNote(self, title, content):
         notes = self._getNotes()
         notes[title] = content
+        self._collectNotesChange()
 
     def renameNote(self, fromTitle, toTitle):
         notes = self._getNotes()
         notes[toTitle] = notes.pop(fromTitle)
+        self._collectNotesChange()
 
     def removeNote(self, title):
         notes = self._getNotes()
         del notes[title]
+        self._collectNotesChange()
+
+    ## ========================================================
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group modifications of data.
+
+        Inside batch indexes depending on dates (occurrences, deadlines, notifications)
+        are not updated on each change -- they are rebuilt once on first use after batch.
+        Batches can be nested. Yields 'ChangeSet' collecting UIDs of affected items.
+        """
+        if self._batchLevel == 0:
+            self._batchChanges = ChangeSet()
+            self._invalidateDeferred()
+        self._batchLevel += 1
+        changes = self._batchChanges
+        try:
+            yield changes
+        finally:
+            self._batchLevel -= 1
+            if self._batchLevel == 0:
+                self._batchChanges = None
+                self._invalidateDeferred()
+                _LOGGER.debug( "batch finished: %s", changes )
+
+    def isInBatch(self) -> bool:
+        return self._batchLevel > 0
+
+    def getRevision(self) -> int:
+        """Return number identifying state of data. Number changes on every modification."""
+        return self._revision
+
+    ## returns cached list -- do not modify
+    def _getTasksAll(self) -> List[Task]:
+        if self._tasksAllCache is None or self._tasksAllCache[0] != self._revision:
+            tasksList = Item.getAllSubItemsFromList( self._getTasks() )
+            self._tasksAllCache = ( self._revision, tasksList )
+        return self._tasksAllCache[1]
+
+    ## returns cached list -- do not modify
+    def _getToDosAll(self) -> List[LocalToDo]:
+        if self._todosAllCache is None or self._todosAllCache[0] != self._revision:
+            todosList = Item.getAllSubItemsFromList( self._getToDos() )
+            self._todosAllCache = ( self._revision, todosList )
+        return self._todosAllCache[1]
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        self._revision += 1
+        if self._batchChanges is not None:
+            self._collectChange( item )
+        for listener in self._getListeners( item ):
+            listener.itemChanged( item, field )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        self._revision += 1
+        if self._batchChanges is not None:
+            self._collectSubItem( parent, item )
+        for listener in self._getListeners( item ):
+            listener.subItemAdded( parent, item )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        self._revision += 1
+        if self._batchChanges is not None:
+            self._collectSubItem( parent, item )
+        for listener in self._getListeners( item ):
+            listener.subItemRemoved( parent, item )
+
+    def _getListeners(self, item: Item) -> List[ItemListener]:
+        if isinstance( item, Task ):
+            if self._batchChanges is not None:
+                return self._tasksBatchListeners
+            return self._tasksListeners
+        return self._todosListeners
+
+    def _invalidateDeferred(self):
+        for listener in self._deferredListeners:
+            if listener.isValid():
+                listener.invalidate()
+
+    def _collectChange(self, item: Item):
+        ## data could be accessed inside batch -- deferred indexes have to be rebuilt
+        self._invalidateDeferred()
+        if isinstance( item, Task ):
+            self._batchChanges.addTask( item )
+        else:
+            self._batchChanges.addToDo( item )
+
+    def _collectSubItem(self, parent: Item, item: Item):
+        if parent is not None:
+            self._collectChange( parent )
+        for subItem in Item.getAllSubItemsFromList( [ item ] ):
+            self._collectChange( subItem )
+
+    def _collectReplaced(self, oldList, newList):
+        if self._batchChanges is None:
+            return
+        for itemsList in ( oldList, newList ):
+            if itemsList is None:
+                continue
+            for item in Item.getAllSubItemsFromList( itemsList ):
+                self._collectChange( item )
+
+    def _collectNotesChange(self):
+        self._notesRevision += 1
+        if self._batchChanges is not None:
+            self._batchChanges.notesChanged = True
+
+    def _getOccurrenceIndex(self) -> OccurrenceIndex:
+        if self._occurrenceIndex.isValid() is False:
+            self._occurrenceIndex.build( self._getTasksAll() )
+        return self._occurrenceIndex
+
+    def _getTaskPathIndex(self) -> PathIndex:
+        if self._taskPathIndex.isValid() is False:
+            self._taskPathIndex.build( self._getTasks() )
+        return self._taskPathIndex
+
+    def _getToDoPathIndex(self) -> PathIndex:
+        if self._todoPathIndex.isValid() is False:
+            self._todoPathIndex.build( self._getToDos() )
+        return self._todoPathIndex
+
+    def _getTaskSearchIndex(self) -> ItemSearchIndex:
+        if self._taskSearchIndex.isValid() is False:
+            self._taskSearchIndex.build( self._getTasksAll() )
+        return self._taskSearchIndex
+
+    def _getToDoSearchIndex(self) -> ItemSearchIndex:
+        if self._todoSearchIndex.isValid() is False:
+            self._todoSearchIndex.build( self._getToDosAll() )
+        return self._todoSearchIndex
+
+    def _getDeadlineScheduler(self) -> DeadlineScheduler:
+        if self._deadlineScheduler.isValid() is False:
+            self._deadlineScheduler.build( self._getTasksAll() )
+        return self._deadlineScheduler
+
+    ## attach manager as listener of root item
+    def _attachItem(self, item: Item):
+        item.setListener( self )
+        self.subItemAdded( None, item )
+
+    def _detachItem(self, item: Item):
+        item.setListener( None )
+        self.subItemRemoved( None, item )
+
+    def _attachItems(self, itemsList):
+        if itemsList is None:
+            return
+        for item in itemsList:
+            item.setListener( self )
+
+    def _detachItems(self, itemsList):
+        if itemsList is None:
+            return
+        for item in itemsList:
+            item.setListener( None )
+
+    def _removeItem(self, itemsList, item: Item, pathIndex: PathIndex):
+        isRoot = item.getParent() is None
+        if isRoot:
+            ## row of root item is usually known -- do not search long list
+            row = pathIndex.findRow( item )
+            if 0 <= row < len( itemsList ) and itemsList[ row ] is item:
+                itemsList.pop( row )
+                self._detachItem( item )
+                return item
+        removed = Item.removeSubItemFromList( itemsList, item )
+        if removed is not None and isRoot:
+            self._detachItem( removed )
+        return removed
+
+    def _replaceItem(self, itemsList, oldItem: Item, newItem: Item):
+        isRoot = oldItem.getParent() is None
+        replaced = Item.replaceSubItemInList( itemsList, oldItem, newItem )
+        if replaced is True and isRoot:
+            self._detachItem( oldItem )
+            self._attachItem( newItem )
+        return replaced
 
 
 ## ========================================================
@@ -0,0 +1,184 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import heapq
+import itertools
+
+from typing import Dict, List
+from datetime import datetime, timedelta
+
+from hanlendar.domainmodel.item import Item, ItemListener
+from hanlendar.domainmodel.task import Task
+from hanlendar.domainmodel.reminder import Notification
+from hanlendar.domainmodel.deadlinescheduler import TaskHeap
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class NotificationTimeline( ItemListener ):
+    """Queue of upcoming notifications of root tasks.
+
+    Only notifications within horizon are kept in queue. For remaining tasks
+    only time of first notification after horizon is stored and notifications
+    are loaded when horizon moves forward.
+    """
+
+    HORIZON = timedelta( days=7 )
+
+    ## changes of fields that require update of task notifications
+    NOTIFY_FIELDS = frozenset( [ "title", "startDateTime", "dueDateTime", "recurrence",
+                                 "recurrentOffset", "reminderList", "completed" ] )
+
+    def __init__(self):
+        self._valid = False
+        self._horizon: datetime = None
+        self._lastPopTime: datetime = None              ## notifications until this time are already handled
+        self._queue: List[list] = list()                ## heap of [ time, counter, notification ]
+        self._taskEntries: Dict[ Task, List[list] ] = dict()
+        self._pending = TaskHeap()                      ## tasks with notifications after horizon
+        self._counter = itertools.count()
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self._horizon = None
+        self._lastPopTime = None
+        self._queue.clear()
+        self._taskEntries.clear()
+        self._pending.clear()
+
+    def build(self, tasksList: List[Task], currTime: datetime = None):
+        self.invalidate()
+        if currTime is None:
+            currTime = datetime.today()
+        self._horizon = currTime + self.HORIZON
+        for task in tasksList:
+            self.updateTask( task )
+        self._valid = True
+
+    def getNextTime(self, currTime: datetime = None) -> datetime:
+        """Return time of next notification or None if there is no notification."""
+        self._moveHorizon( currTime )
+        queue = self._queue
+        while queue and queue[0][2] is None:
+            heapq.heappop( queue )
+        if queue:
+            return queue[0][0]
+        ## nothing within horizon
+        nextTask = self._pending.top()
+        if nextTask is None:
+            return None
+        return self._pending.getKey( nextTask )
+
+    def popNotifications(self, currTime: datetime = None) -> List[Notification]:
+        """Remove and return notifications that reached given time."""
+        if currTime is None:
+            currTime = datetime.today()
+        self._moveHorizon( currTime )
+        self._lastPopTime = currTime
+        retList = list()
+        queue = self._queue
+        while queue and queue[0][0] <= currTime:
+            entry = heapq.heappop( queue )
+            notification = entry[2]
+            if notification is None:
+                continue
+            self._taskEntries[ notification.task ].remove( entry )
+            retList.append( notification )
+        return retList
+
+    ## ======================================================================
+
+    def updateTask(self, task: Task):
+        self.removeTask( task )
+        entries = list()
+        self._taskEntries[ task ] = entries
+        notifications = task.getNotifications()
+        for notification in notifications:
+            if self._lastPopTime is not None and notification.notifyTime <= self._lastPopTime:
+                continue
+            if notification.notifyTime > self._horizon:
+                self._pending.push( task, notification.notifyTime )
+                break
+            entry = [ notification.notifyTime, next( self._counter ), notification ]
+            entries.append( entry )
+            heapq.heappush( self._queue, entry )
+
+    def removeTask(self, task: Task):
+        self._pending.remove( task )
+        entries = self._taskEntries.pop( task, None )
+        if entries is None:
+            return
+        for entry in entries:
+            entry[2] = None
+
+    def updateTaskTree(self, task: Task):
+        ## notifications are handled only for root tasks
+        if task.getParent() is None:
+            self.updateTask( task )
+        else:
+            self.removeTask( task )
+
+    def _moveHorizon(self, currTime: datetime = None):
+        if currTime is None:
+            currTime = datetime.today()
+        newHorizon = currTime + self.HORIZON
+        if newHorizon <= self._horizon:
+            return
+        self._horizon = newHorizon
+        while True:
+            nextTask = self._pending.top()
+            if nextTask is None:
+                break
+            if self._pending.getKey( nextTask ) > newHorizon:
+                break
+            self.updateTask( nextTask )
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        if self._valid is False:
+            return
+        if field not in self.NOTIFY_FIELDS:
+            return
+        if item.getParent() is not None:
+            return
+        self.updateTask( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.updateTaskTree( item )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.removeTask( item )
@@ -0,0 +1,288 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+
+from typing import Dict, List
+from datetime import date, timedelta
+
+from hanlendar.domainmodel.item import Item, ItemListener
+from hanlendar.domainmodel.task import Task, TaskOccurrence, DateRange
+from hanlendar.domainmodel.recurrent import RepeatType
+from hanlendar.domainmodel.occurrenceindex import OccurrenceIndex
+
+try:
+    import numpy
+except ImportError:
+    ### No module named <name> -- vectorized engine is not available
+    numpy = None
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## day numbers are counted from 1970-01-01, the same as in 'numpy.datetime64'
+EPOCH_ORDINAL = date( 1970, 1, 1 ).toordinal()
+
+## end day of recurrence without end date
+NO_END_DAY = 2 ** 40
+
+
+def day_number( aDate: date ) -> int:
+    return aDate.toordinal() - EPOCH_ORDINAL
+
+
+def create_occurrence_index():
+    """Return vectorized occurrence index if NumPy is available, otherwise pure-Python one."""
+    if numpy is None:
+        return OccurrenceIndex()
+    return OccurrenceArray()
+
+
+class OccurrenceArray( ItemListener ):
+    """Columnar counterpart of OccurrenceIndex based on NumPy arrays.
+
+    Each task is a row holding first and last day of occurrence, recurrence
+    step (in days or in months) and last day of recurrence. Membership of
+    all days of queried window is calculated for all rows at once.
+    Results are the same as of 'Task.getTaskOccurrenceForDate()'.
+    """
+
+    ## changes of fields that require reindexing task
+    DATE_FIELDS = frozenset( [ "startDateTime", "dueDateTime", "recurrence" ] )
+
+    def __init__(self):
+        self._valid = False
+        self._rows: Dict[ Task, int ] = dict()
+        self._tasks: List[Task]       = list()          ## None for removed rows
+        self._columns: List[list]     = [ list() for _ in range( 0, 5 ) ]
+        self._removed = 0
+        self._arrays = None                             ## columns converted to NumPy, None if outdated
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self._rows.clear()
+        self._tasks.clear()
+        for column in self._columns:
+            column.clear()
+        self._removed = 0
+        self._arrays = None
+
+    def build(self, tasksList: List[Task]):
+        self.invalidate()
+        for task in tasksList:
+            self._addTask( task )
+        self._valid = True
+
+    def getOccurrencesForDate(self, entryDate: date) -> List[TaskOccurrence]:
+        retDict = self.getOccurrencesForRange( entryDate, entryDate )
+        return retDict[ entryDate ]
+
+    def getOccurrencesForRange(self, startDate: date, endDate: date) -> Dict[ date, List[TaskOccurrence] ]:
+        daysNum = ( endDate - startDate ).days + 1
+        retDays = [ startDate + timedelta( days=i ) for i in range( 0, daysNum ) ]
+        retDict: Dict[ date, List[TaskOccurrence] ] = { currDate: list() for currDate in retDays }
+        if daysNum < 1 or not self._rows:
+            return retDict
+
+        rowsList, daysList, offsetsList = self._calculateOccurrences( day_number( startDate ), daysNum )
+        order = numpy.lexsort( ( rowsList, daysList ) )
+
+        ## occurrence spanning several days is represented by the same object
+        entries: Dict[ tuple, TaskOccurrence ] = dict()
+        for row, dayIndex, offset in zip( rowsList[ order ].tolist(), daysList[ order ].tolist(),
+                                          offsetsList[ order ].tolist() ):
+            task = self._tasks[ row ]
+            if offset == 0:
+                entry = task.getBaseOccurrence()
+            else:
+                key = ( row, offset )
+                entry = entries.get( key, None )
+                if entry is None:
+                    entry = TaskOccurrence( task, offset )
+                    entries[ key ] = entry
+            retDict[ retDays[ dayIndex ] ].append( entry )
+        return retDict
+
+    ## ======================================================================
+
+    def _calculateOccurrences(self, firstDay: int, daysNum: int ):
+        """Return arrays of row, day index and recurrence offset of each occurrence."""
+        startDay, dueDay, stepDays, stepMonths, endDay = self._getArrays()
+        days = numpy.arange( firstDay, firstDay + daysNum, dtype=numpy.int64 )
+
+        ## occurrences with offset 0
+        baseMask = ( startDay[:, None] <= days ) & ( days <= dueDay[:, None] )
+        rowsList, daysList = numpy.nonzero( baseMask )
+        results = [ ( rowsList, daysList, numpy.zeros( len( rowsList ), dtype=numpy.int64 ) ) ]
+
+        ## recurrence with constant step in days
+        rows = numpy.nonzero( stepDays > 0 )[0]
+        if len( rows ) > 0:
+            step  = stepDays[ rows ][:, None]
+            offset = -( ( dueDay[ rows ][:, None] - days ) // step )
+            covered = ( offset > 0 ) & ( startDay[ rows ][:, None] + offset * step <= days )
+            results.append( self._collect( rows, covered, baseMask, endDay, days, offset ) )
+
+        ## recurrence with step in months -- day of month is clamped to length of month
+        rows = numpy.nonzero( stepMonths > 0 )[0]
+        if len( rows ) > 0:
+            step = stepMonths[ rows ][:, None]
+            dueMonth, dueMonthDay = split_day_numbers( dueDay[ rows ] )
+            startMonth, startMonthDay = split_day_numbers( startDay[ rows ] )
+            daysMonth, _ = split_day_numbers( days )
+            offset = -( ( dueMonth[:, None] - daysMonth ) // step )
+            dueShifted = join_day_numbers( dueMonth[:, None] + offset * step, dueMonthDay[:, None] )
+            offset += ( dueShifted < days )
+            startShifted = join_day_numbers( startMonth[:, None] + offset * step, startMonthDay[:, None] )
+            covered = ( offset > 0 ) & ( startShifted <= days )
+            results.append( self._collect( rows, covered, baseMask, endDay, days, offset ) )
+
+        return ( numpy.concatenate( [ item[0] for item in results ] ),
+                 numpy.concatenate( [ item[1] for item in results ] ),
+                 numpy.concatenate( [ item[2] for item in results ] ) )
+
+    @staticmethod
+    def _collect( rows, covered, baseMask, endDay, days, offset ):
+        covered &= ( days <= endDay[ rows ][:, None] )
+        covered &= ~baseMask[ rows ]
+        subRows, daysList = numpy.nonzero( covered )
+        return ( rows[ subRows ], daysList, offset[ subRows, daysList ] )
+
+    def _getArrays(self):
+        if self._arrays is None:
+            self._arrays = tuple( numpy.array( column, dtype=numpy.int64 ) for column in self._columns )
+        return self._arrays
+
+    ## ======================================================================
+
+    def addTaskTree(self, task: Task):
+        self._addTask( task )
+        for subTask in task.getAllSubItems():
+            self._addTask( subTask )
+
+    def removeTaskTree(self, task: Task):
+        self._removeTask( task )
+        for subTask in task.getAllSubItems():
+            self._removeTask( subTask )
+
+    def _addTask(self, task: Task):
+        row = self._rows.get( task, None )
+        if row is None:
+            row = len( self._tasks )
+            self._rows[ task ] = row
+            self._tasks.append( task )
+            for column in self._columns:
+                column.append( 0 )
+        values = self._calculateRow( task )
+        for column, value in zip( self._columns, values ):
+            column[ row ] = value
+        self._arrays = None
+
+    def _removeTask(self, task: Task):
+        row = self._rows.pop( task, None )
+        if row is None:
+            return
+        self._tasks[ row ] = None
+        for column, value in zip( self._columns, self._calculateRow( None ) ):
+            column[ row ] = value
+        self._removed += 1
+        self._arrays = None
+        if self._removed > len( self._rows ):
+            self._compact()
+
+    def _compact(self):
+        tasksList = [ task for task in self._tasks if task is not None ]
+        valid = self._valid
+        self.build( tasksList )
+        self._valid = valid
+
+    @staticmethod
+    def _calculateRow( task: Task ):
+        """Return values of columns: start day, due day, step in days, step in months, end day."""
+        emptyRow = ( 1, 0, 0, 0, 0 )
+        if task is None:
+            return emptyRow
+        dateRange: DateRange = task.getDateTimeRange().dateRange().normalized()
+        if dateRange.isNormalized() is False:
+            return emptyRow
+        startDay = day_number( dateRange.start )
+        dueDay   = day_number( dateRange.end )
+        stepDays   = 0
+        stepMonths = 0
+        endDay     = NO_END_DAY
+        recurr = task.getAppliedRecurrence()
+        if recurr is not None and recurr.getDateOffset() is not None:
+            if recurr.mode is RepeatType.DAILY:
+                stepDays = recurr.every
+            elif recurr.mode is RepeatType.WEEKLY:
+                stepDays = 7 * recurr.every
+            elif recurr.mode is RepeatType.MONTHLY:
+                stepMonths = recurr.every
+            elif recurr.mode is RepeatType.YEARLY:
+                stepMonths = 12 * recurr.every
+            if recurr.endDate is not None:
+                endDay = day_number( recurr.endDate )
+        return ( startDay, dueDay, stepDays, stepMonths, endDay )
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        if self._valid is False:
+            return
+        if field == "recurrence":
+            ## subtasks can inherit recurrence
+            self.addTaskTree( item )
+            return
+        if field in self.DATE_FIELDS:
+            self._addTask( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.addTaskTree( item )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.removeTaskTree( item )
+
+
+def split_day_numbers( dayNumbers ):
+    """Split array of day numbers into month numbers and days of month (starting from 1)."""
+    days = dayNumbers.astype( "datetime64[D]" )
+    months = days.astype( "datetime64[M]" )
+    monthDays = ( days - months.astype( "datetime64[D]" ) ).astype( numpy.int64 ) + 1
+    return ( months.astype( numpy.int64 ), monthDays )
+
+
+def join_day_numbers( months, monthDays ):
+    """Return day numbers of given days of months. Days are clamped to length of month."""
+    monthStart = months.astype( "datetime64[M]" ).astype( "datetime64[D]" ).astype( numpy.int64 )
+    nextStart  = ( months + 1 ).astype( "datetime64[M]" ).astype( "datetime64[D]" ).astype( numpy.int64 )
+    return monthStart + numpy.minimum( monthDays, nextStart - monthStart ) - 1
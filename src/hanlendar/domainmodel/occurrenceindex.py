@@ -0,0 +1,201 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+
+from typing import Dict, List, Tuple
+from datetime import date, timedelta
+
+from hanlendar.domainmodel.item import Item, ItemListener
+from hanlendar.domainmodel.task import Task, TaskOccurrence, DateRange, iterate_days
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OccurrenceIndex( ItemListener ):
+    """Index of tasks by days of occurrence.
+
+    Non-recurrent tasks are kept in per-day buckets, so query for given day
+    does not have to visit all tasks. Recurrent tasks are kept in separate
+    table and their occurrences are calculated on demand.
+    """
+
+    ## tasks lasting longer are not split into day buckets
+    MAX_BUCKET_SPAN = 366
+
+    ## changes of fields that require reindexing task
+    DATE_FIELDS = frozenset( [ "startDateTime", "dueDateTime", "recurrence" ] )
+
+    def __init__(self):
+        self._valid = False
+        self._dayBuckets: Dict[ date, Dict[ Task, None ] ]    = dict()     ## dict used as ordered set
+        self._bucketTasks: Dict[ Task, DateRange ]           = dict()
+        self._longTasks: Dict[ Task, DateRange ]             = dict()
+        self._recurrentTasks: Dict[ Task, Tuple[date, date] ] = dict()     ## task with first and last possible day
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self._dayBuckets.clear()
+        self._bucketTasks.clear()
+        self._longTasks.clear()
+        self._recurrentTasks.clear()
+
+    def build(self, tasksList: List[Task]):
+        self.invalidate()
+        for task in tasksList:
+            self._addTask( task )
+        self._valid = True
+
+    def getOccurrencesForDate(self, entryDate: date) -> List[TaskOccurrence]:
+        retList = list()
+        bucket = self._dayBuckets.get( entryDate, None )
+        if bucket is not None:
+            for task in bucket:
+                retList.append( task.getBaseOccurrence() )
+        for task, dateRange in self._longTasks.items():
+            if entryDate in dateRange:
+                retList.append( task.getBaseOccurrence() )
+        for task, bounds in self._recurrentTasks.items():
+            if entryDate < bounds[0]:
+                continue
+            if bounds[1] is not None and entryDate > bounds[1]:
+                continue
+            entry = task.getTaskOccurrenceForDate( entryDate )
+            if entry is not None:
+                retList.append( entry )
+        return retList
+
+    def getOccurrencesForRange(self, startDate: date, endDate: date) -> Dict[ date, List[TaskOccurrence] ]:
+        retDict: Dict[ date, List[TaskOccurrence] ] = dict()
+        for currDate in iterate_days( startDate, endDate ):
+            occurrences = list()
+            bucket = self._dayBuckets.get( currDate, None )
+            if bucket is not None:
+                for task in bucket:
+                    occurrences.append( task.getBaseOccurrence() )
+            retDict[ currDate ] = occurrences
+        for task, dateRange in self._longTasks.items():
+            entry = None
+            for currDate in iterate_days( max( dateRange.start, startDate ), min( dateRange.end, endDate ) ):
+                if entry is None:
+                    entry = task.getBaseOccurrence()
+                retDict[ currDate ].append( entry )
+        for task, bounds in self._recurrentTasks.items():
+            if endDate < bounds[0]:
+                continue
+            if bounds[1] is not None and startDate > bounds[1]:
+                continue
+            taskOccurrences = task.getTaskOccurrencesForRange( startDate, endDate )
+            for currDate, entry in taskOccurrences.items():
+                retDict[ currDate ].append( entry )
+        return retDict
+
+    ## ======================================================================
+
+    def addTaskTree(self, task: Task):
+        self._addTask( task )
+        for subTask in task.getAllSubItems():
+            self._addTask( subTask )
+
+    def removeTaskTree(self, task: Task):
+        self._removeTask( task )
+        for subTask in task.getAllSubItems():
+            self._removeTask( subTask )
+
+    def _addTask(self, task: Task):
+        dateRange: DateRange = task.getDateTimeRange().dateRange().normalized()
+        if dateRange.isNormalized() is False:
+            return
+        if dateRange.start > dateRange.end:
+            ## invalid range -- task never occurs
+            return
+
+        recurr = task.getAppliedRecurrence()
+        if recurr is not None and recurr.getDateOffset() is not None:
+            lastDate = None
+            if recurr.endDate is not None:
+                lastDate = max( dateRange.end, recurr.endDate )
+            self._recurrentTasks[ task ] = ( dateRange.start, lastDate )
+            return
+
+        spanDays = ( dateRange.end - dateRange.start ).days
+        if spanDays > self.MAX_BUCKET_SPAN:
+            self._longTasks[ task ] = dateRange
+            return
+
+        for dayOffset in range( 0, spanDays + 1 ):
+            currDate = dateRange.start + timedelta( days=dayOffset )
+            bucket = self._dayBuckets.get( currDate, None )
+            if bucket is None:
+                bucket = dict()
+                self._dayBuckets[ currDate ] = bucket
+            bucket[ task ] = None
+        self._bucketTasks[ task ] = dateRange
+
+    def _removeTask(self, task: Task):
+        self._recurrentTasks.pop( task, None )
+        self._longTasks.pop( task, None )
+        dateRange = self._bucketTasks.pop( task, None )
+        if dateRange is None:
+            return
+        spanDays = ( dateRange.end - dateRange.start ).days
+        for dayOffset in range( 0, spanDays + 1 ):
+            currDate = dateRange.start + timedelta( days=dayOffset )
+            bucket = self._dayBuckets.get( currDate, None )
+            if bucket is None:
+                continue
+            bucket.pop( task, None )
+            if not bucket:
+                del self._dayBuckets[ currDate ]
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        if self._valid is False:
+            return
+        if field == "recurrence":
+            ## subtasks can inherit recurrence
+            self.removeTaskTree( item )
+            self.addTaskTree( item )
+            return
+        if field in self.DATE_FIELDS:
+            self._removeTask( item )
+            self._addTask( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.addTaskTree( item )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.removeTaskTree( item )
@@ -0,0 +1,135 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+
+from typing import Dict, List
+
+from hanlendar.domainmodel.item import Item, ItemListener
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PathIndex( ItemListener ):
+    """Index of positions of items in tree.
+
+    Rows are calculated on demand separately for each list of siblings and
+    dropped when the list changes, so coordinates of item are found by
+    walking up through parents instead of searching whole tree.
+    """
+
+    def __init__(self):
+        self._valid = False
+        self._rootList: List[Item] = None
+        self._rows: Dict[ Item, Dict[ Item, int ] ] = dict()     ## parent (None for root list) to rows of children
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self._rootList = None
+        self._rows.clear()
+
+    def build(self, rootList: List[Item]):
+        self.invalidate()
+        self._rootList = rootList
+        self._valid = True
+
+    def getRow(self, item: Item) -> int:
+        """Return position of item in list of siblings or -1 if item is not in the tree."""
+        row = self.findRow( item )
+        if row >= 0:
+            return row
+        ## item not found or rows are outdated
+        rows = self._buildRows( item.getParent() )
+        return rows.get( item, -1 )
+
+    def findRow(self, item: Item) -> int:
+        """Return position of item in list of siblings or -1 if position is not known.
+
+        Outdated rows (e.g. siblings after removed item) are not recalculated.
+        """
+        parent = item.getParent()
+        rows = self._rows.get( parent, None )
+        if rows is None:
+            rows = self._buildRows( parent )
+        row = rows.get( item, -1 )
+        if row < 0:
+            return -1
+        children = self._getChildren( parent )
+        if row < len( children ) and children[ row ] is item:
+            return row
+        return -1
+
+    def getCoords(self, item: Item) -> List[int]:
+        """Return coordinates of item or None if item is not in the tree."""
+        coords = list()
+        currItem = item
+        while currItem is not None:
+            row = self.getRow( currItem )
+            if row < 0:
+                return None
+            coords.append( row )
+            currItem = currItem.getParent()
+        coords.reverse()
+        return coords
+
+    ## ======================================================================
+
+    def _getChildren(self, parent: Item) -> List[Item]:
+        if parent is None:
+            children = self._rootList
+        else:
+            children = parent.getSubitems()
+        if children is None:
+            return list()
+        return children
+
+    def _buildRows(self, parent: Item) -> Dict[ Item, int ]:
+        rows = dict()
+        for row, child in enumerate( self._getChildren( parent ) ):
+            rows.setdefault( child, row )
+        self._rows[ parent ] = rows
+        return rows
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        ## positions do not depend on fields
+        pass
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        self._rows.pop( parent, None )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        ## rows of preceding siblings stay valid, other rows are verified on access
+        rows = self._rows.get( parent, None )
+        if rows is not None:
+            rows.pop( item, None )
+        self._rows.pop( item, None )
+        for subItem in item.getAllSubItems():
+            self._rows.pop( subItem, None )
@@ -28,6 +28,8 @@ from enum import Enum, unique, auto
 from datetime import date, datetime
 from dateutil.relativedelta import relativedelta
 
+from hanlendar.domainmodel import recurrentmath
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -99,6 +101,14 @@ class Recurrent():
         self.every: int       = every
         self.endDate: date    = endDate
 
+    ## offset calculated by 'getDateOffset()' with mode and every it was calculated for (cache)
+    _offsetCache: tuple = None
+
+    def __getstate__(self):
+        state = dict( self.__dict__ )
+        state.pop( "_offsetCache", None )
+        return state
+
     def isValid(self):
         if self.mode == RepeatType.NEVER:
             return False
@@ -126,6 +136,15 @@ class Recurrent():
         self.every = every
 
     def getDateOffset( self ) -> relativedelta:
+        """Return offset between occurrences. Returned object is shared, so it can not be modified."""
+        cache = self._offsetCache
+        if cache is not None and cache[0] is self.mode and cache[1] == self.every:
+            return cache[2]
+        dateOffset = self._calculateDateOffset()
+        self._offsetCache = ( self.mode, self.every, dateOffset )
+        return dateOffset
+
+    def _calculateDateOffset( self ) -> relativedelta:
         if self.every < 1:
             return None
 
@@ -183,38 +202,11 @@ class Recurrent():
         ## return "[m:%s e:%s ed:%s]" % ( self.mode, self.every, self.endDate )
 
 
+# returns: greatest multiplicator fulfilling: startDate + offset * multiplicator <= endDate
 def find_multiplication( startDate: date, endDate: date, offset: relativedelta ) -> int:
-    dateTD = endDate - startDate
-    diffDays = dateTD.days
-
-    ## calculate max possible offset in days
-    ## 'maxDaysOffset' is always greater than 'offset' for all possible dates
-    maxDaysOffset = offset.years * 366 + offset.months * 31 + offset.weeks * 7 + offset.days + 1
-
-    ret = int(diffDays / maxDaysOffset)
-    mul = int(ret / 2)
-    mul = max( mul, 1 )     ## handle case when 'maxDaysOffset' is greater than 'offset'
+    return recurrentmath.floor_multiplication( startDate, endDate, offset )
 
-    startDate += offset * ret
-    while mul > 0:
-        startDate += offset * mul
-        if startDate <= endDate:
-            ret += mul
-        else:
-            mul = int(mul / 2)
 
-    return ret
-
-
-# returns: startDate + offset * multiplicator >= endDate
+# returns: smallest multiplicator fulfilling: startDate + offset * multiplicator >= endDate
 def find_multiplication_after( startDate: date, endDate: date, offset: relativedelta ) -> int:
-    multiplicator = find_multiplication( startDate, endDate, offset )
-    if multiplicator < 0:
-        return multiplicator
-
-    startDate += offset * (multiplicator - 1)
-    while startDate < endDate:
-        startDate += offset
-        multiplicator += 1
-
-    return multiplicator - 1
+    return recurrentmath.ceil_multiplication( startDate, endDate, offset )
@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import calendar
+
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+##
+## Closed-form arithmetic on recurrence offsets.
+##
+## Occurrence 'm' of recurrence is defined as 'startDate + offset * m', so
+## month-end days are clamped relative to first occurrence (e.g. monthly
+## recurrence of 31 Jan gives 29 Feb and then 31 Mar).
+##
+
+
+def split_offset( offset: relativedelta ):
+    """Return tuple (days, months) of recurrence step or None if offset is not pure step of days or months."""
+    if offset is None:
+        return None
+    if offset.hours or offset.minutes or offset.seconds or offset.microseconds or offset.leapdays:
+        return None
+    if offset.year is not None or offset.month is not None or offset.day is not None or offset.weekday is not None:
+        return None
+    months = offset.years * 12 + offset.months
+    days   = offset.days
+    if months != 0 and days != 0:
+        return None
+    if months < 0 or days < 0:
+        return None
+    if months == 0 and days == 0:
+        return None
+    return ( days, months )
+
+
+def month_index( aDate: date ) -> int:
+    return aDate.year * 12 + aDate.month - 1
+
+
+def add_months( aDate: date, months: int ) -> date:
+    """Equivalent of 'aDate + relativedelta( months=months )'."""
+    monthIndex = month_index( aDate ) + months
+    year  = monthIndex // 12
+    month = monthIndex % 12 + 1
+    day   = min( aDate.day, calendar.monthrange( year, month )[1] )
+    return aDate.replace( year=year, month=month, day=day )
+
+
+def floor_multiplication( startDate: date, endDate: date, offset: relativedelta ) -> int:
+    """Return greatest 'm' fulfilling: startDate + offset * m <= endDate."""
+    step = split_offset( offset )
+    if step is None:
+        return _search_floor( startDate, endDate, offset )
+    days, months = step
+    if months == 0:
+        return ( endDate - startDate ) // timedelta( days=days )
+    diffMonths = month_index( endDate ) - month_index( startDate )
+    multiplicator = diffMonths // months
+    if add_months( startDate, months * multiplicator ) > endDate:
+        ## same month, but clamped day is after end date
+        multiplicator -= 1
+    return multiplicator
+
+
+def ceil_multiplication( startDate: date, endDate: date, offset: relativedelta ) -> int:
+    """Return smallest 'm' fulfilling: startDate + offset * m >= endDate."""
+    step = split_offset( offset )
+    if step is None:
+        return _search_ceil( startDate, endDate, offset )
+    days, months = step
+    if months == 0:
+        return -( ( startDate - endDate ) // timedelta( days=days ) )
+    diffMonths = month_index( endDate ) - month_index( startDate )
+    multiplicator = -( -diffMonths // months )
+    if add_months( startDate, months * multiplicator ) < endDate:
+        ## same month, but clamped day is before end date
+        multiplicator += 1
+    return multiplicator
+
+
+## ======================================================================
+
+
+def _search_floor( startDate: date, endDate: date, offset: relativedelta ) -> int:
+    ## generic case -- exponential and binary search over increasing sequence
+    if startDate + offset <= startDate:
+        raise ValueError( "offset have to be positive: %s" % offset )
+    if startDate <= endDate:
+        lower = 0
+        upper = 1
+        while startDate + offset * upper <= endDate:
+            lower = upper
+            upper *= 2
+    else:
+        lower = -1
+        upper = 0
+        while startDate + offset * lower > endDate:
+            upper = lower
+            lower *= 2
+    ## invariant: startDate + offset * lower <= endDate < startDate + offset * upper
+    while upper - lower > 1:
+        middle = ( lower + upper ) // 2
+        if startDate + offset * middle <= endDate:
+            lower = middle
+        else:
+            upper = middle
+    return lower
+
+
+def _search_ceil( startDate: date, endDate: date, offset: relativedelta ) -> int:
+    multiplicator = _search_floor( startDate, endDate, offset )
+    if startDate + offset * multiplicator < endDate:
+        multiplicator += 1
+    return multiplicator
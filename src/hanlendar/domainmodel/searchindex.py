@@ -0,0 +1,316 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import re
+import bisect
+
+from typing import Dict, List, Tuple, Set
+
+from hanlendar.domainmodel.item import Item, ItemListener
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+TOKEN_REGEX = re.compile( r"\w+" )
+
+## weights of kinds of match of query term
+EXACT_MATCH     = 4
+PREFIX_MATCH    = 2
+SUBSTRING_MATCH = 1
+
+## weights of indexed fields
+TITLE_WEIGHT       = 2
+DESCRIPTION_WEIGHT = 1
+
+## terms shorter than n-gram are matched only by prefix
+NGRAM_SIZE = 3
+
+
+def tokenize( text: str ) -> List[str]:
+    if not text:
+        return list()
+    return TOKEN_REGEX.findall( text.lower() )
+
+
+def ngrams( token: str ) -> Set[str]:
+    return set( token[ i:i + NGRAM_SIZE ] for i in range( 0, len( token ) - NGRAM_SIZE + 1 ) )
+
+
+class SearchHit():
+    """Single result of search. Exactly one of 'item' and 'note' is set."""
+
+    def __init__(self, score: int, item: Item = None, note: str = None):
+        self.score: int = score
+        self.item: Item = item          ## task or todo
+        self.note: str  = note          ## title of note
+
+    def __str__(self):
+        if self.item is not None:
+            return "[%s %s]" % ( self.score, self.item.title )
+        return "[%s note:%s]" % ( self.score, self.note )
+
+
+class SearchIndex():
+    """Inverted index of words of documents.
+
+    Documents are identified by hashable keys. Query terms are matched
+    against indexed words as exact match, prefix or substring. Substrings
+    are found through index of n-grams of words.
+    """
+
+    def __init__(self):
+        self._postings: Dict[ str, Dict[int, Set] ]    = dict()    ## token to field weight and keys
+        self._keyTokens: Dict[ object, Dict[str, int] ] = dict()   ## reverse map to handle removal
+        self._vocabulary: List[str] = list()                       ## sorted tokens (prefix lookup)
+        self._vocabularySorted = True                              ## tokens are sorted on demand
+        self._ngramTokens: Dict[ str, Set[str] ]       = dict()    ## n-gram to tokens (substring lookup)
+
+    def clear(self):
+        self._postings.clear()
+        self._keyTokens.clear()
+        self._vocabulary.clear()
+        self._vocabularySorted = True
+        self._ngramTokens.clear()
+
+    def __len__(self):
+        return len( self._keyTokens )
+
+    def addDocument(self, key, fields: List[ Tuple[str, int] ]):
+        """Index document. 'fields' is list of pairs: text and its weight."""
+        self.removeDocument( key )
+        tokenWeights: Dict[str, int] = dict()
+        for text, weight in fields:
+            for token in tokenize( text ):
+                if tokenWeights.get( token, 0 ) < weight:
+                    tokenWeights[ token ] = weight
+        for token, weight in tokenWeights.items():
+            tokenPostings = self._postings.get( token, None )
+            if tokenPostings is None:
+                tokenPostings = dict()
+                self._postings[ token ] = tokenPostings
+                self._addToken( token )
+            weightKeys = tokenPostings.get( weight, None )
+            if weightKeys is None:
+                weightKeys = set()
+                tokenPostings[ weight ] = weightKeys
+            weightKeys.add( key )
+        self._keyTokens[ key ] = tokenWeights
+
+    def removeDocument(self, key):
+        keyTokens = self._keyTokens.pop( key, None )
+        if keyTokens is None:
+            return
+        for token, weight in keyTokens.items():
+            tokenPostings = self._postings[ token ]
+            weightKeys = tokenPostings[ weight ]
+            weightKeys.discard( key )
+            if weightKeys:
+                continue
+            del tokenPostings[ weight ]
+            if tokenPostings:
+                continue
+            del self._postings[ token ]
+            self._removeToken( token )
+
+    def _addToken(self, token: str):
+        self._vocabulary.append( token )
+        self._vocabularySorted = False
+        for ngram in ngrams( token ):
+            ngramTokens = self._ngramTokens.get( ngram, None )
+            if ngramTokens is None:
+                ngramTokens = set()
+                self._ngramTokens[ ngram ] = ngramTokens
+            ngramTokens.add( token )
+
+    def _removeToken(self, token: str):
+        self._sortVocabulary()
+        pos = bisect.bisect_left( self._vocabulary, token )
+        del self._vocabulary[ pos ]
+        for ngram in ngrams( token ):
+            ngramTokens = self._ngramTokens[ ngram ]
+            ngramTokens.discard( token )
+            if not ngramTokens:
+                del self._ngramTokens[ ngram ]
+
+    def _sortVocabulary(self):
+        if self._vocabularySorted:
+            return
+        self._vocabulary.sort()
+        self._vocabularySorted = True
+
+    def hasDocument(self, key) -> bool:
+        return key in self._keyTokens
+
+    def search(self, query: str, limit: int = None) -> Dict[object, int]:
+        """Return scores of documents matching all terms of query.
+
+        If 'limit' is given, then result contains at least 'limit' best
+        documents (if found) but can contain more.
+        """
+        terms = set( tokenize( query ) )
+        if len( terms ) == 1 and limit is not None:
+            return self._matchTerm( terms.pop(), limit )
+        scores: Dict[object, int] = None
+        for term in terms:
+            termScores = self._matchTerm( term )
+            if scores is None:
+                scores = termScores
+                continue
+            scores = { key: score + termScores[ key ] for key, score in scores.items() if key in termScores }
+            if not scores:
+                break
+        if scores is None:
+            return dict()
+        return scores
+
+    def _matchTerm(self, term: str, limit: int = None) -> Dict[object, int]:
+        scoredKeys: List[ Tuple[int, Set] ] = list()
+        for token in self._findTokens( term ):
+            if token == term:
+                matchWeight = EXACT_MATCH
+            elif token.startswith( term ):
+                matchWeight = PREFIX_MATCH
+            else:
+                matchWeight = SUBSTRING_MATCH
+            for fieldWeight, weightKeys in self._postings[ token ].items():
+                scoredKeys.append( ( matchWeight * fieldWeight, weightKeys ) )
+        scoredKeys.sort( key=lambda pair: pair[0] )
+        termScores: Dict[object, int] = dict()
+        if limit is not None:
+            ## take best groups until limit is reached -- first occurrence of key has best score
+            for score, weightKeys in reversed( scoredKeys ):
+                for key in weightKeys:
+                    if key not in termScores:
+                        termScores[ key ] = score
+                        if len( termScores ) >= limit:
+                            return termScores
+            return termScores
+        ## apply in ascending order of score -- key gets its best score
+        for score, weightKeys in scoredKeys:
+            termScores.update( dict.fromkeys( weightKeys, score ) )
+        return termScores
+
+    def _findTokens(self, term: str) -> Set[str]:
+        ## prefix matches are adjacent in sorted vocabulary
+        self._sortVocabulary()
+        pos = bisect.bisect_left( self._vocabulary, term )
+        prefixEnd = pos
+        vocabSize = len( self._vocabulary )
+        while prefixEnd < vocabSize and self._vocabulary[ prefixEnd ].startswith( term ):
+            prefixEnd += 1
+        tokens = set( self._vocabulary[ pos:prefixEnd ] )
+        if len( term ) < NGRAM_SIZE:
+            return tokens
+        ## substring matches -- candidates have to contain all n-grams of term
+        candidates: Set[str] = None
+        for ngram in sorted( ngrams( term ), key=lambda item: len( self._ngramTokens.get( item, () ) ) ):
+            ngramTokens = self._ngramTokens.get( ngram, None )
+            if ngramTokens is None:
+                return tokens
+            if candidates is None:
+                candidates = set( ngramTokens )
+            else:
+                candidates &= ngramTokens
+            if not candidates:
+                return tokens
+        for token in candidates:
+            if term in token:
+                tokens.add( token )
+        return tokens
+
+
+class ItemSearchIndex( SearchIndex, ItemListener ):
+    """Search index of titles and descriptions of items tree kept up to date by notifications."""
+
+    def __init__(self):
+        super().__init__()
+        self._valid = False
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self.clear()
+
+    def build(self, itemsList: List[Item]):
+        self.invalidate()
+        for item in itemsList:
+            self._addItem( item )
+        self._valid = True
+
+    def _addItem(self, item: Item):
+        fields = [ ( item.title, TITLE_WEIGHT ), ( item.description, DESCRIPTION_WEIGHT ) ]
+        self.addDocument( item, fields )
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        if self._valid is False:
+            return
+        if field not in ( "title", "description" ):
+            return
+        self._addItem( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self._addItem( item )
+        for subItem in item.getAllSubItems():
+            self._addItem( subItem )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.removeDocument( item )
+        for subItem in item.getAllSubItems():
+            self.removeDocument( subItem )
+
+
+class NotesSearchIndex( SearchIndex ):
+    """Search index of notes (title and content).
+
+    Notes are edited in place, so index is synchronized with notes dict before each search.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._contents: Dict[ str, str ] = dict()      ## indexed content of notes
+
+    def update(self, notesDict: Dict[ str, str ]):
+        if notesDict is None:
+            notesDict = dict()
+        for title in list( self._contents.keys() ):
+            if title not in notesDict:
+                del self._contents[ title ]
+                self.removeDocument( title )
+        for title, content in notesDict.items():
+            if self._contents.get( title, None ) == content:
+                continue
+            self._contents[ title ] = content
+            self.addDocument( title, [ ( title, TITLE_WEIGHT ), ( content, DESCRIPTION_WEIGHT ) ] )
@@ -0,0 +1,664 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from datetime import date, datetime, timedelta
+
+import os
+import logging
+import sqlite3
+
+from typing import Dict, List
+
+from hanlendar.domainmodel.manager import Manager
+from hanlendar.domainmodel.item import Item
+from hanlendar.domainmodel.task import Task, TaskOccurrence
+from hanlendar.domainmodel.occurrencearray import create_occurrence_index
+from hanlendar.domainmodel.deadlinescheduler import DeadlineScheduler
+from hanlendar.domainmodel.recurrent import Recurrent, RepeatType
+from hanlendar.domainmodel.reminder import Reminder, TimePointType, RemainderDirectionType
+from hanlendar.domainmodel.local.manager import LocalManager
+from hanlendar.domainmodel.local.task import LocalTask
+from hanlendar.domainmodel.local.todo import LocalToDo
+from hanlendar.domainmodel.local.journal import ChangeJournal, KIND_TASK, KIND_TODO
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## items are identified by surrogate key -- UIDs can be duplicated (e.g. imported twice)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id                  INTEGER PRIMARY KEY,
+    uid                 TEXT,
+    parent              INTEGER,
+    position            INTEGER NOT NULL,
+    title               TEXT,
+    description         TEXT,
+    completed           INTEGER,
+    priority            INTEGER,
+    start_date          TEXT,
+    due_date            TEXT,
+    recurrent_offset    INTEGER
+);
+CREATE INDEX IF NOT EXISTS tasks_uid ON tasks( uid );
+CREATE INDEX IF NOT EXISTS tasks_parent ON tasks( parent );
+CREATE INDEX IF NOT EXISTS tasks_start ON tasks( start_date );
+CREATE INDEX IF NOT EXISTS tasks_due ON tasks( due_date );
+CREATE TABLE IF NOT EXISTS reminders (
+    task_id     INTEGER NOT NULL,
+    position    INTEGER NOT NULL,
+    offset      REAL,
+    time_point  TEXT,
+    direction   TEXT,
+    PRIMARY KEY ( task_id, position )
+);
+CREATE TABLE IF NOT EXISTS recurrences (
+    task_id     INTEGER PRIMARY KEY,
+    mode        TEXT NOT NULL,
+    every       INTEGER NOT NULL,
+    end_date    TEXT
+);
+CREATE TABLE IF NOT EXISTS todos (
+    id          INTEGER PRIMARY KEY,
+    uid         TEXT,
+    parent      INTEGER,
+    position    INTEGER NOT NULL,
+    title       TEXT,
+    description TEXT,
+    completed   INTEGER,
+    priority    INTEGER
+);
+CREATE INDEX IF NOT EXISTS todos_uid ON todos( uid );
+CREATE INDEX IF NOT EXISTS todos_parent ON todos( parent );
+CREATE TABLE IF NOT EXISTS notes (
+    title       TEXT PRIMARY KEY,
+    position    INTEGER NOT NULL,
+    content     TEXT
+);
+"""
+
+TABLES = { KIND_TASK: "tasks", KIND_TODO: "todos" }
+
+## tasks with own dates overlapping given range or with recurrence (resolved after load)
+RANGE_CONDITION = """
+    COALESCE( t.start_date, t.due_date ) < :end
+    AND ( COALESCE( t.due_date, t.start_date ) >= :start
+          OR ( r.mode IS NOT NULL AND r.mode != 'NEVER'
+               AND ( r.end_date IS NULL
+                     OR julianday( r.end_date ) + 1
+                        + julianday( COALESCE( t.due_date, t.start_date ) )
+                        - julianday( COALESCE( t.start_date, t.due_date ) ) >= julianday( :start ) ) ) )
+"""
+
+## occurrence due of recurrent task is never before due of task
+DEADLINE_CONDITION = "t.due_date IS NOT NULL AND t.due_date <= :now"
+
+REMINDER_CONDITION = """
+    t.due_date IS NOT NULL
+    AND ( t.due_date <= :now
+          OR EXISTS ( SELECT 1 FROM reminders m
+                      WHERE m.task_id = t.id
+                      AND julianday( t.due_date ) - m.offset / 86400.0 <= julianday( :now ) ) )
+"""
+
+
+class SQLiteManager( Manager ):
+    """Manager keeping data in SQLite database.
+
+    Trees of items are loaded on first access. Before that, searching by UID,
+    by date range and by deadline is done by database and only trees containing
+    found items are loaded. Store writes only rows of changed items.
+    """
+
+    ## 1 - initial schema
+    _class_version = 1
+
+    def __init__(self, dbFile=None, migrateDir=None):
+        """Constructor."""
+        super().__init__()
+        self._tasks = None                  ## None -- not loaded yet
+        self._todos = None
+        self._notes = None
+
+        self._dbFile = dbFile
+        self._migrateDir = migrateDir       ## data of LocalManager imported to new database
+        self._connection: sqlite3.Connection = None
+
+        ## items loaded before whole list was loaded (by row id)
+        self._loadedItems: Dict[ str, Dict[ int, Item ] ] = { KIND_TASK: dict(), KIND_TODO: dict() }
+        self._rowIds: Dict[ Item, int ] = dict()
+
+        self._changes = ChangeJournal()
+        self._tasksListeners.append( self._changes )
+        self._tasksBatchListeners.append( self._changes )
+        self._todosListeners.append( self._changes )
+
+    def close( self ):
+        if self._connection is None:
+            return
+        self._connection.close()
+        self._connection = None
+
+    ## overriden
+    def storeData( self ):
+        if self._dbFile is None:
+            _LOGGER.warning( "unable to store data -- no database file given" )
+            return False
+
+        connection = self._getConnection()
+        if self._changes.isValid() and self.isValidated():
+            changes = self._changes.collectChanges( self )
+            if not changes:
+                _LOGGER.info( "no new data to store in %s", self._dbFile )
+                return False
+            _LOGGER.info( "storing %s changes to: %s", len( changes ), self._dbFile )
+            with connection:
+                self._storeChanges( changes )
+            return True
+
+        _LOGGER.info( "saving data to: %s", self._dbFile )
+        with connection:
+            self._storeAll( self.tasks, self.todos, self.notes )
+            self._setMeta( "validated", str( int( self.isValidated() ) ) )
+        self._changes.build( self.notes )
+        return True
+
+    ## overriden
+    def loadData( self ):
+        if self._dbFile is None:
+            _LOGGER.warning( "unable to load data -- no database file given" )
+            return
+
+        self._getConnection()
+        for items in self._loadedItems.values():
+            items.clear()
+        self._rowIds.clear()
+
+        ## empty lists prevent lazy loading of replaced lists
+        self._tasks = list()
+        self._todos = list()
+        self.tasks = self._loadItems( KIND_TASK )
+        self.todos = self._loadItems( KIND_TODO )
+        self.notes = self._loadNotes()
+
+        if self._getMeta( "validated" ) == "1":
+            self.markValidated()
+            self._changes.build( self.notes )
+        else:
+            ## possible repairs are stored with whole data
+            self.fixData()
+
+    ## ======================================================================
+
+    ## overriden
+    def findTaskByUID(self, uid) -> Task:
+        if self._isLoaded( KIND_TASK ):
+            return super().findTaskByUID( uid )
+        return self._findLoaded( KIND_TASK, uid )
+
+    ## overriden
+    def findToDoByUID(self, uid) -> LocalToDo:
+        if self._isLoaded( KIND_TODO ):
+            return super().findToDoByUID( uid )
+        return self._findLoaded( KIND_TODO, uid )
+
+    ## overriden
+    def getTaskOccurrencesForDate(self, taskDate: date, includeCompleted=True):
+        if self._isLoaded( KIND_TASK ):
+            return super().getTaskOccurrencesForDate( taskDate, includeCompleted )
+        occurrences = self.getTaskOccurrencesForRange( taskDate, taskDate, includeCompleted )
+        return occurrences.get( taskDate, list() )
+
+    ## overriden
+    def getTaskOccurrencesForRange(self, startDate: date, endDate: date,
+                                   includeCompleted=True) -> Dict[ date, List[TaskOccurrence] ]:
+        if self._isLoaded( KIND_TASK ):
+            return super().getTaskOccurrencesForRange( startDate, endDate, includeCompleted )
+        params = { "start": to_text( startDate ), "end": to_text( endDate + timedelta( days=1 ) ) }
+        roots = self._loadTrees( KIND_TASK, RANGE_CONDITION, params )
+        index = create_occurrence_index()
+        index.build( Item.getAllSubItemsFromList( roots ) )
+        retDict = index.getOccurrencesForRange( startDate, endDate )
+        if includeCompleted is False:
+            for currDate, occurrences in retDict.items():
+                retDict[ currDate ] = [ entry for entry in occurrences if not entry.isCompleted() ]
+        return retDict
+
+    ## overriden
+    def getDeadlinedTasks(self):
+        if self._isLoaded( KIND_TASK ):
+            return super().getDeadlinedTasks()
+        currTime = datetime.today()
+        roots = self._loadTrees( KIND_TASK, DEADLINE_CONDITION, { "now": to_text( currTime ) } )
+        scheduler = DeadlineScheduler()
+        scheduler.build( Item.getAllSubItemsFromList( roots ) )
+        return scheduler.getDeadlinedTasks( currTime )
+
+    ## overriden
+    def getRemindedTasks(self):
+        if self._isLoaded( KIND_TASK ):
+            return super().getRemindedTasks()
+        currTime = datetime.today()
+        roots = self._loadTrees( KIND_TASK, REMINDER_CONDITION, { "now": to_text( currTime ) } )
+        scheduler = DeadlineScheduler()
+        scheduler.build( Item.getAllSubItemsFromList( roots ) )
+        return scheduler.getRemindedTasks( currTime )
+
+    ## ======================================================================
+
+    ## overriden
+    def _getTasks( self ):
+        if self._tasks is None:
+            self._tasks = self._loadItems( KIND_TASK )
+            self._attachItems( self._tasks )
+        return self._tasks
+
+    ## overriden
+    def _setTasks( self, value ):
+        self._tasks = value
+
+    ## overriden
+    def createEmptyTask(self):
+        return LocalTask()
+
+    ## overriden
+    def _getToDos( self ):
+        if self._todos is None:
+            self._todos = self._loadItems( KIND_TODO )
+            self._attachItems( self._todos )
+        return self._todos
+
+    ## overriden
+    def _setToDos( self, value ):
+        self._todos = value
+
+    ## overriden
+    def createEmptyToDo(self) -> LocalToDo:
+        return LocalToDo()
+
+    ## overriden
+    def _getNotes(self):
+        if self._notes is None:
+            self._notes = self._loadNotes()
+        return self._notes
+
+    ## overriden
+    def _setNotes(self, value):
+        self._notes = value
+
+    @property
+    def notes(self):
+        return self._getNotes()
+
+    @notes.setter
+    def notes(self, value):
+        self._setNotes( value )
+
+    ## ======================================================================
+
+    def _getConnection( self ) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+        _LOGGER.info( "opening database: %s", self._dbFile )
+        self._connection = sqlite3.connect( self._dbFile )
+        self._connection.row_factory = sqlite3.Row
+        with self._connection:
+            self._connection.executescript( SCHEMA )
+            if self._getMeta( "version" ) is None:
+                self._migrate()
+                self._setMeta( "version", str( self._class_version ) )
+        self._changes.build( self._getNotes() )
+        return self._connection
+
+    def _migrate( self ):
+        """Import data of LocalManager to new database."""
+        if self._migrateDir is None:
+            return
+        if os.path.isfile( os.path.join( self._migrateDir, "version.obj" ) ) is False:
+            return
+        _LOGGER.info( "migrating data from: %s", self._migrateDir )
+        localManager = LocalManager( self._migrateDir )
+        localManager.loadData()
+        localManager.loadArchive()
+        self._storeAll( localManager.tasks, localManager.todos, localManager.notes )
+        self._setMeta( "validated", str( int( localManager.isValidated() ) ) )
+        self._setMeta( "migrated", self._migrateDir )
+        ## rows are loaded to new items
+        self._rowIds.clear()
+
+    def _getMeta( self, key ):
+        row = self._connection.execute( "SELECT value FROM meta WHERE key = ?", ( key, ) ).fetchone()
+        if row is None:
+            return None
+        return row[0]
+
+    def _setMeta( self, key, value ):
+        self._connection.execute( "INSERT OR REPLACE INTO meta ( key, value ) VALUES ( ?, ? )", ( key, value ) )
+
+    def _isLoaded( self, kind ):
+        if self._dbFile is None:
+            return True
+        if kind == KIND_TASK:
+            return self._tasks is not None
+        return self._todos is not None
+
+    def _findLoaded( self, kind, uid ):
+        ## in case of duplicated UID return first item in tree order (the same as UIDIndex)
+        roots = self._loadTrees( kind, "t.uid = :uid", { "uid": uid } )
+        for item in Item.getAllSubItemsFromList( roots ):
+            if item.UID == uid:
+                return item
+        return None
+
+    ## ======================================================================
+
+    def _loadItems( self, kind ) -> List[Item]:
+        """Load all items of given kind. Return list of root items."""
+        if self._dbFile is None:
+            return list()
+        table = TABLES[ kind ]
+        rows = self._getConnection().execute( "SELECT * FROM %s ORDER BY position" % table ).fetchall()
+        return self._createTrees( kind, rows )
+
+    def _loadTrees( self, kind, condition, params ) -> List[Item]:
+        """Load trees containing items matching condition. Return list of found root items ordered by position."""
+        table = TABLES[ kind ]
+        recurrenceJoin = ""
+        if kind == KIND_TASK:
+            recurrenceJoin = "LEFT JOIN recurrences r ON r.task_id = t.id"
+        query = """
+            WITH RECURSIVE
+            found( id, parent ) AS (
+                SELECT t.id, t.parent FROM {table} t {join} WHERE {condition}
+                UNION
+                SELECT p.id, p.parent FROM {table} p JOIN found ON p.id = found.parent
+            ),
+            subtree( id ) AS (
+                SELECT id FROM found WHERE parent IS NULL
+                UNION
+                SELECT c.id FROM {table} c JOIN subtree ON c.parent = subtree.id
+            )
+            SELECT {table}.* FROM {table} JOIN subtree USING ( id ) ORDER BY position
+        """.format( table=table, join=recurrenceJoin, condition=condition )
+        rows = self._getConnection().execute( query, params ).fetchall()
+        loaded = self._loadedItems[ kind ]
+        newRows = [ row for row in rows if row["id"] not in loaded ]
+        newRoots = self._createTrees( kind, newRows )
+        for item in newRoots:
+            item.setListener( self )
+        return [ loaded[ row["id"] ] for row in rows if row["parent"] is None or row["parent"] not in loaded ]
+
+    def _createTrees( self, kind, rows ) -> List[Item]:
+        """Create items from rows ordered by position. Return list of root items."""
+        loaded = self._loadedItems[ kind ]
+        states = self._loadStates( kind, rows )
+        itemsMap = dict()
+        for row in rows:
+            rowId = row["id"]
+            item = loaded.get( rowId, None )
+            if item is None:
+                itemClass = LocalTask if kind == KIND_TASK else LocalToDo
+                item = itemClass.__new__( itemClass )
+                item.__setstate__( states[ rowId ] )
+                loaded[ rowId ] = item
+                self._rowIds[ item ] = rowId
+            itemsMap[ rowId ] = item
+
+        roots = list()
+        for row in rows:
+            item = itemsMap[ row["id"] ]
+            parentId = row["parent"]
+            if parentId is None:
+                roots.append( item )
+                continue
+            parent = itemsMap.get( parentId, None )
+            if parent is None:
+                _LOGGER.warning( "unable to find parent %s of item %s", parentId, row["uid"] )
+                roots.append( item )
+                continue
+            if item.getParent() is parent:
+                ## item loaded before
+                continue
+            subitems = parent.getSubitems()
+            if subitems is None:
+                subitems = list()
+                parent.setSubitems( subitems )
+            subitems.append( item )
+            item.setParent( parent )
+        return roots
+
+    def _loadStates( self, kind, rows ):
+        states = dict()
+        if kind == KIND_TODO:
+            for row in rows:
+                states[ row["id"] ] = todo_state( row )
+            return states
+
+        rowIds = [ row["id"] for row in rows ]
+        reminders = dict()
+        recurrences = dict()
+        connection = self._getConnection()
+        for chunk in split_list( rowIds, 500 ):
+            marks = ", ".join( "?" * len( chunk ) )
+            query = "SELECT * FROM reminders WHERE task_id IN (%s) ORDER BY position" % marks
+            for reminderRow in connection.execute( query, chunk ):
+                reminders.setdefault( reminderRow["task_id"], list() ).append( to_reminder( reminderRow ) )
+            query = "SELECT * FROM recurrences WHERE task_id IN (%s)" % marks
+            for recurrenceRow in connection.execute( query, chunk ):
+                recurrences[ recurrenceRow["task_id"] ] = to_recurrence( recurrenceRow )
+        for row in rows:
+            rowId = row["id"]
+            states[ rowId ] = task_state( row, reminders.get( rowId, None ), recurrences.get( rowId, None ) )
+        return states
+
+    def _loadNotes( self ):
+        if self._dbFile is None:
+            return { "notes": "" }
+        rows = self._getConnection().execute( "SELECT title, content FROM notes ORDER BY position" ).fetchall()
+        if not rows:
+            return { "notes": "" }
+        return { row["title"]: row["content"] for row in rows }
+
+    ## ======================================================================
+
+    def _storeAll( self, tasks, todos, notes ):
+        connection = self._connection
+        for table in ( "tasks", "reminders", "recurrences", "todos" ):
+            connection.execute( "DELETE FROM %s" % table )
+        ## rows are recreated with new ids
+        self._rowIds.clear()
+        for items in self._loadedItems.values():
+            items.clear()
+        for kind, itemsList in ( ( KIND_TASK, tasks ), ( KIND_TODO, todos ) ):
+            self._insertTree( kind, itemsList, None )
+        self._storeNotes( notes )
+
+    def _insertTree( self, kind, itemsList, parentId ):
+        if itemsList is None:
+            return
+        for position, item in enumerate( itemsList ):
+            rowId = self._storeItem( kind, item )
+            self._storePosition( kind, rowId, parentId, position )
+            self._insertTree( kind, item.getSubitems(), rowId )
+
+    def _storeChanges( self, changes ):
+        for change in changes:
+            operation = change[0]
+            if operation == "del":
+                _, kind, item = change
+                rowId = self._rowIds.pop( item, None )
+                if rowId is not None:
+                    ## item could be added and removed before store
+                    self._deleteItem( kind, rowId )
+            elif operation == "put":
+                _, kind, item = change
+                self._storeItem( kind, item )
+        for change in changes:
+            operation = change[0]
+            if operation == "put":
+                _, kind, item = change
+                parentId = self._rowIds[ item ]
+                for position, subItem in enumerate( item.getSubitems() or [] ):
+                    self._storePosition( kind, self._rowIds[ subItem ], parentId, position )
+            elif operation == "roots":
+                _, kind, items = change
+                for position, item in enumerate( items ):
+                    self._storePosition( kind, self._rowIds[ item ], None, position )
+            elif operation == "notes":
+                self._storeNotes( change[1] )
+
+    def _storeItem( self, kind, item ):
+        """Insert or update fields of item. Position in tree is kept. Return row id of item."""
+        connection = self._connection
+        state = item.__getstate__()
+        rowId = self._rowIds.get( item, None )
+        if kind == KIND_TODO:
+            values = ( state["_UID"], state["_title"], state["_description"], state["_completed"], state["_priority"] )
+            if rowId is None:
+                cursor = connection.execute( """INSERT INTO todos ( uid, position, title, description, completed, priority )
+                                                VALUES ( ?, 0, ?, ?, ?, ? )""", values )
+                rowId = cursor.lastrowid
+                self._rowIds[ item ] = rowId
+            else:
+                connection.execute( """UPDATE todos SET uid=?, title=?, description=?, completed=?, priority=?
+                                       WHERE id = ?""", values + ( rowId, ) )
+            return rowId
+        values = ( state["_UID"], state["_title"], state["_description"], state["_completed"], state["_priority"],
+                   to_text( state["_startDate"] ), to_text( state["_dueDate"] ), state["_recurrentOffset"] )
+        if rowId is None:
+            cursor = connection.execute( """INSERT INTO tasks ( uid, position, title, description, completed, priority,
+                                                                start_date, due_date, recurrent_offset )
+                                            VALUES ( ?, 0, ?, ?, ?, ?, ?, ?, ? )""", values )
+            rowId = cursor.lastrowid
+            self._rowIds[ item ] = rowId
+        else:
+            connection.execute( """UPDATE tasks SET uid=?, title=?, description=?, completed=?, priority=?,
+                                                    start_date=?, due_date=?, recurrent_offset=?
+                                   WHERE id = ?""", values + ( rowId, ) )
+        connection.execute( "DELETE FROM reminders WHERE task_id = ?", ( rowId, ) )
+        for position, reminder in enumerate( state["_reminderList"] or [] ):
+            connection.execute( "INSERT INTO reminders VALUES ( ?, ?, ?, ?, ? )",
+                                ( rowId, position, reminder.getOffset().total_seconds(),
+                                  enum_name( reminder.timePoint ), enum_name( reminder.direction ) ) )
+        connection.execute( "DELETE FROM recurrences WHERE task_id = ?", ( rowId, ) )
+        recurrence = state["_recurrence"]
+        if recurrence is not None:
+            connection.execute( "INSERT INTO recurrences VALUES ( ?, ?, ?, ? )",
+                                ( rowId, recurrence.mode.name, recurrence.every, to_text( recurrence.endDate ) ) )
+        return rowId
+
+    def _storePosition( self, kind, rowId, parentId, position ):
+        self._connection.execute( "UPDATE %s SET parent = ?, position = ? WHERE id = ?" % TABLES[ kind ],
+                                  ( parentId, position, rowId ) )
+
+    def _deleteItem( self, kind, rowId ):
+        connection = self._connection
+        connection.execute( "DELETE FROM %s WHERE id = ?" % TABLES[ kind ], ( rowId, ) )
+        self._loadedItems[ kind ].pop( rowId, None )
+        if kind == KIND_TASK:
+            connection.execute( "DELETE FROM reminders WHERE task_id = ?", ( rowId, ) )
+            connection.execute( "DELETE FROM recurrences WHERE task_id = ?", ( rowId, ) )
+
+    def _storeNotes( self, notes ):
+        connection = self._connection
+        connection.execute( "DELETE FROM notes" )
+        for position, ( title, content ) in enumerate( notes.items() ):
+            connection.execute( "INSERT INTO notes VALUES ( ?, ?, ? )", ( title, position, content ) )
+
+
+## ========================================================================
+
+
+def to_text( value ):
+    """Convert date or datetime to text preserving order of values."""
+    if value is None:
+        return None
+    if isinstance( value, datetime ):
+        return value.isoformat( sep=" " )
+    return value.isoformat()
+
+
+def from_text( text ):
+    if text is None:
+        return None
+    if len( text ) == 10:
+        return date.fromisoformat( text )
+    return datetime.fromisoformat( text )
+
+
+def enum_name( value ):
+    if value is None:
+        return None
+    return value.name
+
+
+def split_list( values, size ):
+    for i in range( 0, len( values ), size ):
+        yield values[ i:i + size ]
+
+
+def to_reminder( row ) -> Reminder:
+    timePoint = None
+    if row["time_point"] is not None:
+        timePoint = TimePointType[ row["time_point"] ]
+    direction = None
+    if row["direction"] is not None:
+        direction = RemainderDirectionType[ row["direction"] ]
+    return Reminder( timeOffset=timedelta( seconds=row["offset"] ), timePoint=timePoint, direction=direction )
+
+
+def to_recurrence( row ) -> Recurrent:
+    return Recurrent( RepeatType[ row["mode"] ], row["every"], from_text( row["end_date"] ) )
+
+
+def todo_state( row ):
+    return { "_class_version": LocalToDo._class_version,
+             "_UID": row["uid"],
+             "_title": row["title"],
+             "_description": row["description"],
+             "_completed": row["completed"],
+             "_priority": row["priority"],
+             "_parent": None,
+             "subitems": None
+             }
+
+
+def task_state( row, reminders, recurrence ):
+    return { "_class_version": LocalTask._class_version,
+             "_UID": row["uid"],
+             "_title": row["title"],
+             "_description": row["description"],
+             "_completed": row["completed"],
+             "_priority": row["priority"],
+             "_parent": None,
+             "subitems": None,
+             "_startDate": from_text( row["start_date"] ),
+             "_dueDate": from_text( row["due_date"] ),
+             "_reminderList": reminders,
+             "_recurrence": recurrence,
+             "_recurrentOffset": row["recurrent_offset"]
+             }
@@ -25,7 +25,7 @@ import logging
 from enum import Enum, unique, auto
 import abc
 
-from typing import List
+from typing import List, Dict, Tuple
 from datetime import date, time, datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
@@ -38,7 +38,14 @@ from hanlendar.domainmodel.recurrent import Recurrent
 _LOGGER = logging.getLogger(__name__)
 
 
+## marker of value not calculated yet
+UNRESOLVED = object()
+
+
 class DateRange():
+    """Range of dates. Treated as immutable value -- operations return new objects."""
+
+    __slots__ = ( "start", "end" )
 
     def __init__(self, start=None, end=None ):
         self.start: date = start
@@ -77,9 +84,10 @@ class DateRange():
             return False
         return True
 
-    def normalize(self):
+    def normalized(self) -> 'DateRange':
         if self.start is None:
-            self.start = self.end
+            return DateRange( self.end, self.end )
+        return self
 
     def isInMonth( self, monthDate: date ):
         currDate = self.start
@@ -97,6 +105,9 @@ class DateRange():
 
 
 class DateTimeRange():
+    """Range of date-times, counterpart of DateRange."""
+
+    __slots__ = ( "start", "end" )
 
     def __init__(self, start=None, end=None ):
         self.start: datetime = start
@@ -144,9 +155,10 @@ class DateTimeRange():
             return False
         return True
 
-    def normalize(self):
+    def normalized(self) -> 'DateTimeRange':
         if self.start is None:
-            self.start = self.end
+            return DateTimeRange( self.end, self.end )
+        return self
 
     def isInMonth( self, monthDate: datetime ):
         currDate = self.start
@@ -184,6 +196,8 @@ class TaskOccurrence:
     Recurrent tasks has many occurrences.
     """
 
+    __slots__ = ( "task", "offset", "_dateRange" )
+
     def __init__(self, task, offset=0):
         if task is None:
             raise TypeError
@@ -214,16 +228,13 @@ class TaskOccurrence:
 
     @property
     def startCurrent(self):
-        subOccurrences = self.task.subOccurences()
         retDate = self.start
-        for currItem in subOccurrences:
-            if currItem.start is None:
-                continue
-            if retDate is None:
-                retDate = currItem.start
-            else:
-                retDate = min( currItem.start, retDate )
-        return retDate
+        subStart = self.task.getSubitemsDates()[0]
+        if subStart is None:
+            return retDate
+        if retDate is None:
+            return subStart
+        return min( subStart, retDate )
 
     @property
     def due(self):
@@ -231,16 +242,13 @@ class TaskOccurrence:
 
     @property
     def dueCurrent(self):
-        subOccurrences = self.task.subOccurences()
         retDate = self.due
-        for currItem in subOccurrences:
-            if currItem.due is None:
-                continue
-            if retDate is None:
-                retDate = currItem.due
-            else:
-                retDate = min( currItem.due, retDate )
-        return retDate
+        subDue = self.task.getSubitemsDates()[1]
+        if subDue is None:
+            return retDate
+        if retDate is None:
+            return subDue
+        return min( subDue, retDate )
 
     def isCompleted(self):
         if self.offset < self.task.recurrentOffset:
@@ -267,7 +275,7 @@ class TaskOccurrence:
 
     @property
     def dateRange(self):
-        if hasattr(self, '_dateRange') and self._dateRange is not None:
+        if self._dateRange is not None:
             return self._dateRange
 
         dateRange: DateTimeRange = self.task.getDateTimeRange()
@@ -368,9 +376,42 @@ class TaskField(Enum):
 class Task( Item ):
     """Task is entity that lasts over time."""
 
+    ## fields not persisted
+    _transient_fields = Item._transient_fields + ( "_baseOccurrence", "_subitemsDates", "_appliedRecurrence" )
+
+    ## shared occurrence with offset 0 (cache)
+    _baseOccurrence: TaskOccurrence = None
+
+    ## earliest start and due of current occurrences of subtasks (cache)
+    _subitemsDates: Tuple[datetime, datetime] = None
+
+    ## recurrence resolved by 'getAppliedRecurrence()' (cache)
+    _appliedRecurrence: Recurrent = UNRESOLVED
+
     def __init__(self):
         super(Task, self).__init__()
 
+    ## overriden
+    def _notifyChanged(self, field: str):
+        self._baseOccurrence = None
+        if field == "recurrence":
+            ## subtasks can inherit recurrence
+            self.invalidateAppliedRecurrence()
+        parent = self.getParent()
+        if parent is not None:
+            parent._subitemsDates = None
+        super()._notifyChanged( field )
+
+    ## overriden
+    def _notifySubItemAdded(self, item: Item):
+        self._subitemsDates = None
+        super()._notifySubItemAdded( item )
+
+    ## overriden
+    def _notifySubItemRemoved(self, item: Item):
+        self._subitemsDates = None
+        super()._notifySubItemRemoved( item )
+
     @abc.abstractmethod
     def _getStartDateTime(self) -> datetime:
         raise NotImplementedError('You need to define this method in derived class!')
@@ -388,6 +429,7 @@ class Task( Item ):
         value = ensure_date_time( value )
         self._setStartDateTime( value )
         self._setRecurrentOffset( 0 )
+        self._notifyChanged( "startDateTime" )
 
     ## ========================================================================
 
@@ -408,6 +450,7 @@ class Task( Item ):
         value = ensure_date_time( value )
         self._setDueDateTime( value )
         self._setRecurrentOffset( 0 )
+        self._notifyChanged( "dueDateTime" )
 
     ## ========================================================================
 
@@ -424,9 +467,10 @@ class Task( Item ):
         relativeDate = self._getRecurrenceRelative()
         if relativeDate is None:
             self._setStartDateTime( value )
-            return
-        diff = value - relativeDate
-        self._setStartDateTime( diff )
+        else:
+            diff = value - relativeDate
+            self._setStartDateTime( diff )
+        self._notifyChanged( "startDateTime" )
 
     ## ========================================================================
 
@@ -442,11 +486,11 @@ class Task( Item ):
     def occurrenceDue(self, value):
         relativeDate = self._getRecurrenceRelative()
         if relativeDate is None:
-            self._dueDate = value
             self._setDueDateTime( value )
-            return
-        diff = value - relativeDate
-        self._setDueDateTime( diff )
+        else:
+            diff = value - relativeDate
+            self._setDueDateTime( diff )
+        self._notifyChanged( "dueDateTime" )
 
     ## ========================================================================
 
@@ -468,8 +512,20 @@ class Task( Item ):
         if recurrence is None and value is not None:
             self._setRecurrentOffset( 0 )
         self._setRecurrence( value )
+        self._notifyChanged( "recurrence" )
+
+    def updateRecurrence(self):
+        """Notify about change made directly in recurrence object."""
+        self._notifyChanged( "recurrence" )
 
     def getAppliedRecurrence(self) -> Recurrent:
+        recurrence = self._appliedRecurrence
+        if recurrence is UNRESOLVED:
+            recurrence = self._resolveRecurrence()
+            self._appliedRecurrence = recurrence
+        return recurrence
+
+    def _resolveRecurrence(self) -> Recurrent:
         recurrence = self._getRecurrence()
         if recurrence is None:
             return None
@@ -480,6 +536,32 @@ class Task( Item ):
             return None
         return parent.getAppliedRecurrence()
 
+    def invalidateAppliedRecurrence(self):
+        """Drop resolved recurrence of task and its subtasks (e.g. on change of parent).
+
+        Occurrences of subtasks depend on resolved recurrence, so cached dates
+        of subtasks in subtree and in ancestors are dropped as well.
+        """
+        self._invalidateRecurrenceTree()
+        Task.invalidateSubitemsDates( self.getParent() )
+
+    def _invalidateRecurrenceTree(self):
+        self._appliedRecurrence = UNRESOLVED
+        self._subitemsDates = None
+        subitems = self.getSubitems()
+        if subitems is None:
+            return
+        for subTask in subitems:
+            subTask._invalidateRecurrenceTree()
+
+    @staticmethod
+    def invalidateSubitemsDates( task: 'Task' ):
+        """Drop cached dates of subtasks of given task and its ancestors."""
+        currItem = task
+        while currItem is not None:
+            currItem._subitemsDates = None
+            currItem = currItem.getParent()
+
     ## ========================================================================
 
     @abc.abstractmethod
@@ -499,13 +581,50 @@ class Task( Item ):
         if value is None:
             value = 0
         self._setRecurrentOffset( value )
+        self._notifyChanged( "recurrentOffset" )
 
     ## ========================================================================
 
     def currentOccurrence(self) -> TaskOccurrence:
         recOffset = self._getRecurrentOffset()
+        if recOffset == 0:
+            return self.getBaseOccurrence()
         return TaskOccurrence( self, recOffset )
 
+    def getBaseOccurrence(self) -> TaskOccurrence:
+        """Return occurrence with offset 0.
+
+        Object is shared between callers and recreated on change of the task.
+        """
+        occurrence = self._baseOccurrence
+        if occurrence is None:
+            occurrence = TaskOccurrence( self )
+            self._baseOccurrence = occurrence
+        return occurrence
+
+    def getSubitemsDates(self) -> Tuple[datetime, datetime]:
+        """Return earliest start and earliest due of current occurrences of subtasks.
+
+        Values are cached and recalculated after change of subtasks.
+        """
+        dates = self._subitemsDates
+        if dates is None:
+            dates = self._calculateSubitemsDates()
+            self._subitemsDates = dates
+        return dates
+
+    def _calculateSubitemsDates(self) -> Tuple[datetime, datetime]:
+        minStart = None
+        minDue   = None
+        for currItem in self.subOccurences():
+            currStart = currItem.start
+            if currStart is not None and ( minStart is None or currStart < minStart ):
+                minStart = currStart
+            currDue = currItem.due
+            if currDue is not None and ( minDue is None or currDue < minDue ):
+                minDue = currDue
+        return ( minStart, minDue )
+
     def subOccurences(self) -> List[TaskOccurrence]:
         subitems = self.getSubitems()
         if subitems is None:
@@ -518,12 +637,11 @@ class Task( Item ):
 
     def getTaskOccurrenceForDate(self, entryDate: date) -> TaskOccurrence:
         dateTimeRange: DateTimeRange = self.getDateTimeRange()
-        dateRange = dateTimeRange.dateRange()
-        dateRange.normalize()
+        dateRange = dateTimeRange.dateRange().normalized()
         if dateRange.isNormalized() is False:
             return None
         if entryDate in dateRange:
-            return TaskOccurrence( self )
+            return self.getBaseOccurrence()
 
         recurr = self.getAppliedRecurrence()
         if recurr is None:
@@ -543,6 +661,75 @@ class Task( Item ):
             return TaskOccurrence( self, multiplicator )
         return None
 
+    def getTaskOccurrencesForRange(self, startDate: date, endDate: date) -> Dict[date, TaskOccurrence]:
+        """Return occurrences for each day in given range (inclusive).
+
+        Result is the same as calling 'getTaskOccurrenceForDate()' for each day,
+        but recurrence is expanded only once for whole range.
+        """
+        retDict: Dict[date, TaskOccurrence] = dict()
+        recurr = self.getAppliedRecurrence()
+        lastDate = endDate
+        if recurr is not None and recurr.endDate is not None:
+            lastDate = min( lastDate, recurr.endDate )
+        for occurrence in self.iterOccurrences( startDate, endDate ):
+            occurrenceRange = occurrence.dateRange.dateRange().normalized()
+            rangeEnd = endDate
+            if occurrence.offset > 0:
+                rangeEnd = lastDate
+            for currDate in iterate_days( max( occurrenceRange.start, startDate ), min( occurrenceRange.end, rangeEnd ) ):
+                if currDate in retDict:
+                    ## day already covered by previous occurrence
+                    continue
+                retDict[ currDate ] = occurrence
+        return retDict
+
+    def iterOccurrences(self, startDate: date = None, endDate: date = None, includeCompleted=True):
+        """Generate occurrences overlapping given range of days (inclusive) ordered by offset.
+
+        Range can be open from any side. Generator is infinite for recurrent task
+        without end date if 'endDate' is not given.
+        If 'includeCompleted' is False, then completed occurrences are skipped.
+        """
+        dateTimeRange: DateTimeRange = self.getDateTimeRange()
+        dateRange = dateTimeRange.dateRange().normalized()
+        if dateRange.isNormalized() is False:
+            return
+
+        firstOffset = 0
+        if includeCompleted is False:
+            if self.isCompleted():
+                return
+            firstOffset = self._getRecurrentOffset()
+
+        if firstOffset < 1 and is_range_overlap( dateRange, startDate, endDate ):
+            yield self.getBaseOccurrence()
+
+        recurr = self.getAppliedRecurrence()
+        if recurr is None:
+            return
+        recurrentOffset: relativedelta = recurr.getDateOffset()
+        if recurrentOffset is None:
+            return
+
+        lastDate = endDate
+        if recurr.endDate is not None:
+            if lastDate is None:
+                lastDate = recurr.endDate
+            else:
+                lastDate = min( lastDate, recurr.endDate )
+
+        multiplicator = max( firstOffset, 1 )
+        if startDate is not None:
+            multiplicator = max( multiplicator, recurrent.find_multiplication_after( dateRange.end, startDate, recurrentOffset ) )
+        while True:
+            occurrenceRange = dateRange + recurrentOffset * multiplicator
+            if lastDate is not None and occurrenceRange.start > lastDate:
+                return
+            if is_range_overlap( occurrenceRange, startDate, None ):
+                yield TaskOccurrence( self, multiplicator )
+            multiplicator += 1
+
     ## ========================================================================
 
     def getReferenceDateTime(self) -> datetime:
@@ -599,6 +786,7 @@ class Task( Item ):
     @reminderList.setter
     def reminderList(self, values):
         self._setReminderList( values )
+        self._notifyChanged( "reminderList" )
 
     def addReminder( self, reminder=None ):
         reminderList = self._getReminderList()
@@ -608,6 +796,7 @@ class Task( Item ):
         if reminder is None:
             reminder = Reminder()
         reminderList.append( reminder )
+        self._notifyChanged( "reminderList" )
         return reminder
 
     def addReminderDays( self, days=1 ):
@@ -756,6 +945,24 @@ def calc_time_span(entryDate: date, start: datetime, end: datetime):
     return ret
 
 
+def is_range_overlap( dateRange: DateRange, startDate: date, endDate: date ):
+    """Check if range overlaps range of days. 'None' means open side."""
+    if startDate is not None and dateRange.end < startDate:
+        return False
+    if endDate is not None and dateRange.start > endDate:
+        return False
+    return True
+
+
+def iterate_days( startDate: date, endDate: date ):
+    """Iterate over days in range (inclusive)."""
+    currDate = startDate
+    oneDay   = timedelta( days=1 )
+    while currDate <= endDate:
+        yield currDate
+        currDate += oneDay
+
+
 def ensure_date_time( value ):
     if value is None:
         return value
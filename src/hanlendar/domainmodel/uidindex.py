@@ -0,0 +1,122 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+
+from typing import Dict, List
+
+from hanlendar.domainmodel.item import Item, ItemListener
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class UIDIndex( ItemListener ):
+    """Map of UID to item.
+
+    In case of duplicated UID the index points to first item in tree order.
+    """
+
+    def __init__(self):
+        self._valid = False
+        self._uidItems: Dict[ str, Item ]  = dict()
+        self._itemUIDs: Dict[ Item, str ]  = dict()     ## reverse map to handle change of UID
+        self._duplicated = False
+
+    def isValid(self):
+        return self._valid
+
+    def invalidate(self):
+        self._valid = False
+        self._uidItems.clear()
+        self._itemUIDs.clear()
+        self._duplicated = False
+
+    def build(self, itemsList: List[Item]):
+        self.invalidate()
+        for item in itemsList:
+            self._addItem( item )
+        self._valid = True
+
+    def findByUID(self, uid) -> Item:
+        return self._uidItems.get( uid, None )
+
+    ## ======================================================================
+
+    def addItemTree(self, item: Item):
+        self._addItem( item )
+        for subItem in item.getAllSubItems():
+            self._addItem( subItem )
+
+    def removeItemTree(self, item: Item):
+        self._removeItem( item )
+        for subItem in item.getAllSubItems():
+            self._removeItem( subItem )
+
+    def _addItem(self, item: Item):
+        uid = item.UID
+        self._itemUIDs[ item ] = uid
+        if uid in self._uidItems:
+            _LOGGER.warning( "duplicated UID: %s", uid )
+            self._duplicated = True
+            return
+        self._uidItems[ uid ] = item
+
+    def _removeItem(self, item: Item):
+        uid = self._itemUIDs.pop( item, None )
+        if uid is None:
+            return
+        if self._uidItems.get( uid, None ) is not item:
+            return
+        del self._uidItems[ uid ]
+        if self._duplicated:
+            ## other item with the same UID could be present -- rebuild on demand
+            self.invalidate()
+
+    ## ======================================================================
+
+    ## overriden
+    def itemChanged(self, item: Item, field: str):
+        if self._valid is False:
+            return
+        if field != "UID":
+            return
+        if item not in self._itemUIDs:
+            return
+        self._removeItem( item )
+        if self._valid is False:
+            return
+        self._addItem( item )
+
+    ## overriden
+    def subItemAdded(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.addItemTree( item )
+
+    ## overriden
+    def subItemRemoved(self, parent: Item, item: Item):
+        if self._valid is False:
+            return
+        self.removeItemTree( item )
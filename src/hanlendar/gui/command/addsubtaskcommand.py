@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,8 +45,9 @@ class AddSubTaskCommand( QUndoCommand ):
 
     def redo(self):
         self.parentTask.addSubItem( self.newTask )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.added( self.newTask ) )
 
     def undo(self):
+        event = ChangeEvent.removed( self.newTask )
         self.parentTask.removeSubItem( self.newTask )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( event )
@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,8 +45,8 @@ class AddSubToDoCommand( QUndoCommand ):
 
     def redo(self):
         self.parentToDo.addSubItem( self.newToDo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.added( self.newToDo ) )
 
     def undo(self):
         self.parentToDo.removeSubItem( self.newToDo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.removed( self.newToDo ) )
@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,8 +44,9 @@ class AddTaskCommand( QUndoCommand ):
 
     def redo(self):
         self.domainModel.addTask( self.newTask )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.added( self.newTask ) )
 
     def undo(self):
+        event = ChangeEvent.removed( self.newTask )
         self.domainModel.removeTask( self.newTask )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( event )
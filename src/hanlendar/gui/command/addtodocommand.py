@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,8 +44,8 @@ class AddToDoCommand( QUndoCommand ):
 
     def redo(self):
         self.domainModel.addToDo( self.newToDo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.added( self.newToDo ) )
 
     def undo(self):
         self.domainModel.removeToDo( self.newToDo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.removed( self.newToDo ) )
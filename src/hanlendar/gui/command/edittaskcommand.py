@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent, date_window
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,9 +44,11 @@ class EditTaskCommand( QUndoCommand ):
         self.setText( "Edit Task: " + newTask.title )
 
     def redo(self):
+        oldWindow = date_window( self.oldTask )
         self.domainModel.replaceTask( self.oldTask, self.newTask )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.modified( self.newTask, oldWindow ) )
 
     def undo(self):
+        oldWindow = date_window( self.newTask )
         self.domainModel.replaceTask( self.newTask, self.oldTask )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.modified( self.oldTask, oldWindow ) )
@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,8 +45,8 @@ class EditToDoCommand( QUndoCommand ):
 
     def redo(self):
         self.domainModel.replaceToDo( self.oldToDo, self.newToDo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.modified( self.newToDo, None ) )
 
     def undo(self):
         self.domainModel.replaceToDo( self.newToDo, self.oldToDo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.modified( self.oldToDo, None ) )
@@ -26,7 +26,7 @@ import logging
 from PyQt5.QtWidgets import QUndoCommand
 
 from PyQt5.QtWidgets import QMessageBox
-from hanlendar.domainmodel.icalio import import_icalendar_content
+from hanlendar.domainmodel.icalio import import_icalendar_content, fix_dangling_tasks
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,7 +45,14 @@ class ImportICalendarCommand( QUndoCommand ):
         self.setText("Import iCalendar")
 
     def redo(self):
-        self.newTasks = import_icalendar_content( self.domainModel, self.content )
+        with self.data.batch():
+            imported = import_icalendar_content( self.domainModel, self.content )
+            if imported is None:
+                self.newTasks = None
+            else:
+                self.newTasks, dangling_children = imported
+                self.newTasks.extend( child for child, _ in dangling_children )
+                fix_dangling_tasks( self.domainModel, dangling_children )
         if self.newTasks is None:
             if self.silent is False:
                 QMessageBox.warning( None, "Import iCalendar", "Unable to import data" )
@@ -61,12 +68,10 @@ class ImportICalendarCommand( QUndoCommand ):
             QMessageBox.information( None, "Import iCalendar", message )
             self.silent = True                  ## do not show message on repeated redo
 
-        self.data.tasksChanged.emit()
-
     def undo(self):
         if self.newTasks is None:
             return
-        for item in self.newTasks:
-            self.domainModel.removeTask( item )
+        with self.data.batch():
+            for item in self.newTasks:
+                self.domainModel.removeTask( item )
         self.newTasks = []
-        self.data.tasksChanged.emit()
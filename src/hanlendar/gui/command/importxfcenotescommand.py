@@ -42,9 +42,9 @@ class ImportXfceNotesCommand( QUndoCommand ):
         self.setText("Import Xfce Notes")
 
     def redo(self):
-        self.domainModel.setNotes( self.newNotes )
-        self.data.notesChanged.emit()
+        with self.data.batch():
+            self.domainModel.setNotes( self.newNotes )
 
     def undo(self):
-        self.domainModel.setNotes( self.oldNotes )
-        self.data.notesChanged.emit()
+        with self.data.batch():
+            self.domainModel.setNotes( self.oldNotes )
@@ -26,6 +26,8 @@ import copy
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent, date_window
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,9 +47,11 @@ class MarkTaskCompletedCommand( QUndoCommand ):
         self.setText( "Mark Task completed: " + task.title )
 
     def redo(self):
+        oldWindow = date_window( self.oldState )
         self.domainModel.replaceTask( self.oldState, self.task )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.modified( self.task, oldWindow ) )
 
     def undo(self):
+        oldWindow = date_window( self.task )
         self.domainModel.replaceTask( self.task, self.oldState )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.modified( self.oldState, oldWindow ) )
@@ -26,6 +26,8 @@ import copy
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,8 +48,8 @@ class MarkToDoCompletedCommand( QUndoCommand ):
 
     def redo(self):
         self.domainModel.replaceToDo( self.oldState, self.todo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.modified( self.todo, None ) )
 
     def undo(self):
         self.domainModel.replaceToDo( self.todo, self.oldState )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.modified( self.oldState, None ) )
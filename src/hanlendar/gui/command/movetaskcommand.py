@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent, date_window
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,13 +46,15 @@ class MoveTaskCommand( QUndoCommand ):
         self.setText( "Move Task: " + self.task.title )
 
     def redo(self):
+        oldWindow = date_window( self.task )
         self.domainModel.removeTask( self.task )
         self.parentTask.addSubItem( self.task, self.targetIndex )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.moved( self.task, oldWindow ) )
 
     def undo(self):
         if self.parentTask is None:
             return
+        oldWindow = date_window( self.task )
         self.parentTask.removeSubItem( self.task )
         self.domainModel.insertTask( self.task, self.taskCoords )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.moved( self.task, oldWindow ) )
@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,9 +48,9 @@ class MoveToDoCommand( QUndoCommand ):
     def redo(self):
         self.domainModel.removeToDo( self.todo )
         self.parentToDo.addSubItem( self.todo, self.targetIndex )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.moved( self.todo, None ) )
 
     def undo(self):
         self.parentToDo.removeSubItem( self.todo )
         self.domainModel.insertToDo( self.todo, self.todoCoords )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.moved( self.todo, None ) )
@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,11 +44,12 @@ class RemoveTaskCommand( QUndoCommand ):
         self.setText( "Remove Task: " + task.title )
 
     def redo(self):
+        event = ChangeEvent.removed( self.task )
         removed = self.domainModel.removeTask( self.task )
         if removed is None:
             _LOGGER.warning( "unable to remove task: %s", self.task )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( event )
 
     def undo(self):
         self.domainModel.insertTask( self.task, self.taskCoords )
-        self.data.tasksChanged.emit()
+        self.data.taskChangeEvent.emit( ChangeEvent.added( self.task ) )
@@ -25,6 +25,8 @@ import logging
 
 from PyQt5.QtWidgets import QUndoCommand
 
+from hanlendar.domainmodel.changeevent import ChangeEvent
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -45,8 +47,8 @@ class RemoveToDoCommand( QUndoCommand ):
         removed = self.domainModel.removeToDo( self.todo )
         if removed is None:
             _LOGGER.warning( "unable to remove todo: %s", self.todo )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.removed( self.todo ) )
 
     def undo(self):
         self.domainModel.insertToDo( self.todo, self.todoCoords )
-        self.data.todosChanged.emit()
+        self.data.todoChangeEvent.emit( ChangeEvent.added( self.todo ) )
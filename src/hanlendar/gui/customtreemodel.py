@@ -29,6 +29,7 @@ from PyQt5 import QtCore
 from PyQt5.QtCore import Qt, QModelIndex
 
 from hanlendar.domainmodel.item import Item
+from hanlendar.domainmodel.changeevent import ChangeEvent, ChangeType
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -76,13 +77,10 @@ class CustomTreeModel( QtCore.QAbstractItemModel ):
         parentItem = self.getParent( indexItem )
         if parentItem is None:
             return QModelIndex()
-        grandParentItem = self.getParent( parentItem )
-        children = self.getChildren( grandParentItem )
-        try:
-            parentRow = children.index( parentItem )
-            return self.createIndex( parentRow, 0, parentItem )
-        except ValueError:
+        parentRow = self.getRow( parentItem )
+        if parentRow < 0:
             return QModelIndex()
+        return self.createIndex( parentRow, 0, parentItem )
 
     def flags(self, index: QModelIndex):
         if not index.isValid():
@@ -168,6 +166,15 @@ class CustomTreeModel( QtCore.QAbstractItemModel ):
                 return subIndex
         return None
 
+    def getRow(self, item: object) -> int:
+        """Return position of item in list of its siblings or -1 if not found."""
+        parentItem = self.getParent( item )
+        children = self.getChildren( parentItem )
+        try:
+            return children.index( item )
+        except ValueError:
+            return -1
+
     ## ==================================================================
 
     @abc.abstractmethod
@@ -203,6 +210,39 @@ class CustomTreeModel( QtCore.QAbstractItemModel ):
 
 
 class ItemTreeModel( CustomTreeModel ):
+    """Tree model of items.
+
+    Model keeps copies of lists of children already exposed to views, so
+    changes of data can be announced as insertion and removal of rows
+    (see 'updateItem()') instead of reset of whole model.
+    """
+
+    def __init__(self, parent, *args):
+        super().__init__(parent, *args)
+        self._childrenCache = dict()        ## parent item (None for root list) to list of children
+        self._rowsCache     = dict()        ## parent item to dict of children rows
+        self._parentsCache  = dict()        ## item to its parent
+        self._resetting     = False
+        self.modelAboutToBeReset.connect( self._startReset )
+        self.modelReset.connect( self._finishReset )
+
+    def updateItem(self, event: ChangeEvent):
+        """Announce change of item to views."""
+        if self._resetting:
+            ## whole model will be reloaded
+            return
+        item = event.item
+        if event.isStructural() and item in self._parentsCache:
+            oldParent = self._parentsCache[ item ]
+            self._syncChildren( oldParent )
+            self._emitDataChanged( oldParent )
+        newParent = item.getParent()
+        if event.changeType is not ChangeType.REMOVED:
+            self._syncChildren( newParent )
+        if event.changeType is ChangeType.MODIFIED:
+            self._emitDataChanged( item )
+        else:
+            self._emitDataChanged( newParent )
 
 #     def moveItem(self, itemId, targetItem, targetIndex):
 #         itemsList = self.getRootList()
@@ -217,13 +257,28 @@ class ItemTreeModel( CustomTreeModel ):
 #         self.setRootList( itemsList )
 
     def getChildren(self, parent):
-        if parent is not None:
-            return parent.getSubitems()
-        return self.getRootList()
+        children = self._childrenCache.get( parent, None )
+        if children is None:
+            children = self._readChildren( parent )
+            self._childrenCache[ parent ] = children
+            for child in children:
+                self._parentsCache[ child ] = parent
+        return children
 
     def getParent(self, item):
-        parent = item.getParent()
-        return parent
+        if item in self._parentsCache:
+            return self._parentsCache[ item ]
+        return item.getParent()
+
+    ## overrided
+    def getRow(self, item: object) -> int:
+        parentItem = self.getParent( item )
+        rows = self._rowsCache.get( parentItem, None )
+        if rows is None:
+            children = self.getChildren( parentItem )
+            rows = { child: row for row, child in enumerate( children ) }
+            self._rowsCache[ parentItem ] = rows
+        return rows.get( item, -1 )
 
     def getItemId(self, item: object):
         itemsList = self.getRootList()
@@ -231,6 +286,102 @@ class ItemTreeModel( CustomTreeModel ):
 
     ## ================================================================
 
+    def _readChildren(self, parent) -> list:
+        if parent is not None:
+            children = parent.getSubitems()
+        else:
+            children = self.getRootList()
+        if children is None:
+            return list()
+        return list( children )
+
+    def _syncChildren(self, parent):
+        """Update cached list of children and announce inserted and removed rows."""
+        oldList = self._childrenCache.get( parent, None )
+        if oldList is None:
+            ## children not exposed to views yet
+            return
+        parentIndex = self._getItemIndex( parent )
+        if parentIndex is None:
+            for child in self._childrenCache.pop( parent ):
+                self._dropCache( child )
+            self._rowsCache.pop( parent, None )
+            return
+        newList = self._readChildren( parent )
+
+        ## items are compared by identity -- replaced item is removed and inserted
+        commonSize = min( len( oldList ), len( newList ) )
+        prefix = 0
+        while prefix < commonSize and oldList[ prefix ] is newList[ prefix ]:
+            prefix += 1
+        suffix = 0
+        while suffix < commonSize - prefix and oldList[ -1 - suffix ] is newList[ -1 - suffix ]:
+            suffix += 1
+
+        removedEnd = len( oldList ) - suffix
+        if prefix < removedEnd:
+            self.beginRemoveRows( parentIndex, prefix, removedEnd - 1 )
+            for child in oldList[ prefix:removedEnd ]:
+                self._dropCache( child )
+            del oldList[ prefix:removedEnd ]
+            self._rowsCache.pop( parent, None )
+            self.endRemoveRows()
+
+        insertedEnd = len( newList ) - suffix
+        if prefix < insertedEnd:
+            self.beginInsertRows( parentIndex, prefix, insertedEnd - 1 )
+            inserted = newList[ prefix:insertedEnd ]
+            oldList[ prefix:prefix ] = inserted
+            for child in inserted:
+                self._parentsCache[ child ] = parent
+            self._rowsCache.pop( parent, None )
+            self.endInsertRows()
+
+    def _emitDataChanged(self, item):
+        """Emit change of item and its ancestors (they aggregate state of subitems)."""
+        lastColumn = self.columnCount( None ) - 1
+        while item is not None:
+            firstIndex = self._getItemIndex( item )
+            if firstIndex is not None:
+                lastIndex = self._getItemIndex( item, lastColumn )
+                self.dataChanged.emit( firstIndex, lastIndex )
+            item = self.getParent( item )
+
+    def _getItemIndex(self, item, column=0) -> QModelIndex:
+        """Return index of item or None if item is not exposed to views."""
+        if item is None:
+            return QModelIndex()
+        if item not in self._parentsCache:
+            return None
+        row = self.getRow( item )
+        if row < 0:
+            return None
+        return self.createIndex( row, column, item )
+
+    def _dropCache(self, item):
+        self._parentsCache.pop( item, None )
+        self._rowsCache.pop( item, None )
+        children = self._childrenCache.pop( item, None )
+        if children is None:
+            return
+        for child in children:
+            self._dropCache( child )
+
+    def _startReset(self):
+        self._resetting = True
+        self._clearCache()
+
+    def _finishReset(self):
+        self._resetting = False
+        self._clearCache()
+
+    def _clearCache(self):
+        self._childrenCache.clear()
+        self._rowsCache.clear()
+        self._parentsCache.clear()
+
+    ## ================================================================
+
     @abc.abstractmethod
     def getRootList(self):
         raise NotImplementedError('You need to define this method in derived class!')
@@ -23,6 +23,7 @@
 
 import os
 import logging
+import contextlib
 from datetime import date
 
 from PyQt5.QtCore import QObject, pyqtSignal
@@ -55,6 +56,7 @@ from hanlendar.gui.command.renamenotecommand import RenameNoteCommand
 from hanlendar.gui.command.removenotecommand import RemoveNoteCommand
 
 from hanlendar.domainmodel.local.manager import LocalManager
+from hanlendar.domainmodel.changeevent import ChangeEvent
 from hanlendar.domainmodel.task import Task
 from hanlendar.domainmodel.local.todo import LocalToDo
 
@@ -70,6 +72,12 @@ class DataObject( QObject ):
     todosChanged = pyqtSignal()
     ## added, modified or removed
     notesChanged = pyqtSignal()
+    ## single task added, removed, modified or moved (by command)
+    taskChangeEvent = pyqtSignal( ChangeEvent )
+    ## single todo added, removed, modified or moved (by command)
+    todoChangeEvent = pyqtSignal( ChangeEvent )
+    ## emitted once after batch of modifications, passes set of UIDs of affected items
+    itemsChanged = pyqtSignal( set )
 
     def __init__(self, parent: QWidget = None):
         super().__init__( parent )
@@ -95,9 +103,34 @@ class DataObject( QObject ):
     def storeData( self ):
         return self.domainModel.storeData()
 
+    def loadArchive( self ):
+        """Load archived tasks (e.g. when completed tasks are requested)."""
+        if self.domainModel.loadArchive():
+            self.tasksChanged.emit()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group modifications of data and emit change signals once after outermost batch."""
+        outermost = self.domainModel.isInBatch() is False
+        with self.domainModel.batch() as changes:
+            yield changes
+        if outermost is False:
+            return
+        if changes.taskUIDs:
+            self.tasksChanged.emit()
+        if changes.todoUIDs:
+            self.todosChanged.emit()
+        if changes.notesChanged:
+            self.notesChanged.emit()
+        if changes.isEmpty() is False:
+            self.itemsChanged.emit( changes.getUIDs() )
+
     def getTaskOccurrences(self, taskDate: date, includeCompleted=True):
         return self.domainModel.getTaskOccurrencesForDate( taskDate, includeCompleted )
 
+    def getTaskOccurrencesForRange(self, startDate: date, endDate: date, includeCompleted=True):
+        return self.domainModel.getTaskOccurrencesForRange( startDate, endDate, includeCompleted )
+
     ## ==============================================================
 
     def addNewTask( self, newTaskDate: QDate = None ):
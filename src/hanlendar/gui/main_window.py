@@ -23,7 +23,7 @@
 
 import os
 import logging
-from typing import List
+from datetime import date, timedelta
 
 from PyQt5.QtCore import QDate
 from PyQt5.QtCore import QObject
@@ -36,6 +36,8 @@ from hanlendar.domainmodel.reminder import Notification
 from hanlendar.domainmodel.task import Task
 from hanlendar.domainmodel.local.todo import LocalToDo
 from hanlendar.domainmodel.local.manager import LocalManager
+from hanlendar.domainmodel.sqlite.manager import SQLiteManager
+from hanlendar.domainmodel.changeevent import ChangeEvent
 
 from hanlendar.fswatchdog import FSWatcher
 from hanlendar.fqueue import queue_path, get_from_queue
@@ -51,7 +53,9 @@ from .dataobject import DataObject
 from .notifytimer import NotificationTimer
 from .widget.settingsdialog import SettingsDialog, AppSettings, DatabaseMode
 from .widget.navcalendar import NavCalendarHighlightModel
+from .widget.searchwidget import SearchWidget
 from .widget.tasktable import get_reminded_color, get_timeout_color
+from .widget.monthcalendar import get_page_range
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -65,20 +69,41 @@ class DataHighlightModel( NavCalendarHighlightModel ):
     def __init__(self, dataObject: DataObject ):
         super().__init__()
         self.dataObject: DataObject = dataObject
+        self.pageRange = None               ## range of days visible on displayed page
+        self.occurrencesCache = None        ## occurrences of days of displayed page
 
     def isHighlighted(self, date: QDate):
-        entryDate = date.toPyDate()
-        manager = self.dataObject.getManager()
-        occurrencesList = manager.getTaskOccurrencesForDate( entryDate, False )
+        occurrencesList = self._getOccurrences( date )
+        occurrencesList = [ task for task in occurrencesList if not task.isCompleted() ]
         return len(occurrencesList) > 0
 
     def isOccupied(self, date: QDate):
-        entryDate = date.toPyDate()
-        manager = self.dataObject.getManager()
-        occurrencesList = manager.getTaskOccurrencesForDate( entryDate, True )
+        occurrencesList = self._getOccurrences( date )
         occurrencesList = [ task for task in occurrencesList if task.isCompleted() ]
         return len(occurrencesList) > 0
 
+    ## overriden
+    def invalidate(self):
+        self.occurrencesCache = None
+
+    ## overriden
+    def setPage(self, year, month):
+        self.pageRange = get_page_range( date( year, month, 1 ) )
+        self.occurrencesCache = None
+
+    def _getOccurrences(self, entryDate: QDate):
+        if self.occurrencesCache is None:
+            self.occurrencesCache = self._loadOccurrences()
+        return self.occurrencesCache.get( entryDate.toPyDate(), [] )
+
+    def _loadOccurrences(self):
+        if self.pageRange is None:
+            return dict()
+        ## load all days visible on displayed page
+        firstDate, lastDate = self.pageRange
+        manager = self.dataObject.getManager()
+        return manager.getTaskOccurrencesForRange( firstDate, lastDate, True )
+
 
 ##
 class SettingsObject( QObject ):
@@ -113,6 +138,15 @@ class SettingsObject( QObject ):
         os.makedirs( dataPath, exist_ok=True )
         return LocalManager( dataPath )
 
+    def createSQLiteManager(self) -> SQLiteManager:
+        dataPath = self.getDataPath()
+        localPath = os.path.join( dataPath, "local" )
+        dataPath = os.path.join( dataPath, "sqlite" )
+        os.makedirs( dataPath, exist_ok=True )
+        dbFile = os.path.join( dataPath, "data.sqlite" )
+        ## local data is imported on first start
+        return SQLiteManager( dbFile, localPath )
+
 
 ##
 class MainWindow( QtBaseClass ):           # type: ignore
@@ -155,7 +189,10 @@ class MainWindow( QtBaseClass ):           # type: ignore
 
         self.notifsTimer = NotificationTimer( self )
 
-        self.ui.navcalendar.highlightModel = DataHighlightModel( self.data )
+        self.ui.navcalendar.setHighlightModel( DataHighlightModel( self.data ) )
+
+        self.searchWidget = SearchWidget( self )
+        self.ui.lists_tabs.setCornerWidget( self.searchWidget )
 
         self.setDayViewDate()
 
@@ -164,6 +201,8 @@ class MainWindow( QtBaseClass ):           # type: ignore
         self.data.tasksChanged.connect( self._handleTasksChange )
         self.data.todosChanged.connect( self._handleToDosChange )
         self.data.notesChanged.connect( self._handleNotesChange )
+        self.data.taskChangeEvent.connect( self._handleTaskEvent )
+        self.data.todoChangeEvent.connect( self._handleToDoEvent )
 
         self.notifsTimer.remindTask.connect( self.handleNotification )
 
@@ -171,6 +210,11 @@ class MainWindow( QtBaseClass ):           # type: ignore
         self.ui.navcalendar.currentPageChanged.connect( self.ui.monthCalendar.setCurrentPage )
         self.ui.navcalendar.selectionChanged.connect( self.setDayViewDate )
 
+        ## archived tasks are loaded when completed tasks are requested
+        self.ui.showCompletedTasksListCB.toggled.connect( self.loadArchive )
+        self.ui.showCompletedTasksDayCB.toggled.connect( self.loadArchive )
+        self.ui.showCompletedTasksMonthCB.toggled.connect( self.loadArchive )
+
         self.ui.tasksTable.connectData( self.data )
         self.ui.tasksTable.selectedTask.connect( self.showDetails )
         self.ui.tasksTable.taskUnselected.connect( self.hideDetails )
@@ -198,6 +242,10 @@ class MainWindow( QtBaseClass ):           # type: ignore
         self.ui.notesWidget.notesChanged.connect( self.triggerSaveTimer )
         self.ui.notesWidget.createToDo.connect( self.data.addNewToDo )
 
+        self.searchWidget.connectData( self.data )
+        self.searchWidget.itemSelected.connect( self.showSearchedItem )
+        self.searchWidget.noteSelected.connect( self.showSearchedNote )
+
         ## === main menu settings ===
 
         self.ui.actionSave_data.triggered.connect( self.saveData )
@@ -253,8 +301,16 @@ class MainWindow( QtBaseClass ):           # type: ignore
 
     def loadData(self):
         self.data.loadData()
+        showCompleted = [ self.ui.showCompletedTasksListCB, self.ui.showCompletedTasksDayCB,
+                          self.ui.showCompletedTasksMonthCB ]
+        if any( checkBox.isChecked() for checkBox in showCompleted ):
+            self.data.getManager().loadArchive()
         self.refreshView()
 
+    def loadArchive(self, load=True):
+        if load:
+            self.data.loadArchive()
+
     def triggerSaveTimer(self):
         timeout = 30000
         _LOGGER.info("triggering save timer with timeout %s", timeout)
@@ -270,8 +326,10 @@ class MainWindow( QtBaseClass ):           # type: ignore
     def _saveData(self):
         ## having separate slot allows to monkey patch / mock "_saveData()" method
         _LOGGER.info( "storing data" )
-        notes = self.ui.notesWidget.getNotes()
-        self.data.getManager().setNotes( notes )
+        if self.ui.notesWidget.isModified():
+            notes = self.ui.notesWidget.getNotes()
+            self.data.getManager().setNotes( notes )
+            self.ui.notesWidget.setModified( False )
         return self.data.storeData()
 
     def disableSaving(self):
@@ -304,6 +362,19 @@ class MainWindow( QtBaseClass ):           # type: ignore
         _LOGGER.warning( "unsupported entity: %s", entity )
         self.hideDetails()
 
+    def showSearchedItem(self, item):
+        if isinstance( item, Task ):
+            self.ui.lists_tabs.setCurrentWidget( self.ui.tasks_tab )
+            self.ui.tasksTable.setCurrentTask( item )
+        else:
+            self.ui.lists_tabs.setCurrentWidget( self.ui.todos_tab )
+            self.ui.todosTable.setCurrentToDo( item )
+        self.showDetails( item )
+
+    def showSearchedNote(self, title):
+        self.ui.lists_tabs.setCurrentWidget( self.ui.notes_tab )
+        self.ui.notesWidget.setCurrentNote( title )
+
     def hideDetails(self):
         self.ui.entityDetailsStack.setCurrentIndex( 0 )
 
@@ -323,8 +394,8 @@ class MainWindow( QtBaseClass ):           # type: ignore
     ## ====================================================================
 
     def updateNotificationTimer(self):
-        notifs: List[ Notification ] = self.data.getManager().getNotificationList()
-        self.notifsTimer.setNotifications( notifs )
+        timeline = self.data.getManager().getNotificationTimeline()
+        self.notifsTimer.setTimeline( timeline )
 
     def handleNotification( self, notification: Notification ):
         self.trayIcon.displayMessage( notification.message )
@@ -341,7 +412,22 @@ class MainWindow( QtBaseClass ):           # type: ignore
         self.updateNotificationTimer()
         self.updateTasksView()
         self.ui.dayList.updateView()
-        self.ui.navcalendar.repaint()
+        self.ui.navcalendar.updateCells()
+        self.updateTrayToolTip()
+
+    def _handleTaskEvent(self, event: ChangeEvent):
+        self.triggerSaveTimer()
+        ## timeline is updated by manager -- timer is re-armed when next notification moves
+        timeline = self.data.getManager().getNotificationTimeline()
+        self.notifsTimer.updateTimeline( timeline )
+        self.ui.tasksTable.updateChangedView( event )
+        self.ui.monthCalendar.updateChangedCells( event )
+        self.ui.dayList.updateChangedView( event )
+        navPage = date( self.ui.navcalendar.yearShown(), self.ui.navcalendar.monthShown(), 1 )
+        firstDate, lastDate = get_page_range( navPage )
+        if event.affectsDates( firstDate, lastDate ):
+            self.ui.navcalendar.updateCells()
+        self._updateTrayIndicator()
         self.updateTrayToolTip()
 
     def updateTasksView(self, updatedTask: Task = None ):
@@ -363,6 +449,10 @@ class MainWindow( QtBaseClass ):           # type: ignore
         self.ui.todosTable.updateView()
         self.updateTrayToolTip()
 
+    def _handleToDoEvent(self, _: ChangeEvent):
+        ## todos have no dates -- whole list is updated
+        self._handleToDosChange()
+
     ## ====================================================================
 
     def _handleNotesChange(self):
@@ -501,12 +591,18 @@ class MainWindow( QtBaseClass ):           # type: ignore
         self.setIconTheme( self.appSettings.trayIcon )
 
         manager = self.qtSettings.createLocalManager()
+        if self.appSettings.archiveDays > 0:
+            manager.archiveAge = timedelta( days=self.appSettings.archiveDays )
+        else:
+            manager.archiveAge = None
         if self.appSettings.databaseMode == DatabaseMode.LOCAL:
             ## do nothing
             pass
         elif self.appSettings.databaseMode == DatabaseMode.CALDAV:
             connector = self.createCalDAVConnector()
             manager = self.createCalDAVManager( connector )
+        elif self.appSettings.databaseMode == DatabaseMode.SQLITE:
+            manager = self.qtSettings.createSQLiteManager()
         else:
             _LOGGER.warning( "unhandled database mode: %s", self.appSettings.databaseMode )
 
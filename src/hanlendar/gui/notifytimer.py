@@ -28,6 +28,7 @@ from typing import List
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
 from hanlendar.domainmodel.reminder import Notification
+from hanlendar.domainmodel.notificationtimeline import NotificationTimeline
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,39 +36,48 @@ _LOGGER = logging.getLogger(__name__)
 
 class NotificationTimer( QObject ):
 
+    ## QTimer accepts at most 2147483647ms (~24 days) -- longer periods are split
+    MAX_INTERVAL = datetime.timedelta( days=1 )
+
     remindTask = pyqtSignal( Notification )
 
     def __init__( self, *args ):
         QObject.__init__( self, *args )
         self.timer = QTimer(self)
-        self.notifs: List[ Notification ] = list()
-        self.nextNotif: Notification = None
-        self.timer.timeout.connect( self.handleTimeout )
+        self.timer.setSingleShot( True )
+        self.timeline: NotificationTimeline = None
+        self.nextTime: datetime.datetime = None
+        self.timer.timeout.connect( self.processNotifs )
 
-    def setNotifications( self, notifList: List[ Notification ] ):
-        self.notifs = notifList
+    def setTimeline( self, timeline: NotificationTimeline ):
+        self.timeline = timeline
         self.processNotifs()
 
+    def updateTimeline( self, timeline: NotificationTimeline ):
+        """Re-arm timer only if time of next notification changed."""
+        if timeline is self.timeline and self.timer.isActive():
+            if timeline.getNextTime() == self.nextTime:
+                return
+        self.setTimeline( timeline )
+
     def processNotifs(self):
         self.timer.stop()
-        if len(self.notifs) < 1:
-            _LOGGER.info("no notifications")
-            self.nextNotif = None
-            return
-        self.nextNotif = self.notifs.pop(0)
-        remainingTime: datetime.timedelta = self.nextNotif.remainingTime()
-        secs = remainingTime.total_seconds()
-        _LOGGER.info( "next notification: %s[s] %s", secs, self.nextNotif )
-        if secs < 1:
-            self.handleTimeout()
+        if self.timeline is None:
             return
-        millis = int(secs * 1000)
-        ## 2147483647ms is ~24 days -- enough to skip
-        if millis >= 2147483647:
-            _LOGGER.warning( "unable to set timer for time delta %s", remainingTime )
-            return
-        self.timer.start( millis )      ## 2147483647 maximum accepted value
+        notifs: List[ Notification ] = self.timeline.popNotifications()
+        for notif in notifs:
+            _LOGGER.info( "notification: %s", notif )
+            self.remindTask.emit( notif )
 
-    def handleTimeout(self):
-        self.remindTask.emit( self.nextNotif )
-        self.processNotifs()
+        nextTime = self.timeline.getNextTime()
+        self.nextTime = nextTime
+        if nextTime is None:
+            _LOGGER.info("no notifications")
+            return
+        remainingTime: datetime.timedelta = nextTime - datetime.datetime.today()
+        _LOGGER.info( "next notification in: %s", remainingTime )
+        ## arm timer for next notification or for next chunk of time
+        remainingTime = min( remainingTime, self.MAX_INTERVAL )
+        millis = int( remainingTime.total_seconds() * 1000 )
+        millis = max( millis, 0 )
+        self.timer.start( millis )
@@ -35,6 +35,7 @@ from hanlendar.gui.taskcontextmenu import TaskContextMenu
 from hanlendar.gui.widget.monthcalendar import get_task_bgcolor
 
 from hanlendar.domainmodel.task import Task, TaskOccurrence
+from hanlendar.domainmodel.changeevent import ChangeEvent
 
 
 # UiTargetClass, QtBaseClass = uiloader.loadUiFromClassName( __file__ )
@@ -348,10 +349,20 @@ class DayListWidget( QWidget ):
         if self.data is None:
             return
         currDate = self.currentDate.toPyDate()
-        occurrencesList = self.data.getTaskOccurrences( currDate )
+        occurrencesDict = self.data.getTaskOccurrencesForRange( currDate, currDate )
+        occurrencesList = occurrencesDict.get( currDate, [] )
         self.setTasksOccurrences( occurrencesList, currDate )
         self.update()
 
+    def updateChangedView(self, event: ChangeEvent):
+        """Update view only if change affects displayed day."""
+        if self.currentDate is None:
+            return
+        currDate = self.currentDate.toPyDate()
+        if event.affectsDates( currDate, currDate ) is False:
+            return
+        self.updateView()
+
     def setCurrentDate(self, currDate: QDate):
         self.currentDate = currDate
         self.updateView()
@@ -34,6 +34,7 @@ from PyQt5.QtWidgets import QTableView, QHeaderView
 from hanlendar.gui.taskcontextmenu import TaskContextMenu
 
 from hanlendar.domainmodel.task import Task, TaskOccurrence
+from hanlendar.domainmodel.changeevent import ChangeEvent
 
 
 class MonthCalendar( QCalendarWidget ):
@@ -50,6 +51,7 @@ class MonthCalendar( QCalendarWidget ):
 
         self.data = None
         self.dateToCellRect = {}
+        self.occurrencesCache = {}          ## occurrences of displayed days
         self.currentTaskIndex = -1
 
         self.showCompleted = False
@@ -87,8 +89,27 @@ class MonthCalendar( QCalendarWidget ):
         self.showCompleted = show
         self.updateCells()
 
+    def updateCells(self):
+        self.occurrencesCache.clear()
+        super().updateCells()
+
+    def updateChangedCells(self, event: ChangeEvent):
+        """Update cells only if change affects days of displayed page."""
+        firstDate, lastDate = get_page_range( self.minimumDate().toPyDate() )
+        if event.affectsDates( firstDate, lastDate ) is False:
+            return
+        ## drop only days inside windows of change
+        for window in event.getDateWindows():
+            currDate = max( window.start, firstDate )
+            endDate  = lastDate if window.end is None else min( window.end, lastDate )
+            while currDate <= endDate:
+                self.occurrencesCache.pop( currDate, None )
+                currDate += datetime.timedelta( days=1 )
+        super().updateCells()
+
     def setCurrentPage(self, year, month):
         self.dateToCellRect.clear()
+        self.occurrencesCache.clear()
         minDate = datetime.date( year=year, month=month, day=1 )
         maxDate = minDate + relativedelta( months=1 ) - relativedelta( days=1 )
         self.setMinimumDate( minDate )
@@ -97,9 +118,30 @@ class MonthCalendar( QCalendarWidget ):
 
     def getTasks(self, date: QDate) -> List[TaskOccurrence]:
         pyDate = date.toPyDate()
-        tasksList = self.data.getTaskOccurrences( pyDate, self.showCompleted )
-        tasksList.sort( key=TaskOccurrence.sortByDates )
-        return tasksList
+        tasksList = self.occurrencesCache.get( pyDate, None )
+        if tasksList is None:
+            self._loadOccurrences( pyDate )
+            tasksList = self.occurrencesCache.get( pyDate, [] )
+        return list( tasksList )
+
+    def _loadOccurrences(self, pyDate: datetime.date):
+        ## loads continuous range of missing days around given day within displayed page
+        ## (days without occurrences are cached too)
+        pageStart, pageEnd = get_page_range( self.minimumDate().toPyDate() )
+        oneDay = datetime.timedelta( days=1 )
+        firstDate = pyDate
+        while firstDate > pageStart and ( firstDate - oneDay ) not in self.occurrencesCache:
+            firstDate -= oneDay
+        lastDate = pyDate
+        while lastDate < pageEnd and ( lastDate + oneDay ) not in self.occurrencesCache:
+            lastDate += oneDay
+        occurrences = self.data.getTaskOccurrencesForRange( firstDate, lastDate, self.showCompleted )
+        currDate = firstDate
+        while currDate <= lastDate:
+            tasksList = occurrences.get( currDate, [] )
+            tasksList.sort( key=TaskOccurrence.sortByDates )
+            self.occurrencesCache[ currDate ] = tasksList
+            currDate += oneDay
 
     def getTask(self, taskIndex) -> Task:
         if taskIndex < 0:
@@ -275,3 +317,10 @@ def get_task_base_bgcolor( task: TaskOccurrence ) -> QColor:
 #             return QColor( 160, 160, 160 )
     ## normal
     return QColor(0, 220, 0)
+
+
+def get_page_range( pyDate: datetime.date ) -> Tuple[ datetime.date, datetime.date ]:
+    """Return range of all days visible on calendar page containing given date."""
+    firstDate = pyDate.replace( day=1 ) - datetime.timedelta( days=7 )
+    lastDate  = firstDate + datetime.timedelta( days=7 * 7 )
+    return ( firstDate, lastDate )
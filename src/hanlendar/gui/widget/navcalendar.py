@@ -44,6 +44,12 @@ class NavCalendarHighlightModel():
     def isOccupied(self, date: QDate ):
         raise NotImplementedError('You need to define this method in derived class!')
 
+    def invalidate(self):
+        """Called when highlighted data changed."""
+
+    def setPage(self, year, month):
+        """Called when displayed page changed."""
+
 
 class NavCalendar( QCalendarWidget ):
 
@@ -61,6 +67,20 @@ class NavCalendar( QCalendarWidget ):
 
         self.highlightModel = None
         self.selectionChanged.connect( self.updateCells )
+        self.currentPageChanged.connect( self._updateHighlightPage )
+
+    def setHighlightModel(self, model: NavCalendarHighlightModel):
+        self.highlightModel = model
+        self._updateHighlightPage( self.yearShown(), self.monthShown() )
+
+    def _updateHighlightPage(self, year, month):
+        if self.highlightModel is not None:
+            self.highlightModel.setPage( year, month )
+
+    def updateCells(self):
+        if self.highlightModel is not None:
+            self.highlightModel.invalidate()
+        super().updateCells()
 
     def paintCell(self, painter, rect, date):
         QCalendarWidget.paintCell(self, painter, rect, date)
@@ -131,6 +131,9 @@ class NotesWidget( QtBaseClass ):           # type: ignore
         self.ui.notes_tabs.clear()
         self.addTab( "notes" )
 
+        ## content edited since notes were set (see 'isModified()')
+        self._modified = False
+
     def getNotes(self):
         notes = dict()
         notesSize = self.ui.notes_tabs.count()
@@ -145,10 +148,25 @@ class NotesWidget( QtBaseClass ):           # type: ignore
         self.ui.notes_tabs.clear()
         for key, value in notesDict.items():
             self.addTab( key, value )
+        self._modified = False
+
+    def isModified(self):
+        return self._modified
+
+    def setModified(self, modified=True):
+        self._modified = modified
+
+    def setCurrentNote(self, title):
+        notesSize = self.ui.notes_tabs.count()
+        for tabIndex in range(0, notesSize):
+            if self.ui.notes_tabs.tabText( tabIndex ) == title:
+                self.ui.notes_tabs.setCurrentIndex( tabIndex )
+                return
 
     def addTab(self, title, text=""):
         pageWidget = SinglePageWidget(self)
         pageWidget.textEdit.setText( text )
+        pageWidget.textEdit.textChanged.connect( self.setModified )
         pageWidget.contentChanged.connect( self.notesChanged )
         pageWidget.createToDo.connect( self.createToDo )
         self.ui.notes_tabs.addTab( pageWidget, title )
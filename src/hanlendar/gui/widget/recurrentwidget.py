@@ -120,6 +120,7 @@ class RecurrentWidget( QtBaseClass ):           # type: ignore
             self.task.recurrence.every = self.ui.everySB.value()
 
         self.task.recurrence.mode = repeatMode
+        self.task.updateRecurrence()
         self._activateWidget()
         if repeatMode is RepeatType.ASPARENT:
             self.ui.everySB.setEnabled( False )
@@ -130,6 +131,7 @@ class RecurrentWidget( QtBaseClass ):           # type: ignore
     def _everyValueChanged(self, newValue):
         if self.task:
             self.task.recurrence.every = newValue
+            self.task.updateRecurrence()
         self._updateNextRepeat()
 
     def _finiteChanged(self):
@@ -137,15 +139,18 @@ class RecurrentWidget( QtBaseClass ):           # type: ignore
             return
         if self.ui.endDateCB.isChecked() is False:
             self.task.recurrence.endDate = None
+            self.task.updateRecurrence()
             return
         if self.task.recurrence.endDate is None:
             endDate = self.ui.endDateEdit.date()
             self.task.recurrence.endDate = endDate.toPyDate()
+            self.task.updateRecurrence()
 
     def _endDateChanged(self, newValue):
         if self.task.recurrence is None:
             return
         self.task.recurrence.endDate = newValue.toPyDate()
+        self.task.updateRecurrence()
 
     ## ================= update GUI state ================
 
@@ -0,0 +1,94 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+
+from PyQt5.QtCore import Qt, QStringListModel, QModelIndex
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QLineEdit, QCompleter
+
+from hanlendar.domainmodel.item import Item
+from hanlendar.domainmodel.task import Task
+from hanlendar.domainmodel.searchindex import SearchHit
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SearchWidget( QLineEdit ):
+    """Search box presenting found tasks, todos and notes in popup list."""
+
+    itemSelected = pyqtSignal( Item )
+    noteSelected = pyqtSignal( str )
+
+    def __init__(self, parentWidget=None):
+        super().__init__(parentWidget)
+
+        self.data = None
+        self.hits = list()
+        self.limit = 50
+
+        self.setPlaceholderText( "Search" )
+        self.setClearButtonEnabled( True )
+
+        self.resultsModel = QStringListModel( self )
+        self.resultsCompleter = QCompleter( self.resultsModel, self )
+        self.resultsCompleter.setCompletionMode( QCompleter.UnfilteredPopupCompletion )
+        self.resultsCompleter.setCaseSensitivity( Qt.CaseInsensitive )
+        self.resultsCompleter.setWidget( self )
+
+        self.textEdited.connect( self.search )
+        self.resultsCompleter.activated[QModelIndex].connect( self._hitActivated )
+
+    def connectData(self, dataObject):
+        self.data = dataObject
+
+    def search(self, query: str):
+        self.hits.clear()
+        if self.data is not None and query.strip():
+            ## archived tasks are searched too
+            self.data.loadArchive()
+            self.hits = self.data.getManager().search( query, self.limit )
+        self.resultsModel.setStringList( [ get_hit_label( hit ) for hit in self.hits ] )
+        if self.hits:
+            self.resultsCompleter.complete()
+        else:
+            self.resultsCompleter.popup().hide()
+
+    def _hitActivated(self, modelIndex: QModelIndex):
+        row = modelIndex.row()
+        if row < 0 or row >= len( self.hits ):
+            return
+        hit: SearchHit = self.hits[ row ]
+        if hit.item is not None:
+            self.itemSelected.emit( hit.item )
+        else:
+            self.noteSelected.emit( hit.note )
+
+
+def get_hit_label( hit: SearchHit ) -> str:
+    if isinstance( hit.item, Task ):
+        return "task: %s" % hit.item.title
+    if hit.item is not None:
+        return "todo: %s" % hit.item.title
+    return "note: %s" % hit.note
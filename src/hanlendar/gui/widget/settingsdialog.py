@@ -40,6 +40,7 @@ from .. import tray_icon
 class DatabaseMode(Enum):
     LOCAL = auto()
     CALDAV = auto()
+    SQLITE = auto()
 
     @classmethod
     def findByName(cls, name, defaultValue=None):
@@ -78,6 +79,9 @@ class AppSettings():
         self.serverPassword = ""
         self.calendarName   = ""
 
+        ## age of completed tasks moved to archive (0 disables archive)
+        self.archiveDays    = 90
+
     def loadSettings(self, settings):
         settings.beginGroup("app_settings")
 
@@ -92,6 +96,8 @@ class AppSettings():
         self.serverPassword = settings.value( "serverPassword", "", type=str )
         self.calendarName   = settings.value( "calendarName", "", type=str )
 
+        self.archiveDays    = settings.value( "archiveDays", 90, type=int )
+
         settings.endGroup()
 
     def saveSettings(self, settings):
@@ -106,6 +112,8 @@ class AppSettings():
         settings.setValue( "serverPassword", self.serverPassword )
         settings.setValue( "calendarName", self.calendarName )
 
+        settings.setValue( "archiveDays", self.archiveDays )
+
         settings.endGroup()
 
 
@@ -142,6 +150,7 @@ class SettingsDialog(QtBaseClass):  # type: ignore
         self.ui.serverData.setEnabled(False)
         self.ui.localRB.toggled.connect(self.ui.serverData.setDisabled)
         self.ui.caldavRB.toggled.connect(self.ui.serverData.setEnabled)
+        self.ui.sqliteRB.toggled.connect(self.ui.serverData.setDisabled)
 
         self.ui.serverURLLE.setText( self.appSettings.serverURL )
         self.ui.serverUserLE.setText( self.appSettings.serverUser )
@@ -35,6 +35,7 @@ from hanlendar.gui.customtreemodel import ItemTreeModel
 from hanlendar.gui.taskcontextmenu import TaskContextMenu
 
 from hanlendar.domainmodel.task import Task, TaskOccurrence
+from hanlendar.domainmodel.changeevent import ChangeEvent
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -115,11 +116,18 @@ class TaskTreeModel( ItemTreeModel ):
             return
         self.dataObject.moveTask( itemId, targetItem, targetIndex )
 
+    ## overrided
+    def getItemId(self, item: object):
+        if self.dataObject is None:
+            return None
+        manager = self.dataObject.getManager()
+        return manager.getTaskCoords( item )
+
     def getRootList(self):
         if self.dataObject is None:
             return None
         manager = self.dataObject.getManager()
-        return manager.getTasks()
+        return manager.tasks
 
 #     def setRootList(self, newList):
 #         if self.dataObject is None:
@@ -203,6 +211,7 @@ class TaskTable( QtWidgets.QTreeView ):
         self.taskContextMenu = TaskContextMenu( self )
 
         self.proxyModel.modelReset.connect( self.expandOnDemand )
+        self.proxyModel.rowsInserted.connect( self._expandInserted )
         self.doubleClicked.connect( self.itemDoubleClicked )
 
     def connectData(self, dataObject):
@@ -232,6 +241,17 @@ class TaskTable( QtWidgets.QTreeView ):
         self.itemsModel.setDataObject( self.data )
         self.expandOnDemand()
 
+    def updateChangedView(self, event: ChangeEvent):
+        """Update rows affected by change without reloading whole model."""
+        self.itemsModel.updateItem( event )
+
+    def setCurrentTask(self, task: Task):
+        taskIndex = self.getIndex( task )
+        if taskIndex is None or taskIndex.isValid() is False:
+            return
+        self.scrollTo( taskIndex )
+        self.setCurrentIndex( taskIndex )
+
     def getIndex(self, task: Task):
         modelIndex = self.itemsModel.getIndex( task )
         if modelIndex is None:
@@ -276,6 +296,16 @@ class TaskTable( QtWidgets.QTreeView ):
         if self.expandItems:
             self.expandAll()
 
+    def _expandInserted(self, parentIndex: QModelIndex, first, last):
+        if self.expandItems is False:
+            return
+        indexList = [ self.proxyModel.index( row, 0, parentIndex ) for row in range( first, last + 1 ) ]
+        while indexList:
+            index = indexList.pop()
+            self.expand( index )
+            subRows = self.proxyModel.rowCount( index )
+            indexList.extend( self.proxyModel.index( row, 0, index ) for row in range( subRows ) )
+
     def drawBranches(self, painter, rect, index):
         bgcolor = index.data( Qt.BackgroundRole )
         if bgcolor is not None:
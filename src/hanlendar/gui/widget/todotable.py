@@ -88,11 +88,18 @@ class ToDoTreeModel( ItemTreeModel ):
             return
         self.dataObject.moveToDo( itemId, targetItem, targetIndex )
 
+    ## overrided
+    def getItemId(self, item: object):
+        if self.dataObject is None:
+            return None
+        manager = self.dataObject.getManager()
+        return manager.getToDoCoords( item )
+
     def getRootList(self):
         if self.dataObject is None:
             return None
         manager = self.dataObject.getManager()
-        return manager.getToDos()
+        return manager.todos
 
 #     def setRootList(self, newList):
 #         if self.dataObject is None:
@@ -195,6 +202,19 @@ class ToDoTable( QtWidgets.QTreeView ):
             return
         self.itemsModel.setDataObject( self.data )
 
+    def setCurrentToDo(self, todo: LocalToDo):
+        todoIndex = self.getIndex( todo )
+        if todoIndex is None or todoIndex.isValid() is False:
+            return
+        self.scrollTo( todoIndex )
+        self.setCurrentIndex( todoIndex )
+
+    def getIndex(self, todo: LocalToDo):
+        modelIndex = self.itemsModel.getIndex( todo )
+        if modelIndex is None:
+            return None
+        return self.proxyModel.mapFromSource( modelIndex )
+
     def getToDo(self, itemIndex: QModelIndex ):
         sourceIndex = self.proxyModel.mapToSource( itemIndex )
         return self.itemsModel.getItem( sourceIndex )
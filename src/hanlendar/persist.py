@@ -24,13 +24,18 @@
 import logging
 
 import os
+import re
 import zipfile
 import filecmp
 import pickle
 import io
+import hashlib
 
 import abc
 
+from datetime import datetime
+from typing import List
+
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -85,10 +90,32 @@ def load_data( content, defaultValue=None, class_mapper=None ):
         raise
 
 
+def calculate_checksum( inputFile ):
+    """Return checksum of file content or None if file does not exist."""
+    if os.path.isfile( inputFile ) is False:
+        return None
+    hasher = hashlib.sha256()
+    with open( inputFile, 'rb') as fp:
+        for chunk in iter( lambda: fp.read( 1024 * 1024 ), b'' ):
+            hasher.update( chunk )
+    return hasher.hexdigest()
+
+
+def calculate_digest( content ):
+    """Return checksum of given bytes. It is equal to 'calculate_checksum()' of file with the content."""
+    return hashlib.sha256( content ).hexdigest()
+
+
 def store_object( inputObject, outputFile ):
+    content = pickle.dumps( inputObject )
+    return store_content( content, outputFile )
+
+
+## compare -- check if file already contains the content (False if content is known to be different)
+def store_content( content, outputFile, compare=True ):
     tmpFile = outputFile + "_tmp"
     with open(tmpFile, 'wb') as fp:
-        pickle.dump( inputObject, fp )
+        fp.write( content )
 
     if os.path.isfile( outputFile ) is False:
         ## output file does not exist -- rename file
@@ -96,7 +123,7 @@ def store_object( inputObject, outputFile ):
         os.rename( tmpFile, outputFile )
         return True
 
-    if filecmp.cmp( tmpFile, outputFile ) is True:
+    if compare and filecmp.cmp( tmpFile, outputFile ) is True:
         ## the same files -- remove tmp file
         _LOGGER.info("no new data to store in %s", outputFile)
         os.remove( tmpFile )
@@ -108,46 +135,163 @@ def store_object( inputObject, outputFile ):
     return True
 
 
-def backup_files( inputFiles, outputArchive ):
-    ## create zip
-    tmpZipFile = outputArchive + "_tmp"
-    zipf = zipfile.ZipFile( tmpZipFile, 'w', zipfile.ZIP_DEFLATED )
-    for file in inputFiles:
-        zipEntry = os.path.basename( file )
-        zipf.write( file, zipEntry )
-    zipf.close()
+class ObjectStore():
+    """Loads and stores objects remembering digest of content of each file.
 
-    ## compare content
-    storedZipFile = outputArchive
-    if os.path.isfile( storedZipFile ) is False:
-        ## output file does not exist -- rename file
-        _LOGGER.info( "storing data to: %s", storedZipFile )
-        os.rename( tmpZipFile, storedZipFile )
-        return
+    Content equal to content of file is detected by digest, so it is neither
+    written nor compared with the file.
+    """
 
-    if filecmp.cmp( tmpZipFile, storedZipFile ) is True:
-        ## the same files -- remove tmp file
-        _LOGGER.info("no new data to backup")
-        os.remove( tmpZipFile )
-        return
+    def __init__(self):
+        self._digests = dict()
 
-    ## rename files
+    ## class_mapper -- object mapping class names based on code version
+    def load( self, inputFile, defaultValue=None, class_mapper=None ):
+        _LOGGER.info( "loading data from: %s", inputFile )
+        with open( inputFile, 'rb') as fp:
+            content = fp.read()
+        self._digests[ inputFile ] = calculate_digest( content )
+        return load_data( content, defaultValue, class_mapper )
+
+    def store( self, inputObject, outputFile ):
+        """Store object to file. Return True if content of file changed."""
+        content = pickle.dumps( inputObject )
+        digest = calculate_digest( content )
+        knownDigest = self._digests.get( outputFile, None )
+        if knownDigest == digest and os.path.isfile( outputFile ):
+            _LOGGER.info("no new data to store in %s", outputFile)
+            return False
+        changed = store_content( content, outputFile, compare=knownDigest is None )
+        self._digests[ outputFile ] = digest
+        return changed
+
+    def getDigest( self, dataFile ):
+        """Return checksum of content of file or None if file does not exist."""
+        digest = self._digests.get( dataFile, None )
+        if digest is not None:
+            return digest
+        digest = calculate_checksum( dataFile )
+        if digest is not None:
+            self._digests[ dataFile ] = digest
+        return digest
+
+    def forget( self, dataFile ):
+        self._digests.pop( dataFile, None )
+
+
+## backup file name: data-<sequence number>-<time of backup><extension>
+BACKUP_PATTERN = r"^data-(\d+)-(\d{14})%s$"
+BACKUP_TIME_FORMAT = "%Y%m%d%H%M%S"
+
+
+class BackupEntry():
+    """Backup archive in data directory."""
+
+    def __init__(self, sequence: int, time: datetime, path: str):
+        self.sequence = sequence
+        self.time     = time
+        self.path     = path
+
+    def __repr__(self):
+        return "[s:%s t:%s]" % ( self.sequence, self.time )
+
+
+def list_backups( backupDir, extension=".zip" ) -> List[BackupEntry]:
+    """Return backups found in directory starting from the most recent."""
+    ret = list()
+    if os.path.isdir( backupDir ) is False:
+        return ret
+    pattern = re.compile( BACKUP_PATTERN % re.escape( extension ) )
+    for fileName in os.listdir( backupDir ):
+        found = pattern.match( fileName )
+        if found is None:
+            continue
+        sequence = int( found.group( 1 ) )
+        backupTime = datetime.strptime( found.group( 2 ), BACKUP_TIME_FORMAT )
+        ret.append( BackupEntry( sequence, backupTime, os.path.join( backupDir, fileName ) ) )
+    ret.sort( key=lambda entry: entry.sequence, reverse=True )
+    return ret
+
+
+def get_backup_path( backupDir, sequence, backupTime: datetime, extension=".zip" ):
+    fileName = "data-%08d-%s%s" % ( sequence, backupTime.strftime( BACKUP_TIME_FORMAT ), extension )
+    return os.path.join( backupDir, fileName )
+
+
+def convert_legacy_backups( backupDir ):
+    """Rename backups 'data.zip', 'data.zip.1', ... (the oldest with the greatest number) to current format."""
+    legacyFile = os.path.join( backupDir, "data.zip" )
+    if os.path.isfile( legacyFile ) is False:
+        return
+    legacyFiles = [ legacyFile ]
     counter = 1
-    nextFile = "%s.%s" % (storedZipFile, counter)
-    while os.path.isfile( nextFile ):
+    while os.path.isfile( "%s.%s" % ( legacyFile, counter ) ):
+        legacyFiles.append( "%s.%s" % ( legacyFile, counter ) )
         counter += 1
-        nextFile = "%s.%s" % (storedZipFile, counter)
-    _LOGGER.info( "found backup slot: %s", nextFile )
-
-    currFile = storedZipFile
-    while counter > 1:
-        currFile = "%s.%s" % (storedZipFile, counter - 1)
-        os.rename( currFile, nextFile )
-        nextFile = currFile
-        counter -= 1
-
-    os.rename( storedZipFile, nextFile )
-    os.rename( tmpZipFile, storedZipFile )
+    _LOGGER.info( "converting %s legacy backups", len( legacyFiles ) )
+    ## legacy backups are older than backups in current format
+    sequence = len( legacyFiles )
+    backups = list_backups( backupDir )
+    if backups:
+        sequence = min( entry.sequence for entry in backups ) - 1
+    for file in legacyFiles:
+        backupTime = datetime.fromtimestamp( os.path.getmtime( file ) )
+        os.rename( file, get_backup_path( backupDir, sequence, backupTime ) )
+        sequence -= 1
+
+
+class RetentionPolicy():
+    """Selects backups to remove.
+
+    Kept are: all backups from 'keepAllDays' last days (1 -- from today), the most
+    recent backup of each day from 'dailyDays' last days and the most recent backup
+    of each week after that (from 'weeklyWeeks' weeks, None -- no limit).
+    """
+
+    def __init__(self, keepAllDays=1, dailyDays=30, weeklyWeeks=None):
+        self.keepAllDays = keepAllDays
+        self.dailyDays   = dailyDays
+        self.weeklyWeeks = weeklyWeeks
+
+    def findRemoved( self, backups: List[BackupEntry], currTime: datetime = None ) -> List[BackupEntry]:
+        if currTime is None:
+            currTime = datetime.now()
+        currDate = currTime.date()
+        removed = list()
+        keptPeriods = set()
+        for entry in sorted( backups, key=lambda entry: entry.sequence, reverse=True ):
+            backupDate = entry.time.date()
+            age = ( currDate - backupDate ).days
+            if age < self.keepAllDays:
+                continue
+            if age < self.dailyDays:
+                period = backupDate
+            else:
+                if self.weeklyWeeks is not None and age >= self.dailyDays + self.weeklyWeeks * 7:
+                    removed.append( entry )
+                    continue
+                period = backupDate.isocalendar()[0:2]
+            if period in keptPeriods:
+                removed.append( entry )
+                continue
+            keptPeriods.add( period )
+        if len( removed ) == len( backups ) and removed:
+            ## always keep the most recent backup
+            removed.pop( 0 )
+        return removed
+
+
+def prune_backups( backupDir, policy: RetentionPolicy, currTime: datetime = None, extension=".zip" ):
+    """Remove backups not matching retention policy. Return list of removed backups."""
+    removed = policy.findRemoved( list_backups( backupDir, extension ), currTime )
+    for entry in removed:
+        _LOGGER.info( "removing backup: %s", entry.path )
+        try:
+            os.remove( entry.path )
+        except FileNotFoundError:
+            ## removed in the meantime
+            pass
+    return removed
 
 
 def load_backup( outputArchive ):
@@ -158,11 +302,17 @@ def load_backup( outputArchive ):
 ##
 class Versionable( metaclass=abc.ABCMeta ):
 
+    ## names of fields that are not persisted (e.g. runtime links and caches)
+    _transient_fields: tuple = ()
+
     def __getstate__(self):
         if not hasattr(self, "_class_version"):
             raise Exception("Your class must define _class_version class variable")
         # pylint: disable=E1101
-        return dict(_class_version=self._class_version, **self.__dict__)
+        state = dict(_class_version=self._class_version, **self.__dict__)
+        for field in self._transient_fields:
+            state.pop( field, None )
+        return state
 
     def __setstate__(self, dict_):
         version_present_in_pickle = dict_.pop("_class_version", None)
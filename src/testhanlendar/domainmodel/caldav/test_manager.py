@@ -1,3 +1,95 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+import tempfile
+
+from hanlendar.domainmodel.caldav.manager import CalDAVManager
+from hanlendar.domainmodel.local.manager import LocalManager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class CalendarStub():
+    """Calendar keeping saved events in memory."""
+
+    def __init__(self):
+        self.events = list()
+
+    def delete(self):
+        self.events.clear()
+
+    def save_event(self, event):
+        self.events.append( event )
+
+
+class ConnectorStub():
+    """Connector without server."""
+
+    def __init__(self):
+        self._calendarName = "test_cal"
+        self._calendar = CalendarStub()
+
+    def _initCalendar(self, calendar_name ):
+        self._calendarName = calendar_name
+        return self._calendar
+
+    def createCalendar(self):
+        return self._calendar
+
+
+class CalDAVManagerStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_storeData_changed(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            connector = ConnectorStub()
+            manager = CalDAVManager( connector, dataDir )
+            task = manager.addTask( Task( "a" ) )
+            self.assertTrue( manager.storeData() )
+
+            task.title = "b"
+            self.assertTrue( manager.storeData() )
+            self.assertEqual( len( connector._calendar.events ), 1 )
+
+            loaded = LocalManager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "b" ] )
+
+            manager.tasks = [ Task( "c" ) ]
+            self.assertTrue( manager.storeData() )
+
+            loaded = LocalManager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "c" ] )
+
+
 # # MIT License
 # #
 # # Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
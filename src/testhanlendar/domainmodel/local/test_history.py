@@ -0,0 +1,131 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+import os
+import tempfile
+
+from hanlendar.domainmodel.local.history import HistoryStore, ItemHashCache
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_addEntry_dedup(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            history = HistoryStore( dataDir )
+            hashCache = ItemHashCache()
+            tasks = [ Task( "task%s" % i ) for i in range( 200 ) ]
+            self.assertIsNotNone( history.addEntry( 1, tasks, [], { "note": "text" }, hashCache=hashCache ) )
+            packFile = os.path.join( dataDir, "objects.pack" )
+            size = os.path.getsize( packFile )
+
+            self.assertIsNone( history.addEntry( 1, tasks, [], { "note": "text" }, hashCache=hashCache ) )
+            self.assertEqual( os.path.getsize( packFile ), size )
+
+            tasks[0].title = "changed"
+            hashCache.invalidate()
+            self.assertIsNotNone( history.addEntry( 1, tasks, [], { "note": "text" }, hashCache=hashCache ) )
+            self.assertLess( os.path.getsize( packFile ) - size, size / 10 )
+            self.assertEqual( len( history.listEntries() ), 2 )
+
+    def test_addEntry_manifestSize(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            history = HistoryStore( dataDir )
+            hashCache = ItemHashCache()
+            tasks = [ Task( "task%s" % i ) for i in range( 1000 ) ]
+            firstEntry = history.addEntry( 1, tasks, [], {}, hashCache=hashCache )
+            firstSize = os.path.getsize( firstEntry )
+
+            tasks.append( Task( "task" ) )
+            blobsNum = len( history._getIndex() )
+            secondEntry = history.addEntry( 1, tasks, [], {}, hashCache=hashCache )
+            self.assertEqual( os.path.getsize( secondEntry ), firstSize )
+            ## new item, last node of list and root node
+            self.assertEqual( len( history._getIndex() ) - blobsNum, 3 )
+
+            data = history.loadEntry( secondEntry )
+            self.assertEqual( [ task.title for task in data[ 'tasks' ] ], [ task.title for task in tasks ] )
+
+    def test_loadEntry(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            history = HistoryStore( dataDir )
+            task = Task( "task" )
+            subtask = task.addSubItem( Task( "subtask" ) )
+            history.addEntry( 1, [ task ], [], { "note": "text1" } )
+            subtask.title = "changed"
+            history.addEntry( 1, [ task ], [], { "note": "text2" } )
+
+            entries = history.listEntries()
+            data = HistoryStore( dataDir ).loadEntry( entries[1].path )
+            self.assertEqual( data[ 'version' ], 1 )
+            self.assertEqual( data[ 'notes' ], { "note": "text1" } )
+            loaded = data[ 'tasks' ][0]
+            self.assertEqual( loaded.UID, task.UID )
+            self.assertEqual( loaded.getSubitems()[0].title, "subtask" )
+            self.assertIs( loaded.getSubitems()[0].getParent(), loaded )
+
+            data = history.loadEntry( entries[0].path )
+            self.assertEqual( data[ 'tasks' ][0].getSubitems()[0].title, "changed" )
+
+    def test_addEntry_archive(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            history = HistoryStore( dataDir )
+            archived = Task( "archived" )
+            archived.addSubItem( Task( "subtask" ) )
+            history.addEntry( 1, [], [], {}, "00" * 32, lambda: [ archived ] )
+            ## archive of known digest is not loaded
+            history.addEntry( 1, [ Task( "task" ) ], [], {}, "00" * 32, None )
+
+            data = history.loadEntry( history.listEntries()[0].path )
+            self.assertEqual( [ task.title for task in data[ 'tasks' ] ], [ "task", "archived" ] )
+            self.assertEqual( data[ 'tasks' ][1].getSubitems()[0].title, "subtask" )
+
+            ## archive is stored under hash of its content
+            blobsNum = len( history._getIndex() )
+            history.addEntry( 1, [], [], {}, "11" * 32, lambda: [ archived ] )
+            self.assertEqual( len( history._getIndex() ), blobsNum )
+
+    def test_collectGarbage(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            history = HistoryStore( dataDir )
+            history.addEntry( 1, [ Task( "old%s" % i ) for i in range( 10 ) ], [], {} )
+            history.addEntry( 1, [ Task( "new" ) ], [], {} )
+            os.remove( history.listEntries()[1].path )
+
+            history.collectGarbage()
+            packFile = os.path.join( dataDir, "objects.pack" )
+            loaded = HistoryStore( dataDir )
+            data = loaded.loadEntry( loaded.listEntries()[0].path )
+            self.assertEqual( [ task.title for task in data[ 'tasks' ] ], [ "new" ] )
+            ## task and nodes of tasks and todos lists
+            self.assertLessEqual( len( loaded._getIndex() ), 3 )
+            self.assertGreater( os.path.getsize( packFile ), 0 )
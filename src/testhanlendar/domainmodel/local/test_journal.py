@@ -0,0 +1,164 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+import os
+import tempfile
+
+from hanlendar.domainmodel.local import journal
+from hanlendar.domainmodel.local.journal import KIND_TASK
+from hanlendar.domainmodel.local.manager import LocalManager as Manager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_read_journal_broken(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            journalFile = os.path.join( dataDir, "data.journal" )
+            journal.append_journal( journalFile, [ ( "notes", { "a": "1" } ) ] )
+            size = journal.append_journal( journalFile, [ ( "notes", { "a": "2" } ) ] )
+            with open( journalFile, 'ab' ) as fp:
+                fp.write( b"\x00\x00\x01" )
+
+            transactions, validSize = journal.read_journal( journalFile )
+            self.assertEqual( len( transactions ), 2 )
+            self.assertEqual( validSize, size )
+
+    def test_replay_journal(self):
+        task1 = Task( "task1" )
+        task2 = Task( "task2" )
+        subtask = task1.addSubItem( Task( "subtask" ) )
+        tasks = [ task1, task2 ]
+
+        ## ids in tree order: task1 - 0, subtask - 1, task2 - 2
+        changed = Task( "changed" )
+        changed.UID = subtask.UID
+        transactions = [ [ ( "base", None ),
+                           ( "put", KIND_TASK, 2, journal.get_fields( changed ), [ 1 ] ),
+                           ( "put", KIND_TASK, 0, journal.get_fields( task1 ), [] ) ],
+                         [ ( "del", KIND_TASK, 0 ),
+                           ( "roots", KIND_TASK, [ 2 ] ) ] ]
+
+        tasks, todos, notes, itemIds = journal.replay_journal( transactions, tasks, [], {} )
+        self.assertEqual( tasks, [ task2 ] )
+        self.assertEqual( task2.title, "changed" )
+        self.assertEqual( task2.getSubitems(), [ subtask ] )
+        self.assertIs( subtask.getParent(), task2 )
+        self.assertEqual( todos, [] )
+        self.assertEqual( notes, {} )
+        self.assertEqual( itemIds, { subtask: 1, task2: 2 } )
+
+    def test_storeData_journal(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            task = manager.addTask( Task( "task1" ) )
+            manager.storeData()
+            journalFile = os.path.join( dataDir, "data.journal" )
+            self.assertFalse( os.path.isfile( journalFile ) )
+
+            task.title = "task2"
+            subtask = task.addSubItem( Task( "subtask" ) )
+            manager.addNewToDo( "todo1" )
+            manager.setNotes( { "note": "content" } )
+            self.assertTrue( manager.storeData() )
+            self.assertTrue( os.path.isfile( journalFile ) )
+            self.assertFalse( manager.storeData() )
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasksAll() ], [ "task2", "subtask" ] )
+            self.assertEqual( loaded.findTaskByUID( subtask.UID ).getParent().UID, task.UID )
+            self.assertEqual( [ item.title for item in loaded.getToDos() ], [ "todo1" ] )
+            self.assertEqual( loaded.getNotes(), { "note": "content" } )
+
+            ## compaction
+            loaded.journalLimit = 0
+            loaded.removeTask( loaded.findTaskByUID( subtask.UID ) )
+            loaded.storeData()
+            self.assertFalse( os.path.isfile( journalFile ) )
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasksAll() ], [ "task2" ] )
+
+    def test_storeData_duplicatedUID(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            task1 = manager.addTask( Task( "A" ) )
+            task1.UID = "dup"
+            task2 = manager.addTask( Task( "B" ) )
+            task2.UID = "dup"
+            manager.storeData()
+
+            task2.title = "B2"
+            manager.addTask( Task( "C" ) )
+            manager.storeData()
+            self.assertTrue( os.path.isfile( os.path.join( dataDir, "data.journal" ) ) )
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "A", "B2", "C" ] )
+
+            ## journal is continued after load
+            loaded.getTasks()[0].title = "A2"
+            loaded.removeTask( loaded.getTasks()[1] )
+            loaded.storeData()
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "A2", "C" ] )
+
+    def test_storeData_twice(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            manager.addTask( Task( "task1" ) )
+            self.assertTrue( manager.storeData() )
+            self.assertFalse( manager.storeData() )
+            self.assertFalse( os.path.isfile( os.path.join( dataDir, "data.journal" ) ) )
+
+    def test_loadData_staleJournal(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            task = manager.addTask( Task( "task1" ) )
+            manager.storeData()
+            task.title = "task2"
+            manager.storeData()
+
+            ## snapshot stored by other manager -- journal does not apply
+            other = Manager( dataDir )
+            other.addTask( Task( "other" ) )
+            other.storeData()
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "other" ] )
+            self.assertFalse( os.path.isfile( os.path.join( dataDir, "data.journal" ) ) )
@@ -22,7 +22,11 @@
 #
 
 import unittest
+from unittest import mock
 
+import os
+import pickle
+import tempfile
 import datetime
 from datetime import timedelta
 
@@ -99,6 +103,36 @@ class LocalManagerTest(unittest.TestCase):
         allTasks.clear()
         self.assertEqual( len( manager.getTasksAll() ), 4 )
 
+    def test_getRevision(self):
+        manager = Manager()
+        revision = manager.getRevision()
+        task = manager.addTask( Task("task1") )
+        self.assertGreater( manager.getRevision(), revision )
+
+        revision = manager.getRevision()
+        subtask = task.addSubItem( Task("subtask1") )
+        self.assertGreater( manager.getRevision(), revision )
+
+        revision = manager.getRevision()
+        subtask.title = "subtask2"
+        self.assertGreater( manager.getRevision(), revision )
+
+        revision = manager.getRevision()
+        manager.removeTask( subtask )
+        self.assertGreater( manager.getRevision(), revision )
+
+    def test_getTasksAll_cached(self):
+        manager = Manager()
+        task = manager.addTask( Task("task1") )
+        allTasks1 = manager._getTasksAll()
+        allTasks2 = manager._getTasksAll()
+        self.assertIs( allTasks1, allTasks2 )
+
+        subtask = task.addSubItem( Task("subtask1") )
+        allTasks3 = manager._getTasksAll()
+        self.assertIsNot( allTasks1, allTasks3 )
+        self.assertEqual( allTasks3, [ task, subtask ] )
+
     def test_getNextDeadline_None(self):
         manager = Manager()
         manager.addTask( Task("task1") )
@@ -160,6 +194,232 @@ class LocalManagerTest(unittest.TestCase):
         self.assertEqual( len(tasks), 1 )
         self.assertEqual( tasks[0].title, "new task" )
 
+    def test_removeTask_subtask(self):
+        manager = Manager()
+        task1 = manager.addTask( Task() )
+        subtask = task1.addSubItem( Task() )
+        leaf1 = subtask.addSubItem( Task() )
+        leaf2 = subtask.addSubItem( Task() )
+
+        otherManager = Manager()
+        otherTask = otherManager.addTask( Task() )
+        self.assertEqual( manager.removeTask( otherTask ), None )
+        self.assertEqual( len( otherManager.getTasks() ), 1 )
+
+        self.assertIs( manager.removeTask( leaf1 ), leaf1 )
+        self.assertEqual( leaf1.getParent(), None )
+        self.assertEqual( subtask.getSubitems(), [ leaf2 ] )
+
+        newTask = Task()
+        self.assertTrue( manager.replaceTask( leaf2, newTask ) )
+        self.assertEqual( subtask.getSubitems(), [ newTask ] )
+        self.assertIs( newTask.getParent(), subtask )
+
+    def test_removeTask_invalidParent(self):
+        manager = Manager()
+        task1 = manager.addTask( Task() )
+        task2 = manager.addTask( Task() )
+        subtask = task1.addSubItem( Task() )
+        ## parent link inconsistent with list of subitems
+        subtask.setParent( task2 )
+
+        self.assertIs( manager.removeTask( subtask ), subtask )
+        self.assertEqual( task1.getSubitems(), [] )
+
+    def test_loadData_validated(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            task = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+            task.addSubItem( Task() )
+            manager.storeData()
+            self.assertTrue( os.path.isfile( os.path.join( dataDir, "tasks.validated" ) ) )
+
+            loaded = Manager( dataDir )
+            with mock.patch.object( loaded, "fixData" ) as fixMock:
+                loaded.loadData()
+                fixMock.assert_not_called()
+            self.assertEqual( len( loaded.getTasksAll() ), 2 )
+
+            loaded.skipValidated = False
+            loaded.loadData()
+            self.assertTrue( loaded.isValidated() )
+
+            ## data set from outside is not validated
+            manager.tasks = [ Task() ]
+            manager.storeData()
+            self.assertFalse( os.path.isfile( os.path.join( dataDir, "tasks.validated" ) ) )
+
+    def test_storeData_unchanged(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            manager.journalLimit = None
+            task = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+            manager.addNewToDo( "todo1" )
+            self.assertTrue( manager.storeData() )
+
+            with mock.patch( "pickle.dumps", wraps=pickle.dumps ) as dumpsMock:
+                self.assertFalse( manager.storeData() )
+                ## only small objects are serialized
+                dumpedObjects = [ call.args[0] for call in dumpsMock.call_args_list ]
+                self.assertNotIn( manager.tasks, dumpedObjects )
+                self.assertNotIn( manager.todos, dumpedObjects )
+                self.assertNotIn( manager.notes, dumpedObjects )
+
+                task.title = "changed"
+                self.assertTrue( manager.storeData() )
+                dumpedObjects = [ call.args[0] for call in dumpsMock.call_args_list ]
+                self.assertIn( manager.tasks, dumpedObjects )
+                self.assertNotIn( manager.todos, dumpedObjects )
+                self.assertNotIn( manager.notes, dumpedObjects )
+
+                dumpsMock.reset_mock()
+                manager.addNote( "note2", "content" )
+                self.assertTrue( manager.storeData() )
+                dumpedObjects = [ call.args[0] for call in dumpsMock.call_args_list ]
+                self.assertNotIn( manager.tasks, dumpedObjects )
+                self.assertIn( manager.notes, dumpedObjects )
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( loaded.getTasks()[0].title, "changed" )
+            self.assertEqual( loaded.getNotes(), { "notes": "", "note2": "content" } )
+
+    def test_storeData_unchanged_archiveLoaded(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            oldTask = manager.addNewTask( datetime.date( 2020, 5, 17 ), "old" )
+            oldTask.setCompleted()
+            manager.addNewTask( datetime.date( 2020, 5, 17 ), "active" )
+            manager.loadArchive()
+            self.assertTrue( manager.storeData() )
+
+            with mock.patch( "pickle.dumps", wraps=pickle.dumps ) as dumpsMock:
+                self.assertFalse( manager.storeData() )
+                dumpedObjects = [ call.args[0] for call in dumpsMock.call_args_list ]
+                self.assertNotIn( [ oldTask ], dumpedObjects )
+                self.assertEqual( len( [ item for item in dumpedObjects if isinstance( item, list ) ] ), 0 )
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "active" ] )
+            loaded.loadArchive()
+            self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "active", "old" ] )
+
+    def test_loadHistory(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            manager.journalLimit = None
+            task = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+            manager.storeData()
+            task.title = "task2"
+            manager.storeData()
+            manager.pruneBackups( background=False )
+
+            self.assertEqual( manager.loadHistory( 0 )[ 'tasks' ][0].title, "task2" )
+            self.assertEqual( manager.loadHistory( 1 )[ 'tasks' ][0].title, "task1" )
+            self.assertIsNone( manager.loadHistory( 2 ) )
+
+    def test_archive(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            oldTask = manager.addNewTask( datetime.date( 2020, 5, 17 ), "old" )
+            oldTask.setCompleted()
+            recentTask = manager.addNewTask( datetime.date.today(), "recent" )
+            recentTask.setCompleted()
+            activeTask = manager.addNewTask( datetime.date( 2020, 5, 17 ), "active" )
+            recurrentTask = manager.addNewTask( datetime.date( 2020, 5, 17 ), "recurrent" )
+            recurrentTask.recurrence = Recurrent()
+            recurrentTask.recurrence.setDaily()
+            recurrentTask.setCompleted()
+            manager.storeData()
+
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( [ task.title for task in loaded.getTasks() ], [ "recent", "active", "recurrent" ] )
+            loaded.storeData()
+            self.assertTrue( os.path.isfile( os.path.join( dataDir, "archive.obj" ) ) )
+
+            loaded = Manager( dataDir )
+            self.assertEqual( len( loaded.loadHistory()[ 'tasks' ] ), 3 )
+            self.assertFalse( loaded.isArchiveLoaded() )
+            self.assertTrue( loaded.loadArchive() )
+            self.assertEqual( len( loaded.getTasks() ), 4 )
+            self.assertIsNotNone( loaded.findTaskByUID( oldTask.UID ) )
+            self.assertFalse( loaded.loadArchive() )
+
+            ## archive loaded -- archived task stays in memory and in archive file
+            loaded.storeData()
+            self.assertEqual( len( loaded.getTasks() ), 4 )
+            loaded = Manager( dataDir )
+            loaded.loadData()
+            self.assertEqual( len( loaded.getTasks() ), 3 )
+            loaded.loadArchive()
+            self.assertEqual( len( loaded.getTasks() ), 4 )
+
+    def test_archive_disabled(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            manager = Manager( dataDir )
+            oldTask = manager.addNewTask( datetime.date( 2020, 5, 17 ), "old" )
+            oldTask.setCompleted()
+            manager.storeData()
+
+            loaded = Manager( dataDir )
+            loaded.archiveAge = None
+            loaded.loadData()
+            self.assertEqual( len( loaded.getTasks() ), 1 )
+
+    def test_batch_changes(self):
+        manager = Manager()
+        task1 = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 1 )
+
+        with manager.batch() as changes:
+            self.assertTrue( manager.isInBatch() )
+            task2 = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task2" )
+            subtask = Task()
+            task2.addSubItem( subtask )
+            task1.title = "changed"
+            todo = manager.addNewToDo( "todo1" )
+            ## lookup indexes are updated inside batch
+            self.assertIs( manager.findTaskByUID( subtask.UID ), subtask )
+
+        self.assertFalse( manager.isInBatch() )
+        self.assertEqual( changes.taskUIDs, set( [ task1.UID, task2.UID, subtask.UID ] ) )
+        self.assertEqual( changes.todoUIDs, set( [ todo.UID ] ) )
+        self.assertFalse( changes.notesChanged )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 2 )
+
+    def test_batch_deferred(self):
+        manager = Manager()
+        manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 1 )
+
+        with manager.batch():
+            manager.addNewTask( datetime.date( 2020, 5, 17 ), "task2" )
+            self.assertFalse( manager._occurrenceIndex.isValid() )
+            ## index accessed inside batch is rebuilt
+            self.assertEqual( len( manager.getTaskOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 2 )
+            manager.addNewTask( datetime.date( 2020, 5, 17 ), "task3" )
+            self.assertFalse( manager._occurrenceIndex.isValid() )
+
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 3 )
+
+    def test_batch_nested(self):
+        manager = Manager()
+        with manager.batch() as outerChanges:
+            task1 = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+            with manager.batch() as innerChanges:
+                task2 = manager.addNewTask( datetime.date( 2020, 5, 18 ), "task2" )
+                manager.addNote( "note", "content" )
+            self.assertIs( innerChanges, outerChanges )
+            self.assertTrue( manager.isInBatch() )
+            manager.removeTask( task1 )
+
+        self.assertFalse( manager.isInBatch() )
+        self.assertEqual( outerChanges.taskUIDs, set( [ task1.UID, task2.UID ] ) )
+        self.assertTrue( outerChanges.notesChanged )
+        self.assertEqual( manager.getTasks(), [ task2 ] )
+
     def test_getNotificationList(self):
         manager = Manager()
 
@@ -64,3 +64,12 @@ class RecurrentTest(unittest.TestCase):
         offset = recurrent.findRecurrentOffset(refDate, targetDate)
 
         self.assertEqual( offset, 1 )
+
+    def test_getDateOffset_cache(self):
+        recurrent = Recurrent( RepeatType.DAILY, 2 )
+        dateOffset = recurrent.getDateOffset()
+        self.assertIs( recurrent.getDateOffset(), dateOffset )
+        self.assertNotIn( "_offsetCache", recurrent.__getstate__() )
+
+        recurrent.setWeekly( 2 )
+        self.assertEqual( recurrent.getDateOffset().days, 14 )
@@ -122,6 +122,110 @@ class TaskTest(unittest.TestCase):
         self.assertNotEqual( occurrence3, None )
         self.assertEqual( occurrence3.isCompleted(), False )
 
+    def test_getTaskOccurrencesForRange(self):
+        taskDate = datetime.datetime( 2020, 5, 17, 12 )
+        task = Task()
+        task.startDateTime = taskDate
+        task.dueDateTime   = taskDate + timedelta( days=1 )
+        task.recurrence = Recurrent()
+        task.recurrence.setWeekly()
+        task.recurrence.endDate = taskDate.date() + timedelta( days=14 )
+
+        startDate = taskDate.date() - timedelta( days=3 )
+        endDate   = taskDate.date() + timedelta( days=30 )
+        occurrences = task.getTaskOccurrencesForRange( startDate, endDate )
+        self.assertEqual( len( occurrences ), 5 )         ## last day of third occurrence is after end date
+        for day in range( 0, 34 ):
+            currDate = startDate + timedelta( days=day )
+            expected = task.getTaskOccurrenceForDate( currDate )
+            entry = occurrences.get( currDate, None )
+            if expected is None:
+                self.assertEqual( entry, None )
+            else:
+                self.assertEqual( entry.offset, expected.offset )
+
+    def test_getTaskOccurrencesForRange_monthly(self):
+        taskDate = datetime.datetime( 2020, 1, 10, 12 )
+        task = Task()
+        task.dueDateTime = taskDate
+        task.recurrence = Recurrent( RepeatType.MONTHLY, 1 )
+
+        occurrences = task.getTaskOccurrencesForRange( datetime.date( 2021, 1, 1 ), datetime.date( 2021, 3, 31 ) )
+        self.assertEqual( sorted( occurrences.keys() ), [ datetime.date( 2021, 1, 10 ),
+                                                          datetime.date( 2021, 2, 10 ),
+                                                          datetime.date( 2021, 3, 10 ) ] )
+        self.assertEqual( occurrences[ datetime.date( 2021, 1, 10 ) ].offset, 12 )
+
+    def test_iterOccurrences(self):
+        taskDate = datetime.datetime( 2020, 5, 17, 12 )
+        task = Task()
+        task.dueDateTime = taskDate
+        task.recurrence = Recurrent( RepeatType.DAILY, 2 )
+
+        occurrences = list( task.iterOccurrences( datetime.date( 2020, 5, 20 ), datetime.date( 2020, 5, 25 ) ) )
+        offsets = [ entry.offset for entry in occurrences ]
+        self.assertEqual( offsets, [2, 3, 4] )
+
+    def test_iterOccurrences_endDate(self):
+        taskDate = datetime.datetime( 2020, 5, 17, 12 )
+        task = Task()
+        task.dueDateTime = taskDate
+        task.recurrence = Recurrent( RepeatType.WEEKLY, 1, datetime.date( 2020, 6, 5 ) )
+
+        occurrences = list( task.iterOccurrences( datetime.date( 2020, 5, 1 ) ) )
+        offsets = [ entry.offset for entry in occurrences ]
+        self.assertEqual( offsets, [0, 1, 2] )
+
+    def test_iterOccurrences_completed(self):
+        taskDate = datetime.datetime( 2020, 5, 17, 12 )
+        task = Task()
+        task.dueDateTime = taskDate
+        task.recurrence = Recurrent( RepeatType.DAILY, 1 )
+        task.setCompleted()
+        task.setCompleted()
+
+        endDate = datetime.date( 2020, 5, 21 )
+        occurrences = list( task.iterOccurrences( None, endDate ) )
+        self.assertEqual( [ entry.offset for entry in occurrences ], [0, 1, 2, 3, 4] )
+        self.assertEqual( occurrences[1].isCompleted(), True )
+        occurrences = list( task.iterOccurrences( None, endDate, includeCompleted=False ) )
+        self.assertEqual( [ entry.offset for entry in occurrences ], [2, 3, 4] )
+
+    def test_iterOccurrences_asParent(self):
+        taskDate = datetime.datetime( 2020, 5, 17, 12 )
+        task = Task()
+        task.dueDateTime = taskDate
+        task.recurrence = Recurrent( RepeatType.WEEKLY, 1 )
+        subtask = task.addSubItem( Task() )
+        subtask.dueDateTime = taskDate + timedelta( days=1 )
+        subtask.recurrence = Recurrent( RepeatType.ASPARENT, 1 )
+
+        occurrences = subtask.iterOccurrences( datetime.date( 2020, 6, 1 ) )
+        entry = next( occurrences )
+        self.assertEqual( entry.offset, 2 )
+        self.assertEqual( entry.due.date(), datetime.date( 2020, 6, 1 ) )
+
+    def test_getAppliedRecurrence_asParent(self):
+        task = Task()
+        task.recurrence = Recurrent( RepeatType.DAILY, 2 )
+        subtask = task.addSubTask()
+        subtask.recurrence = Recurrent( RepeatType.ASPARENT )
+        leaf = subtask.addSubTask()
+        leaf.recurrence = Recurrent( RepeatType.ASPARENT )
+        self.assertIs( leaf.getAppliedRecurrence(), task.recurrence )
+
+        task.recurrence = Recurrent( RepeatType.WEEKLY, 1 )
+        self.assertIs( leaf.getAppliedRecurrence(), task.recurrence )
+
+        subtask.recurrence.mode = RepeatType.MONTHLY
+        subtask.recurrence.every = 1
+        subtask.updateRecurrence()
+        self.assertIs( leaf.getAppliedRecurrence(), subtask.recurrence )
+
+        subtask.removeSubItem( leaf )
+        self.assertIs( leaf.getAppliedRecurrence(), None )
+        self.assertNotIn( "_appliedRecurrence", leaf.__getstate__() )
+
     def test_getNotifications_due(self):
         task = Task()
         task.title = "task 1"
@@ -189,6 +293,63 @@ class TaskOccurrenceTest(unittest.TestCase):
         self.assertEqual( occurrence.startCurrent, task.startDateTime )
         self.assertEqual( occurrence.dueCurrent, subtask.dueDateTime )
 
+    def test_date_current_update(self):
+        task = Task()
+        task.startDateTime = datetime.datetime( 2020, 10, 10 )
+        task.dueDateTime   = task.startDateTime + timedelta( days=1 )
+        occurrence = task.currentOccurrence()
+        self.assertEqual( occurrence.dueCurrent, task.dueDateTime )
+
+        subtask = task.addSubTask()
+        subtask.setDeadlineDateTime( task.dueDateTime - timedelta( days=3 ) )
+        self.assertEqual( occurrence.dueCurrent, subtask.dueDateTime )
+
+        subtask.dueDateTime = task.dueDateTime + timedelta( days=3 )
+        self.assertEqual( occurrence.dueCurrent, task.dueDateTime )
+
+        subtask.startDateTime = task.startDateTime - timedelta( days=2 )
+        self.assertEqual( occurrence.startCurrent, subtask.startDateTime )
+
+        task.removeSubItem( subtask )
+        self.assertEqual( occurrence.startCurrent, task.startDateTime )
+
+    def test_date_current_asParent(self):
+        task = Task()
+        task.dueDateTime = datetime.datetime( 2020, 10, 10 )
+        subtask = task.addSubTask()
+        subtask.dueDateTime = datetime.datetime( 2020, 10, 5 )
+        subtask.recurrence = Recurrent( RepeatType.ASPARENT )
+        subtask.recurrentOffset = 1
+        self.assertEqual( task.currentOccurrence().dueCurrent, datetime.datetime( 2020, 10, 5 ) )
+
+        task.recurrence = Recurrent( RepeatType.MONTHLY, 1 )
+        self.assertEqual( task.currentOccurrence().dueCurrent, datetime.datetime( 2020, 10, 10 ) )
+
+    def test_date_current_reparent(self):
+        task1 = Task()
+        task1.dueDateTime = datetime.datetime( 2020, 12, 10 )
+        task1.recurrence = Recurrent( RepeatType.MONTHLY, 1 )
+        task2 = Task()
+        task2.dueDateTime = datetime.datetime( 2020, 12, 10 )
+        task2.recurrence = Recurrent( RepeatType.WEEKLY, 1 )
+
+        subtask = task1.addSubTask()
+        subtask.dueDateTime = datetime.datetime( 2020, 10, 5 )
+        subtask.recurrence = Recurrent( RepeatType.ASPARENT )
+        subtask.recurrentOffset = 1
+        leaf = subtask.addSubTask()
+        leaf.dueDateTime = datetime.datetime( 2020, 10, 4 )
+        leaf.recurrence = Recurrent( RepeatType.ASPARENT )
+        leaf.recurrentOffset = 1
+        self.assertEqual( subtask.currentOccurrence().dueCurrent, datetime.datetime( 2020, 11, 4 ) )
+        self.assertEqual( task1.currentOccurrence().dueCurrent, datetime.datetime( 2020, 11, 5 ) )
+
+        task1.removeSubItem( subtask )
+        task2.addSubItem( subtask )
+        self.assertEqual( subtask.currentOccurrence().dueCurrent, datetime.datetime( 2020, 10, 11 ) )
+        self.assertEqual( task2.currentOccurrence().dueCurrent, datetime.datetime( 2020, 10, 12 ) )
+        self.assertEqual( task1.currentOccurrence().dueCurrent, datetime.datetime( 2020, 12, 10 ) )
+
     def test_isTimedout(self):
         task = Task()
         occurrence = task.currentOccurrence()
@@ -211,3 +372,25 @@ class TaskOccurrenceTest(unittest.TestCase):
 
         occurrence = task.currentOccurrence()
         self.assertEqual( occurrence.isReminded(), True )
+
+    def test_currentOccurrence_shared(self):
+        task = Task()
+        task.dueDateTime = datetime.datetime( 2020, 10, 10 )
+
+        occurrence = task.currentOccurrence()
+        self.assertIs( task.currentOccurrence(), occurrence )
+        self.assertIs( task.getTaskOccurrenceForDate( datetime.date( 2020, 10, 10 ) ), occurrence )
+        self.assertFalse( hasattr( occurrence, "__dict__" ) )
+
+        task.dueDateTime = datetime.datetime( 2020, 10, 12 )
+        changed = task.currentOccurrence()
+        self.assertIsNot( changed, occurrence )
+        self.assertEqual( changed.due, datetime.datetime( 2020, 10, 12 ) )
+
+    def test_currentOccurrence_pickle(self):
+        task = Task()
+        task.dueDateTime = datetime.datetime( 2020, 10, 10 )
+        task.currentOccurrence()
+
+        state = task.__getstate__()
+        self.assertNotIn( "_baseOccurrence", state )
@@ -55,3 +55,29 @@ class TaskTest(unittest.TestCase):
         child.setCompleted()
         self.assertEqual( todo.isCompleted(), True )
         self.assertEqual( child.isCompleted(), True )
+
+    def test_isCompleted_deep(self):
+        todo = LocalToDo()
+        todo.setCompleted()
+        child = todo.addSubtodo( LocalToDo() )
+        child.setCompleted()
+        leaf = child.addSubtodo( LocalToDo() )
+        self.assertEqual( todo.isCompleted(), False )
+
+        leaf.setCompleted()
+        self.assertEqual( todo.isCompleted(), True )
+
+        leaf.setCompleted( 50 )
+        self.assertEqual( todo.isCompleted(), False )
+
+        child.removeSubItem( leaf )
+        self.assertEqual( todo.isCompleted(), True )
+
+        newLeaf = LocalToDo()
+        todo.replaceSubItem( child, newLeaf )
+        self.assertEqual( todo.isCompleted(), False )
+
+    def test_isCompleted_pickle(self):
+        todo = LocalToDo()
+        todo.isCompleted()
+        self.assertNotIn( "_completedState", todo.__getstate__() )
@@ -0,0 +1,135 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+try:
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=W0611
+    import __init__
+except ImportError:
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+    pass
+
+import sys
+import random
+import timeit
+import tracemalloc
+
+from datetime import date, datetime, timedelta
+
+from hanlendar.domainmodel.task import Task, TaskOccurrence, DateTimeRange
+from hanlendar.domainmodel.recurrent import Recurrent, RepeatType
+from hanlendar.domainmodel.local.manager import LocalManager
+
+
+class LegacyDateTimeRange():
+    """Range object with attributes kept in '__dict__' (layout before '__slots__')."""
+
+    def __init__(self, start=None, end=None ):
+        self.start: datetime = start
+        self.end:   datetime = end
+
+
+class LegacyTaskOccurrence():
+    """Occurrence object with attributes kept in '__dict__' (layout before '__slots__')."""
+
+    def __init__(self, task, offset=0):
+        self.task       = task
+        self.offset     = offset
+        self._dateRange = None
+
+
+def measure_allocation( function ):
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def object_size( objectClass, *args ):
+    count = 100000
+
+    def create():
+        return [ objectClass( *args ) for _ in range( 0, count ) ]
+
+    return measure_allocation( create ) / count
+
+
+## ============================= main section ===================================
+
+
+if __name__ != '__main__':
+    sys.exit(0)
+
+
+generator = random.Random( 1 )
+manager = LocalManager()
+monthStart = date( 2020, 6, 1 )
+for i in range( 0, 10000 ):
+    task = manager.addNewTask( monthStart + timedelta( days=generator.randint( -180, 180 ) ), "task %s" % i )
+    kind = generator.randint( 0, 9 )
+    if kind == 0:
+        task.dueDateTime = task.dueDateTime + timedelta( days=generator.randint( 1, 10 ) )
+    elif kind == 1:
+        task.recurrence = Recurrent( RepeatType.WEEKLY, generator.randint( 1, 3 ) )
+
+
+def paint_month():
+    ## same steps as month calendar widget: load visible days and paint each cell
+    firstDate = monthStart - timedelta( days=7 )
+    lastDate  = firstDate + timedelta( days=7 * 7 )
+    occurrences = manager.getTaskOccurrencesForRange( firstDate, lastDate, True )
+    for tasksList in occurrences.values():
+        tasksList.sort( key=TaskOccurrence.sortByDates )
+        for entry in tasksList:
+            entry.isCompleted()
+            entry.isTimedout()
+    return occurrences
+
+
+def fresh_base_occurrence( task ):
+    return TaskOccurrence( task )
+
+
+paint_month()
+
+sharedPeak = measure_allocation( paint_month )
+sharedTime = min( timeit.repeat( paint_month, number=1, repeat=5 ) )
+
+sharedMethod = Task.getBaseOccurrence
+Task.getBaseOccurrence = fresh_base_occurrence
+freshPeak = measure_allocation( paint_month )
+freshTime = min( timeit.repeat( paint_month, number=1, repeat=5 ) )
+Task.getBaseOccurrence = sharedMethod
+
+print( "tasks:                   %s" % len( manager.getTasksAll() ) )
+print( "month paint (shared):    %.1f KiB peak  %.4fs" % ( sharedPeak / 1024, sharedTime ) )
+print( "month paint (per call):  %.1f KiB peak  %.4fs" % ( freshPeak / 1024, freshTime ) )
+print( "DateTimeRange size:      %.1f B (dict-based: %.1f B)" % ( object_size( DateTimeRange ),
+                                                                  object_size( LegacyDateTimeRange ) ) )
+print( "TaskOccurrence size:     %.1f B (dict-based: %.1f B)" % ( object_size( TaskOccurrence, task ),
+                                                                  object_size( LegacyTaskOccurrence, task ) ) )
@@ -0,0 +1,77 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+try:
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=W0611
+    import __init__
+except ImportError:
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+    pass
+
+import sys
+import random
+import timeit
+
+from datetime import date, timedelta
+
+from hanlendar.domainmodel.recurrentmath import ceil_multiplication
+from testhanlendar.domainmodel.test_recurrentmath import legacy_find_multiplication_after, random_offset
+
+
+## ============================= main section ===================================
+
+
+if __name__ != '__main__':
+    sys.exit(0)
+
+
+generator = random.Random( 1 )
+samples = list()
+for _ in range( 0, 2000 ):
+    startDate = date( 2000, 1, 1 ) + timedelta( days=generator.randint( 0, 7000 ) )
+    endDate   = startDate + timedelta( days=generator.randint( 0, 3000 ) )
+    samples.append( ( startDate, endDate, random_offset( generator ) ) )
+
+
+def run_legacy():
+    for startDate, endDate, offset in samples:
+        legacy_find_multiplication_after( startDate, endDate, offset )
+
+
+def run_closed_form():
+    for startDate, endDate, offset in samples:
+        ceil_multiplication( startDate, endDate, offset )
+
+
+repeats = 5
+legacyTime = min( timeit.repeat( run_legacy, number=1, repeat=repeats ) )
+closedTime = min( timeit.repeat( run_closed_form, number=1, repeat=repeats ) )
+
+print( "samples:     %s" % len( samples ) )
+print( "legacy:      %.4fs" % legacyTime )
+print( "closed-form: %.4fs" % closedTime )
+print( "speedup:     %.1fx" % ( legacyTime / closedTime ) )
@@ -0,0 +1,83 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+try:
+    ## following import success only when file is directly executed from command line
+    ## otherwise will throw exception when executing as parameter for "python -m"
+    # pylint: disable=W0611
+    import __init__
+except ImportError:
+    ## when import fails then it means that the script was executed indirectly
+    ## in this case __init__ is already loaded
+    pass
+
+import sys
+import random
+import timeit
+
+from hanlendar.domainmodel.local.manager import LocalManager
+
+
+## ============================= main section ===================================
+
+
+if __name__ != '__main__':
+    sys.exit(0)
+
+
+SYLLABLES = [ "ka", "lo", "mi", "ter", "pro", "den", "vis", "ra", "sto", "bel", "nu", "gar",
+              "tis", "mon", "ev", "ul", "pa", "qui", "res", "do" ]
+generator = random.Random( 1 )
+
+## vocabulary of few thousands of words
+WORDS = sorted( set( "".join( generator.choice( SYLLABLES ) for _ in range( 0, generator.randint( 2, 4 ) ) )
+                     for _ in range( 0, 5000 ) ) )
+
+
+def random_text( wordsNum ):
+    words = [ generator.choice( WORDS ) for _ in range( 0, wordsNum ) ]
+    words.append( "id%s" % generator.randint( 0, 100000 ) )
+    return " ".join( words )
+
+
+manager = LocalManager()
+for i in range( 0, 25000 ):
+    task = manager.createEmptyTask()
+    task.title = random_text( 3 )
+    task.description = random_text( 12 )
+    manager.addTask( task )
+    todo = manager.createEmptyToDo()
+    todo.title = random_text( 3 )
+    todo.description = random_text( 12 )
+    manager.addToDo( todo )
+
+buildTime = min( timeit.repeat( lambda: manager.search( "x" ), number=1, repeat=1 ) )
+
+print( "items:                %s" % ( len( manager.getTasksAll() ) + len( manager.getTodosAll() ) ) )
+print( "index build:          %.4fs" % buildTime )
+print( "words:                %s" % len( WORDS ) )
+for query in [ WORDS[ 100 ], WORDS[ 100 ][ :4 ], WORDS[ 100 ][ 1:4 ], WORDS[ 200 ] + " " + WORDS[ 300 ], "ka", "id123" ]:
+    queryTime = min( timeit.repeat( lambda: manager.search( query ), number=1, repeat=5 ) )
+    hits = manager.search( query )
+    print( "query %-16s %.4fs  hits: %s" % ( "'%s':" % query, queryTime, len( hits ) ) )
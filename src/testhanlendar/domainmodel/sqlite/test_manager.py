@@ -0,0 +1,167 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+import os
+import tempfile
+import datetime
+
+from hanlendar.domainmodel.recurrent import Recurrent
+from hanlendar.domainmodel.reminder import Reminder
+from hanlendar.domainmodel.local.manager import LocalManager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+from hanlendar.domainmodel.sqlite.manager import SQLiteManager as Manager
+
+
+class SQLiteManagerTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.dbFile = os.path.join( self.tmpDir.name, "data.sqlite" )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.tmpDir.cleanup()
+
+    def test_storeData_loadData(self):
+        manager = Manager( self.dbFile )
+        task = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+        task.recurrence = Recurrent()
+        task.recurrence.setWeekly()
+        task.reminderList = [ Reminder( 1 ) ]
+        subtask = task.addSubItem( Task( "subtask" ) )
+        manager.addNewToDo( "todo1" )
+        manager.setNotes( { "note": "content" } )
+        self.assertTrue( manager.storeData() )
+        self.assertFalse( manager.storeData() )
+        manager.close()
+
+        loaded = Manager( self.dbFile )
+        loaded.loadData()
+        self.assertTrue( loaded.isValidated() )
+        loadedTask = loaded.findTaskByUID( task.UID )
+        self.assertEqual( loadedTask.title, "task1" )
+        self.assertEqual( loadedTask.dueDateTime, task.dueDateTime )
+        self.assertEqual( loadedTask.recurrence, task.recurrence )
+        self.assertEqual( loadedTask.reminderList[0].getOffset(), datetime.timedelta( days=1 ) )
+        self.assertEqual( [ item.UID for item in loadedTask.getSubitems() ], [ subtask.UID ] )
+        self.assertEqual( [ item.title for item in loaded.getToDos() ], [ "todo1" ] )
+        self.assertEqual( loaded.getNotes(), { "note": "content" } )
+        loaded.close()
+
+    def test_storeData_changedRows(self):
+        manager = Manager( self.dbFile )
+        task1 = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+        task2 = manager.addNewTask( datetime.date( 2020, 5, 18 ), "task2" )
+        manager.storeData()
+
+        task1.title = "changed"
+        task1.addSubItem( Task( "subtask" ), 0 )
+        manager.removeTask( task2 )
+        self.assertTrue( manager.storeData() )
+        manager.close()
+
+        loaded = Manager( self.dbFile )
+        loaded.loadData()
+        self.assertEqual( [ item.title for item in loaded.getTasksAll() ], [ "changed", "subtask" ] )
+        loaded.close()
+
+    def test_storeData_duplicatedUID(self):
+        manager = Manager( self.dbFile )
+        task1 = manager.addTask( Task( "A" ) )
+        task1.UID = "dup"
+        task2 = manager.addTask( Task( "B" ) )
+        task2.UID = "dup"
+        self.assertTrue( manager.storeData() )
+
+        task2.title = "B2"
+        manager.addTask( Task( "C" ) )
+        self.assertTrue( manager.storeData() )
+        manager.close()
+
+        loaded = Manager( self.dbFile )
+        self.assertEqual( loaded.findTaskByUID( "dup" ).title, "A" )
+        loaded.loadData()
+        self.assertEqual( [ item.title for item in loaded.getTasks() ], [ "A", "B2", "C" ] )
+        loaded.close()
+
+    def test_findTaskByUID_duplicatedLazy(self):
+        manager = Manager( self.dbFile )
+        task1 = manager.addTask( Task( "A" ) )
+        task2 = manager.addTask( Task( "B" ) )
+        task2.UID = "dup"
+        self.assertTrue( manager.storeData() )
+
+        ## subtask is stored after "B", but is first in tree order
+        subtask = task1.addSubItem( Task( "C" ) )
+        subtask.UID = "dup"
+        self.assertTrue( manager.storeData() )
+        manager.close()
+
+        loaded = Manager( self.dbFile )
+        self.assertEqual( loaded.findTaskByUID( "dup" ).title, "C" )
+        loaded.loadData()
+        self.assertEqual( loaded.findTaskByUID( "dup" ).title, "C" )
+        loaded.close()
+
+    def test_lazy_load(self):
+        manager = Manager( self.dbFile )
+        task1 = manager.addNewTask( datetime.date( 2020, 5, 17 ), "task1" )
+        subtask = task1.addSubItem( Task( "subtask" ) )
+        manager.addNewTask( datetime.date( 2020, 6, 17 ), "task2" )
+        manager.storeData()
+        manager.close()
+
+        loaded = Manager( self.dbFile )
+        found = loaded.findTaskByUID( subtask.UID )
+        self.assertEqual( found.title, "subtask" )
+        self.assertEqual( found.getParent().title, "task1" )
+
+        occurrences = loaded.getTaskOccurrencesForDate( datetime.date( 2020, 6, 17 ) )
+        self.assertEqual( [ entry.task.title for entry in occurrences ], [ "task2" ] )
+
+        found.title = "changed"
+        self.assertTrue( loaded.storeData() )
+
+        ## whole list reuses loaded items
+        self.assertEqual( len( loaded.getTasks() ), 2 )
+        self.assertIs( loaded.findTaskByUID( subtask.UID ), found )
+        loaded.close()
+
+        loaded = Manager( self.dbFile )
+        self.assertEqual( loaded.findTaskByUID( subtask.UID ).title, "changed" )
+        self.assertEqual( loaded.getDeadlinedTasks()[0].title, "task1" )
+        loaded.close()
+
+    def test_migrate(self):
+        localManager = LocalManager( self.tmpDir.name )
+        task = localManager.addNewTask( datetime.date.today(), "task1" )
+        localManager.addNewToDo( "todo1" )
+        localManager.storeData()
+
+        manager = Manager( self.dbFile, self.tmpDir.name )
+        manager.loadData()
+        self.assertEqual( manager.getTasks()[0].UID, task.UID )
+        self.assertEqual( [ item.title for item in manager.getToDos() ], [ "todo1" ] )
+        manager.close()
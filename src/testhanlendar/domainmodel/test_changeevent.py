@@ -0,0 +1,99 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+import datetime
+
+from hanlendar.domainmodel.changeevent import ChangeEvent, ChangeType, date_window
+from hanlendar.domainmodel.recurrent import Recurrent, RepeatType
+from hanlendar.domainmodel.local.task import LocalTask as Task
+from hanlendar.domainmodel.local.todo import LocalToDo as ToDo
+
+
+class ChangeEventTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_date_window(self):
+        task = Task()
+        task.startDateTime = datetime.datetime( 2020, 5, 17, 10 )
+        task.dueDateTime   = datetime.datetime( 2020, 5, 19, 10 )
+        window = date_window( task )
+        self.assertEqual( window.start, datetime.date( 2020, 5, 17 ) )
+        self.assertEqual( window.end, datetime.date( 2020, 5, 19 ) )
+
+    def test_date_window_subtask(self):
+        task = Task()
+        task.dueDateTime = datetime.datetime( 2020, 5, 17, 10 )
+        subtask = Task()
+        subtask.dueDateTime = datetime.datetime( 2020, 6, 2, 10 )
+        task.addSubItem( subtask )
+        window = date_window( task )
+        self.assertEqual( window.start, datetime.date( 2020, 5, 17 ) )
+        self.assertEqual( window.end, datetime.date( 2020, 6, 2 ) )
+
+    def test_date_window_recurrent(self):
+        task = Task()
+        task.startDateTime = datetime.datetime( 2020, 5, 17, 10 )
+        task.dueDateTime   = datetime.datetime( 2020, 5, 18, 10 )
+        task.recurrence = Recurrent( RepeatType.WEEKLY, 1, datetime.date( 2020, 6, 30 ) )
+        window = date_window( task )
+        self.assertEqual( window.start, datetime.date( 2020, 5, 17 ) )
+        self.assertEqual( window.end, datetime.date( 2020, 7, 1 ) )
+
+        task.recurrence = Recurrent( RepeatType.WEEKLY, 1 )
+        window = date_window( task )
+        self.assertEqual( window.start, datetime.date( 2020, 5, 17 ) )
+        self.assertEqual( window.end, None )
+
+    def test_date_window_none(self):
+        self.assertEqual( date_window( Task() ), None )
+        self.assertEqual( date_window( ToDo() ), None )
+
+    def test_affectsDates(self):
+        task = Task()
+        task.dueDateTime = datetime.datetime( 2020, 5, 17, 10 )
+        event = ChangeEvent.added( task )
+        self.assertEqual( event.changeType, ChangeType.ADDED )
+        self.assertTrue( event.affectsDates( datetime.date( 2020, 5, 1 ), datetime.date( 2020, 5, 31 ) ) )
+        self.assertFalse( event.affectsDates( datetime.date( 2020, 6, 1 ), datetime.date( 2020, 6, 30 ) ) )
+
+    def test_affectsDates_modified(self):
+        task = Task()
+        task.dueDateTime = datetime.datetime( 2020, 5, 17, 10 )
+        oldWindow = date_window( task )
+        task.dueDateTime = datetime.datetime( 2020, 8, 17, 10 )
+        event = ChangeEvent.modified( task, oldWindow )
+        self.assertTrue( event.affectsDates( datetime.date( 2020, 5, 1 ), datetime.date( 2020, 5, 31 ) ) )
+        self.assertTrue( event.affectsDates( datetime.date( 2020, 8, 1 ), datetime.date( 2020, 8, 31 ) ) )
+        self.assertFalse( event.affectsDates( datetime.date( 2020, 6, 1 ), datetime.date( 2020, 6, 30 ) ) )
+
+    def test_affectsDates_todo(self):
+        event = ChangeEvent.removed( ToDo() )
+        self.assertFalse( event.affectsDates( datetime.date( 2020, 5, 1 ), datetime.date( 2020, 5, 31 ) ) )
@@ -0,0 +1,173 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import random
+
+import datetime
+from datetime import timedelta
+
+from hanlendar.domainmodel.recurrent import Recurrent, RepeatType
+from hanlendar.domainmodel.reminder import Reminder
+from hanlendar.domainmodel.deadlinescheduler import TaskHeap
+from hanlendar.domainmodel.local.manager import LocalManager as Manager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+def find_deadlined( tasksList, currTime ):
+    ret = list()
+    for task in tasksList:
+        if task.isCompleted():
+            continue
+        if task.occurrenceDue is not None and currTime > task.occurrenceDue:
+            ret.append( task )
+    return ret
+
+
+def find_reminded( tasksList, currTime ):
+    ret = list()
+    for task in tasksList:
+        if task.isCompleted():
+            continue
+        if task.occurrenceDue is None:
+            continue
+        offset = task.getReminderGreatest()
+        if offset is not None and task.occurrenceDue - offset <= currTime:
+            ret.append( task )
+    return ret
+
+
+class TaskHeapTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_top(self):
+        heap = TaskHeap()
+        task1 = Task( "task1" )
+        task2 = Task( "task2" )
+        heap.push( task1, 5 )
+        heap.push( task2, 3 )
+        self.assertIs( heap.top(), task2 )
+        heap.push( task2, 7 )
+        self.assertIs( heap.top(), task1 )
+        heap.remove( task1 )
+        self.assertIs( heap.top(), task2 )
+        self.assertEqual( len( heap ), 1 )
+
+    def test_getBelow(self):
+        heap = TaskHeap()
+        tasks = [ Task( "task%s" % i ) for i in range( 0, 20 ) ]
+        for i, task in enumerate( tasks ):
+            heap.push( task, ( i * 7 ) % 20 )
+        below = heap.getBelow( 10 )
+        self.assertEqual( [ ( tasks.index( task ) * 7 ) % 20 for task in below ], list( range( 0, 10 ) ) )
+        below = heap.getBelow( 10, inclusive=True )
+        self.assertEqual( len( below ), 11 )
+
+
+class DeadlineSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_getNextDeadline_recurrent(self):
+        manager = Manager()
+        currTime = datetime.datetime.today()
+        task1 = manager.addNewDeadlineDateTime( currTime + timedelta( hours=1 ), "task1" )
+        task1.recurrence = Recurrent( RepeatType.DAILY, 1 )
+        task2 = manager.addNewDeadlineDateTime( currTime + timedelta( hours=5 ), "task2" )
+        self.assertIs( manager.getNextDeadline(), task1 )
+
+        ## next occurrence of task1 is after task2
+        task1.setCompleted()
+        self.assertIs( manager.getNextDeadline(), task2 )
+
+        task2.setCompleted()
+        self.assertIs( manager.getNextDeadline(), task1 )
+
+    def test_subtask_completion(self):
+        manager = Manager()
+        currTime = datetime.datetime.today()
+        task = manager.addNewDeadlineDateTime( currTime - timedelta( hours=1 ), "task1" )
+        subtask = task.addSubItem( Task( "subtask" ) )
+        task.setCompleted()
+        self.assertEqual( manager.getDeadlinedTasks(), [ task ] )
+
+        subtask.setCompleted()
+        self.assertEqual( manager.getDeadlinedTasks(), [] )
+
+        subtask.setCompleted( 50 )
+        self.assertEqual( manager.getDeadlinedTasks(), [ task ] )
+
+        manager.removeTask( subtask )
+        self.assertEqual( manager.getDeadlinedTasks(), [] )
+
+    def test_consistency(self):
+        generator = random.Random( 1 )
+        manager = Manager()
+        currTime = datetime.datetime.today()
+        manager.getNextDeadline()                   ## build scheduler before changes
+        for i in range( 0, 200 ):
+            allTasks = manager.getTasksAll()
+            action = generator.randint( 0, 5 )
+            if action == 0 or not allTasks:
+                dueTime = currTime + timedelta( hours=generator.randint( -100, 100 ) )
+                manager.addNewDeadlineDateTime( dueTime, "task%s" % i )
+            elif action == 1:
+                parent = generator.choice( allTasks )
+                subtask = parent.addSubItem( Task( "sub%s" % i ) )
+                subtask.dueDateTime = currTime + timedelta( hours=generator.randint( -100, 100 ) )
+            elif action == 2:
+                task = generator.choice( allTasks )
+                task.setCompleted( generator.choice( [ 0, 100 ] ) )
+            elif action == 3:
+                task = generator.choice( allTasks )
+                task.addReminder( Reminder( generator.randint( 0, 3 ) ) )
+            elif action == 4:
+                task = generator.choice( allTasks )
+                task.recurrence = Recurrent( RepeatType.DAILY, generator.randint( 1, 3 ) )
+            else:
+                task = generator.choice( allTasks )
+                manager.removeTask( task )
+
+            allTasks = manager.getTasksAll()
+            self.assertEqual( set( manager.getDeadlinedTasks() ), set( find_deadlined( allTasks, datetime.datetime.today() ) ) )
+            self.assertEqual( set( manager.getRemindedTasks() ), set( find_reminded( allTasks, datetime.datetime.today() ) ) )
+
+            nextDeadline = manager.getNextDeadline()
+            notCompleted = [ task for task in allTasks if not task.isCompleted() and task.occurrenceDue is not None ]
+            if notCompleted:
+                minDue = min( task.occurrenceDue for task in notCompleted )
+                self.assertEqual( nextDeadline.occurrenceDue, minDue )
+            else:
+                self.assertIs( nextDeadline, None )
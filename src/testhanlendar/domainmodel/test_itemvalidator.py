@@ -0,0 +1,79 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+from hanlendar.domainmodel.itemvalidator import validate_items
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class ItemValidatorTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_valid(self):
+        task = Task( "task1" )
+        task.addSubItem( Task( "subtask" ) )
+        rootList = [ task ]
+        report = validate_items( rootList, rootList.append )
+        self.assertTrue( report.isEmpty() )
+        self.assertEqual( rootList, [ task ] )
+
+    def test_missingRoot(self):
+        parent = Task( "parent" )
+        task = Task( "task1" )
+        subtask = task.addSubItem( Task( "subtask" ) )
+        ## parent not in list, but linked
+        task.setParent( parent )
+        parent.subitems = [ task ]
+        rootList = [ Task( "task2" ) ]
+        rootList[0].subitems = [ task ]
+
+        report = validate_items( rootList, rootList.append )
+        self.assertEqual( report.addedRoots, [ parent ] )
+        self.assertIn( parent, rootList )
+        self.assertIs( subtask.getParent(), task )
+
+    def test_childInRoots(self):
+        task = Task( "task1" )
+        subtask = task.addSubItem( Task( "subtask" ) )
+        rootList = [ task, subtask ]
+
+        report = validate_items( rootList, rootList.append )
+        self.assertEqual( report.removedRoots, [ subtask ] )
+        self.assertEqual( rootList, [ task ] )
+
+    def test_invalidParent(self):
+        task1 = Task( "task1" )
+        task2 = Task( "task2" )
+        subtask = task1.addSubItem( Task( "subtask" ) )
+        subtask.setParent( task2 )
+        rootList = [ task1, task2 ]
+
+        report = validate_items( rootList, rootList.append )
+        self.assertEqual( report.reparented, [ ( subtask, task2, task1 ) ] )
+        self.assertIs( subtask.getParent(), task1 )
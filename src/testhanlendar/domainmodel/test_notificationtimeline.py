@@ -0,0 +1,97 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import datetime
+from datetime import timedelta
+
+from hanlendar.domainmodel.reminder import Reminder
+from hanlendar.domainmodel.local.manager import LocalManager as Manager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class NotificationTimelineTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_popNotifications(self):
+        manager = Manager()
+        currTime = datetime.datetime.today()
+        task1 = manager.addNewDeadlineDateTime( currTime + timedelta( hours=2 ), "task1" )
+        task2 = manager.addNewDeadlineDateTime( currTime + timedelta( hours=1 ), "task2" )
+
+        timeline = manager.getNotificationTimeline()
+        self.assertEqual( timeline.getNextTime(), task2.occurrenceDue )
+
+        notifs = timeline.popNotifications( currTime + timedelta( hours=1, minutes=30 ) )
+        self.assertEqual( [ notif.task for notif in notifs ], [ task2 ] )
+        self.assertEqual( timeline.getNextTime(), task1.occurrenceDue )
+
+    def test_farNotification(self):
+        manager = Manager()
+        currTime = datetime.datetime.today()
+        dueTime = currTime + timedelta( days=60 )
+        task = manager.addNewDeadlineDateTime( dueTime, "task1" )
+        task.addReminder( Reminder( 30 ) )
+
+        timeline = manager.getNotificationTimeline()
+        self.assertEqual( len( timeline._queue ), 0 )
+        self.assertEqual( timeline.getNextTime( currTime ), dueTime - timedelta( days=30 ) )
+
+        notifs = timeline.popNotifications( currTime + timedelta( days=31 ) )
+        self.assertEqual( len( notifs ), 1 )
+        self.assertEqual( timeline.getNextTime( currTime + timedelta( days=31 ) ), dueTime )
+        notifs = timeline.popNotifications( dueTime )
+        self.assertEqual( len( notifs ), 1 )
+        self.assertEqual( timeline.getNextTime( dueTime ), None )
+
+    def test_update(self):
+        manager = Manager()
+        currTime = datetime.datetime.today()
+        task = manager.addNewDeadlineDateTime( currTime + timedelta( hours=2 ), "task1" )
+        timeline = manager.getNotificationTimeline()
+        self.assertEqual( timeline.getNextTime(), task.occurrenceDue )
+
+        task.dueDateTime = currTime + timedelta( hours=3 )
+        self.assertEqual( timeline.getNextTime(), task.occurrenceDue )
+        self.assertTrue( timeline.isValid() )
+
+        task2 = manager.addNewDeadlineDateTime( currTime + timedelta( hours=1 ), "task2" )
+        self.assertEqual( timeline.getNextTime(), task2.occurrenceDue )
+
+        manager.removeTask( task2 )
+        self.assertEqual( timeline.getNextTime(), task.occurrenceDue )
+
+        ## notifications of subtasks are not handled
+        manager.removeTask( task )
+        task2.addSubItem( task )
+        manager.addTask( task2 )
+        task2.dueDateTime = currTime + timedelta( hours=4 )
+        self.assertEqual( timeline.getNextTime(), task2.occurrenceDue )
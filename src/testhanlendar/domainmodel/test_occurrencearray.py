@@ -0,0 +1,124 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+from unittest import mock
+
+import random
+import datetime
+from datetime import timedelta
+
+from hanlendar.domainmodel.recurrent import Recurrent, RepeatType
+from hanlendar.domainmodel import occurrencearray
+from hanlendar.domainmodel.occurrencearray import OccurrenceArray, create_occurrence_index
+from hanlendar.domainmodel.occurrenceindex import OccurrenceIndex
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+def random_task( generator, num ):
+    task = Task( "task%s" % num )
+    dueDate = datetime.datetime( 2020, 1, 1, 12, 0 ) + timedelta( days=generator.randint( 0, 500 ) )
+    if generator.randint( 0, 3 ) == 0:
+        task.setDeadlineDateTime( dueDate )
+    else:
+        task.startDateTime = dueDate - timedelta( days=generator.randint( 0, 40 ) )
+        task.dueDateTime   = dueDate
+    mode = generator.choice( [ None, RepeatType.DAILY, RepeatType.WEEKLY, RepeatType.MONTHLY, RepeatType.YEARLY ] )
+    if mode is not None:
+        task.recurrence = Recurrent( mode, generator.randint( 1, 3 ) )
+        if generator.randint( 0, 1 ) == 0:
+            task.recurrence.endDate = dueDate.date() + timedelta( days=generator.randint( -10, 400 ) )
+    if generator.randint( 0, 4 ) == 0:
+        subtask = task.addSubTask()
+        subtask.dueDateTime = dueDate - timedelta( days=generator.randint( 0, 3 ) )
+        subtask.recurrence = Recurrent( RepeatType.ASPARENT )
+    return task
+
+
+class OccurrenceArrayTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        if occurrencearray.numpy is None:
+            self.skipTest( "NumPy not available" )
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_getOccurrencesForDate_monthly_clamp(self):
+        task = Task( "task1" )
+        task.startDateTime = datetime.datetime( 2020, 1, 30, 8, 0 )
+        task.dueDateTime   = datetime.datetime( 2020, 1, 31, 8, 0 )
+        task.recurrence = Recurrent( RepeatType.MONTHLY, 1 )
+
+        index = OccurrenceArray()
+        index.build( [ task ] )
+        entries = index.getOccurrencesForDate( datetime.date( 2020, 2, 29 ) )
+        self.assertEqual( len( entries ), 1 )
+        self.assertEqual( entries[0].offset, 1 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 3, 1 ) ) ), 0 )
+        entries = index.getOccurrencesForDate( datetime.date( 2020, 4, 30 ) )
+        self.assertEqual( len( entries ), 1 )
+        self.assertEqual( entries[0].offset, 3 )
+
+    def test_getOccurrencesForRange_random(self):
+        generator = random.Random( 7 )
+        tasks = [ random_task( generator, i ) for i in range( 0, 200 ) ]
+        allTasks = list()
+        for task in tasks:
+            allTasks.append( task )
+            allTasks.extend( task.getAllSubItems() )
+
+        index = OccurrenceArray()
+        index.build( allTasks )
+        startDate = datetime.date( 2019, 12, 20 )
+        occurrences = index.getOccurrencesForRange( startDate, startDate + timedelta( days=800 ) )
+        self.assertEqual( len( occurrences ), 801 )
+        for currDate, entries in occurrences.items():
+            expected = [ task.getTaskOccurrenceForDate( currDate ) for task in allTasks ]
+            expected = [ ( entry.task, entry.offset ) for entry in expected if entry is not None ]
+            received = [ ( entry.task, entry.offset ) for entry in entries ]
+            self.assertEqual( received, expected, currDate )
+
+    def test_update(self):
+        task1 = Task( "task1" )
+        task1.setDefaultDate( datetime.date( 2020, 5, 17 ) )
+        task2 = Task( "task2" )
+        task2.setDefaultDate( datetime.date( 2020, 5, 18 ) )
+
+        index = OccurrenceArray()
+        index.build( [ task1, task2 ] )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 1 )
+
+        task2.setDefaultDate( datetime.date( 2020, 5, 17 ) )
+        index.itemChanged( task2, "dueDateTime" )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 2 )
+
+        index.subItemRemoved( None, task1 )
+        entries = index.getOccurrencesForDate( datetime.date( 2020, 5, 17 ) )
+        self.assertEqual( len( entries ), 1 )
+        self.assertEqual( entries[0].task, task2 )
+
+    def test_create_occurrence_index(self):
+        self.assertIsInstance( create_occurrence_index(), OccurrenceArray )
+        with mock.patch.object( occurrencearray, "numpy", None ):
+            self.assertIsInstance( create_occurrence_index(), OccurrenceIndex )
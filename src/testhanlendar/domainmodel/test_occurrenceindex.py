@@ -0,0 +1,170 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+import datetime
+from datetime import timedelta
+
+from hanlendar.domainmodel.recurrent import Recurrent, RepeatType
+from hanlendar.domainmodel.occurrenceindex import OccurrenceIndex
+from hanlendar.domainmodel.local.manager import LocalManager as Manager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class OccurrenceIndexTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_getOccurrencesForDate_single(self):
+        task = Task( "task1" )
+        task.startDateTime = datetime.datetime( 2020, 5, 17, 8, 0 )
+        task.dueDateTime   = datetime.datetime( 2020, 5, 19, 8, 0 )
+
+        index = OccurrenceIndex()
+        index.build( [ task ] )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 5, 16 ) ) ), 0 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 5, 17 ) ) ), 1 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 5, 19 ) ) ), 1 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 5, 20 ) ) ), 0 )
+
+    def test_getOccurrencesForDate_long(self):
+        task = Task( "task1" )
+        task.startDateTime = datetime.datetime( 2020, 1, 1, 8, 0 )
+        task.dueDateTime   = datetime.datetime( 2023, 1, 1, 8, 0 )
+
+        index = OccurrenceIndex()
+        index.build( [ task ] )
+        self.assertEqual( len( index._dayBuckets ), 0 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2021, 6, 1 ) ) ), 1 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2023, 1, 2 ) ) ), 0 )
+
+    def test_getOccurrencesForDate_recurrent(self):
+        task = Task( "task1" )
+        task.dueDateTime = datetime.datetime( 2020, 5, 17, 8, 0 )
+        task.recurrence = Recurrent()
+        task.recurrence.setWeekly()
+        task.recurrence.endDate = datetime.date( 2020, 6, 1 )
+
+        index = OccurrenceIndex()
+        index.build( [ task ] )
+        entries = index.getOccurrencesForDate( datetime.date( 2020, 5, 24 ) )
+        self.assertEqual( len( entries ), 1 )
+        self.assertEqual( entries[0].offset, 1 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 5, 25 ) ) ), 0 )
+        self.assertEqual( len( index.getOccurrencesForDate( datetime.date( 2020, 6, 7 ) ) ), 0 )
+
+    def test_consistency(self):
+        manager = Manager()
+        startDate = datetime.datetime( 2020, 5, 1, 12, 0 )
+        manager.getTaskOccurrencesForDate( startDate.date() )      ## build index before changes
+        for i in range( 0, 40 ):
+            task = manager.addNewTaskDateTime( startDate + timedelta( days=i % 13, hours=i ), "task%s" % i )
+            if i % 3 == 0:
+                task.dueDateTime = task.dueDateTime + timedelta( days=i % 5 )
+            if i % 4 == 0:
+                task.recurrence = Recurrent( RepeatType.DAILY, i % 7 + 1 )
+            if i % 5 == 0:
+                task.addSubItem( Task( "sub%s" % i ) ).setDefaultDateTime( startDate + timedelta( days=i ) )
+
+        allTasks = manager.getTasksAll()
+        for day in range( 0, 60 ):
+            currDate = startDate.date() + timedelta( days=day )
+            expected = [ task.getTaskOccurrenceForDate( currDate ) for task in allTasks ]
+            expected = set( ( entry.task, entry.offset ) for entry in expected if entry is not None )
+            entries = manager.getTaskOccurrencesForDate( currDate )
+            received = set( ( entry.task, entry.offset ) for entry in entries )
+            self.assertEqual( received, expected )
+
+    def test_manager_addTask(self):
+        manager = Manager()
+        taskDate = datetime.date( 2020, 5, 17 )
+        manager.addNewTask( taskDate, "task1" )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 1 )
+        self.assertTrue( manager._occurrenceIndex.isValid() )
+
+        task2 = manager.addNewTask( taskDate, "task2" )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 2 )
+
+        subtask = task2.addSubItem( Task( "subtask" ) )
+        subtask.setDefaultDate( taskDate )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 3 )
+
+        manager.removeTask( task2 )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 1 )
+        self.assertTrue( manager._occurrenceIndex.isValid() )
+
+    def test_manager_moveTask(self):
+        manager = Manager()
+        taskDate = datetime.date( 2020, 5, 17 )
+        task = manager.addNewTask( taskDate, "task1" )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 1 )
+
+        nextDate = taskDate + timedelta( days=3 )
+        task.setDefaultDate( nextDate )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 0 )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( nextDate ) ), 1 )
+
+    def test_manager_replaceTask(self):
+        manager = Manager()
+        taskDate = datetime.date( 2020, 5, 17 )
+        task = manager.addNewTask( taskDate, "task1" )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 1 )
+
+        newTask = Task( "task2" )
+        nextDate = taskDate + timedelta( days=3 )
+        newTask.setDefaultDate( nextDate )
+        manager.replaceTask( task, newTask )
+        self.assertEqual( len( manager.getTaskOccurrencesForDate( taskDate ) ), 0 )
+        entries = manager.getTaskOccurrencesForDate( nextDate )
+        self.assertEqual( len( entries ), 1 )
+        self.assertEqual( entries[0].title, "task2" )
+
+    def test_manager_getTaskOccurrencesForRange(self):
+        manager = Manager()
+        startDate = datetime.datetime( 2020, 5, 1, 12, 0 )
+        for i in range( 0, 30 ):
+            task = manager.addNewTaskDateTime( startDate + timedelta( days=i % 11, hours=i ), "task%s" % i )
+            if i % 3 == 0:
+                task.dueDateTime = task.dueDateTime + timedelta( days=i % 4 )
+            if i % 4 == 0:
+                task.recurrence = Recurrent( RepeatType.WEEKLY, i % 3 + 1 )
+            if i % 6 == 0:
+                task.setCompleted()
+
+        firstDate = startDate.date() - timedelta( days=5 )
+        lastDate  = startDate.date() + timedelta( days=50 )
+        for includeCompleted in [ True, False ]:
+            occurrences = manager.getTaskOccurrencesForRange( firstDate, lastDate, includeCompleted )
+            self.assertEqual( len( occurrences ), 56 )
+            for currDate, entries in occurrences.items():
+                expected = manager.getTaskOccurrencesForDate( currDate, includeCompleted )
+                expected = [ ( entry.task, entry.offset ) for entry in expected ]
+                received = [ ( entry.task, entry.offset ) for entry in entries ]
+                self.assertEqual( received, expected )
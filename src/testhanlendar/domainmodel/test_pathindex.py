@@ -0,0 +1,86 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import unittest
+
+import random
+
+from hanlendar.domainmodel.item import Item
+from hanlendar.domainmodel.pathindex import PathIndex
+from hanlendar.domainmodel.local.manager import LocalManager as Manager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class PathIndexTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_getCoords(self):
+        task1 = Task( "task1" )
+        task2 = Task( "task2" )
+        subtask = task2.addSubItem( Task( "subtask" ) )
+
+        index = PathIndex()
+        index.build( [ task1, task2 ] )
+        self.assertEqual( index.getCoords( task1 ), [0] )
+        self.assertEqual( index.getCoords( subtask ), [1, 0] )
+        self.assertEqual( index.getRow( task2 ), 1 )
+        self.assertEqual( index.getCoords( Task( "other" ) ), None )
+
+    def test_removeTask_roots(self):
+        manager = Manager()
+        tasks = [ manager.addTask( Task( "task%s" % i ) ) for i in range( 6 ) ]
+        self.assertEqual( manager.getTaskRow( tasks[5] ), 5 )
+        for task in [ tasks[5], tasks[0], tasks[3] ]:
+            self.assertIs( manager.removeTask( task ), task )
+        self.assertEqual( [ task.title for task in manager.getTasks() ], [ "task1", "task2", "task4" ] )
+        self.assertEqual( [ manager.getTaskRow( task ) for task in manager.getTasks() ], [ 0, 1, 2 ] )
+        self.assertIsNone( manager.removeTask( tasks[0] ) )
+
+    def test_manager_consistency(self):
+        generator = random.Random( 3 )
+        manager = Manager()
+        for i in range( 0, 200 ):
+            allTasks = manager.getTasksAll()
+            operation = generator.randint( 0, 4 )
+            if operation == 0 and allTasks:
+                manager.removeTask( generator.choice( allTasks ) )
+            elif operation == 1 and allTasks:
+                parent = generator.choice( allTasks )
+                position = generator.randint( -1, len( parent.getSubitems() or [] ) )
+                parent.addSubItem( Task( "task%s" % i ), position )
+            elif operation == 2 and allTasks:
+                oldTask = generator.choice( allTasks )
+                manager.replaceTask( oldTask, Task( "task%s" % i ) )
+            elif operation == 3:
+                position = generator.randint( 0, len( manager.tasks ) )
+                manager.insertTask( Task( "task%s" % i ), [ position ] )
+            else:
+                manager.addTask( Task( "task%s" % i ) )
+
+            for task in manager.getTasksAll():
+                self.assertEqual( manager.getTaskCoords( task ), Item.getItemCoords( manager.tasks, task ) )
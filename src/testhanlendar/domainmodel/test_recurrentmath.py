@@ -0,0 +1,157 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+import random
+
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+
+from hanlendar.domainmodel import recurrentmath
+from hanlendar.domainmodel.recurrentmath import floor_multiplication, ceil_multiplication, add_months
+
+
+## previous implementation based on iterative search -- used as reference
+def legacy_find_multiplication( startDate: date, endDate: date, offset: relativedelta ) -> int:
+    dateTD = endDate - startDate
+    diffDays = dateTD.days
+
+    maxDaysOffset = offset.years * 366 + offset.months * 31 + offset.weeks * 7 + offset.days + 1
+
+    ret = int(diffDays / maxDaysOffset)
+    mul = int(ret / 2)
+    mul = max( mul, 1 )
+
+    startDate += offset * ret
+    while mul > 0:
+        startDate += offset * mul
+        if startDate <= endDate:
+            ret += mul
+        else:
+            mul = int(mul / 2)
+
+    return ret
+
+
+## previous implementation based on iterative search -- used as reference
+def legacy_find_multiplication_after( startDate: date, endDate: date, offset: relativedelta ) -> int:
+    multiplicator = legacy_find_multiplication( startDate, endDate, offset )
+    if multiplicator < 0:
+        return multiplicator
+
+    startDate += offset * (multiplicator - 1)
+    while startDate < endDate:
+        startDate += offset
+        multiplicator += 1
+
+    return multiplicator - 1
+
+
+def random_offset( generator: random.Random ) -> relativedelta:
+    mode = generator.randint( 0, 3 )
+    every = generator.randint( 1, 6 )
+    if mode == 0:
+        return relativedelta( days=every )
+    if mode == 1:
+        return relativedelta( days=7 * every )
+    if mode == 2:
+        return relativedelta( months=every )
+    return relativedelta( years=every )
+
+
+class RecurrentMathTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_add_months(self):
+        generator = random.Random( 1 )
+        for _ in range( 0, 2000 ):
+            startDate = date( 1990, 1, 1 ) + timedelta( days=generator.randint( 0, 20000 ) )
+            months = generator.randint( -100, 100 )
+            self.assertEqual( add_months( startDate, months ), startDate + relativedelta( months=months ) )
+
+    def test_floor_multiplication_monthEnd(self):
+        offset = relativedelta( months=1 )
+        startDate = date( 2020, 1, 31 )
+        self.assertEqual( floor_multiplication( startDate, date( 2020, 2, 28 ), offset ), 0 )
+        self.assertEqual( floor_multiplication( startDate, date( 2020, 2, 29 ), offset ), 1 )
+        self.assertEqual( floor_multiplication( startDate, date( 2020, 3, 30 ), offset ), 1 )
+        self.assertEqual( floor_multiplication( startDate, date( 2020, 3, 31 ), offset ), 2 )
+
+    def test_ceil_multiplication_monthEnd(self):
+        offset = relativedelta( months=1 )
+        startDate = date( 2020, 1, 31 )
+        self.assertEqual( ceil_multiplication( startDate, date( 2020, 2, 29 ), offset ), 1 )
+        self.assertEqual( ceil_multiplication( startDate, date( 2020, 3, 1 ), offset ), 2 )
+        self.assertEqual( ceil_multiplication( startDate, date( 2020, 3, 31 ), offset ), 2 )
+        self.assertEqual( ceil_multiplication( startDate, date( 2019, 12, 31 ), offset ), -1 )
+
+    def test_definition(self):
+        ## check closed-form against definition for random input
+        generator = random.Random( 2 )
+        for _ in range( 0, 3000 ):
+            startDate = date( 1990, 1, 1 ) + timedelta( days=generator.randint( 0, 20000 ) )
+            endDate   = startDate + timedelta( days=generator.randint( -3000, 3000 ) )
+            offset    = random_offset( generator )
+
+            floorMul = floor_multiplication( startDate, endDate, offset )
+            self.assertLessEqual( startDate + offset * floorMul, endDate )
+            self.assertGreater( startDate + offset * ( floorMul + 1 ), endDate )
+
+            ceilMul = ceil_multiplication( startDate, endDate, offset )
+            self.assertGreaterEqual( startDate + offset * ceilMul, endDate )
+            self.assertLess( startDate + offset * ( ceilMul - 1 ), endDate )
+
+    def test_search_fallback(self):
+        generator = random.Random( 3 )
+        for _ in range( 0, 1000 ):
+            startDate = date( 1990, 1, 1 ) + timedelta( days=generator.randint( 0, 20000 ) )
+            endDate   = startDate + timedelta( days=generator.randint( -3000, 3000 ) )
+            offset    = random_offset( generator )
+            # pylint: disable=W0212
+            self.assertEqual( recurrentmath._search_floor( startDate, endDate, offset ),
+                              floor_multiplication( startDate, endDate, offset ) )
+            self.assertEqual( recurrentmath._search_ceil( startDate, endDate, offset ),
+                              ceil_multiplication( startDate, endDate, offset ) )
+
+    def test_legacy_equivalence(self):
+        ## previous implementation steps iteratively, so it drifts on month ends
+        ## (31 Jan -> 29 Feb -> 29 Mar), so compare only days present in all months
+        generator = random.Random( 4 )
+        for _ in range( 0, 3000 ):
+            startDate = date( 1990, 1, 1 ) + timedelta( days=generator.randint( 0, 20000 ) )
+            startDate = startDate.replace( day=min( startDate.day, 28 ) )
+            endDate   = startDate + timedelta( days=generator.randint( 0, 3000 ) )
+            offset    = random_offset( generator )
+
+            self.assertEqual( ceil_multiplication( startDate, endDate, offset ),
+                              legacy_find_multiplication_after( startDate, endDate, offset ) )
+            ## legacy search returns lower bound of the value
+            self.assertGreaterEqual( floor_multiplication( startDate, endDate, offset ),
+                                     legacy_find_multiplication( startDate, endDate, offset ) )
@@ -0,0 +1,122 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import unittest
+
+from hanlendar.domainmodel.searchindex import SearchIndex, tokenize
+from hanlendar.domainmodel.local.manager import LocalManager as Manager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_tokenize(self):
+        self.assertEqual( tokenize( "Call Doctor, 10:30!" ), [ "call", "doctor", "10", "30" ] )
+        self.assertEqual( tokenize( None ), [] )
+
+    def test_search_ranking(self):
+        index = SearchIndex()
+        index.addDocument( "exact", [ ( "dentist", 1 ) ] )
+        index.addDocument( "prefix", [ ( "dentistry", 1 ) ] )
+        index.addDocument( "substring", [ ( "superdentist", 1 ) ] )
+        index.addDocument( "other", [ ( "doctor", 1 ) ] )
+
+        scores = index.search( "dentist" )
+        self.assertEqual( set( scores.keys() ), set( [ "exact", "prefix", "substring" ] ) )
+        self.assertGreater( scores[ "exact" ], scores[ "prefix" ] )
+        self.assertGreater( scores[ "prefix" ], scores[ "substring" ] )
+
+    def test_search_shortTerm(self):
+        index = SearchIndex()
+        index.addDocument( "prefix", [ ( "dentist", 1 ) ] )
+        index.addDocument( "substring", [ ( "superdentist", 1 ) ] )
+        ## short terms are matched only by prefix
+        self.assertEqual( list( index.search( "de" ).keys() ), [ "prefix" ] )
+
+    def test_search_allTerms(self):
+        index = SearchIndex()
+        index.addDocument( "both", [ ( "doctor", 2 ), ( "invoice", 1 ) ] )
+        index.addDocument( "one", [ ( "doctor invoice", 1 ) ] )
+        index.addDocument( "first", [ ( "doctor", 1 ) ] )
+        scores = index.search( "invoice doc" )
+        self.assertEqual( set( scores.keys() ), set( [ "both", "one" ] ) )
+        self.assertGreater( scores[ "both" ], scores[ "one" ] )
+
+    def test_search_limit(self):
+        index = SearchIndex()
+        for i in range( 0, 10 ):
+            index.addDocument( "doc%s" % i, [ ( "dentistry", 1 ) ] )
+        index.addDocument( "best", [ ( "dentist", 2 ) ] )
+        scores = index.search( "dentist", 3 )
+        self.assertEqual( len( scores ), 3 )
+        self.assertIn( "best", scores )
+
+    def test_removeDocument(self):
+        index = SearchIndex()
+        index.addDocument( "doc1", [ ( "dentist", 1 ) ] )
+        index.addDocument( "doc2", [ ( "dentist doctor", 1 ) ] )
+        index.removeDocument( "doc2" )
+        self.assertEqual( list( index.search( "dentist" ).keys() ), [ "doc1" ] )
+        self.assertEqual( index.search( "doctor" ), {} )
+        self.assertEqual( index.search( "octo" ), {} )
+        self.assertEqual( len( index ), 1 )
+
+    def test_manager_search(self):
+        manager = Manager()
+        task = manager.addTask( Task( "Visit dentist" ) )
+        subtask = task.addSubItem( Task( "buy toothpaste" ) )
+        todo = manager.addNewToDo( "call dentist" )
+        manager.addNote( "shopping", "toothpaste and soap" )
+
+        hits = manager.search( "dentist" )
+        self.assertEqual( set( hit.item for hit in hits ), set( [ task, todo ] ) )
+
+        hits = manager.search( "tooth" )
+        self.assertEqual( [ hit.item for hit in hits if hit.item is not None ], [ subtask ] )
+        self.assertEqual( [ hit.note for hit in hits if hit.note is not None ], [ "shopping" ] )
+
+    def test_manager_search_update(self):
+        manager = Manager()
+        task = manager.addTask( Task( "Visit dentist" ) )
+        self.assertEqual( len( manager.search( "dentist" ) ), 1 )
+
+        task.title = "Visit doctor"
+        self.assertEqual( len( manager.search( "dentist" ) ), 0 )
+        self.assertEqual( len( manager.search( "doctor" ) ), 1 )
+
+        task.description = "dentist appointment"
+        self.assertEqual( len( manager.search( "dentist" ) ), 1 )
+
+        manager.removeTask( task )
+        self.assertEqual( len( manager.search( "doctor" ) ), 0 )
+
+        notes = manager.getNotes()
+        notes[ "note" ] = "visit doctor"
+        self.assertEqual( [ hit.note for hit in manager.search( "doctor" ) ], [ "note" ] )
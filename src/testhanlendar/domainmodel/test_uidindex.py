@@ -0,0 +1,97 @@
+# MIT License
+#
+# Copyright (c) 2020 Arkadiusz Netczuk <dev.arnet@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import unittest
+
+from hanlendar.domainmodel.uidindex import UIDIndex
+from hanlendar.domainmodel.local.manager import LocalManager as Manager
+from hanlendar.domainmodel.local.task import LocalTask as Task
+from hanlendar.domainmodel.local.todo import LocalToDo as ToDo
+
+
+class UIDIndexTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_findByUID(self):
+        task = Task( "task1" )
+        subtask = task.addSubItem( Task( "subtask" ) )
+        index = UIDIndex()
+        index.build( [ task, subtask ] )
+        self.assertIs( index.findByUID( task.UID ), task )
+        self.assertIs( index.findByUID( subtask.UID ), subtask )
+        self.assertIs( index.findByUID( "xxx" ), None )
+
+    def test_duplicated(self):
+        task1 = Task( "task1" )
+        task2 = Task( "task2" )
+        task2.UID = task1.UID
+        index = UIDIndex()
+        index.build( [ task1, task2 ] )
+        self.assertIs( index.findByUID( task1.UID ), task1 )
+
+        index.removeItemTree( task1 )
+        self.assertFalse( index.isValid() )
+
+    def test_manager_findTaskByUID(self):
+        manager = Manager()
+        task = manager.addTask( Task( "task1" ) )
+        self.assertIs( manager.findTaskByUID( task.UID ), task )
+        self.assertTrue( manager._taskUIDIndex.isValid() )
+
+        subtask = task.addSubItem( Task( "subtask" ) )
+        self.assertIs( manager.findTaskByUID( subtask.UID ), subtask )
+
+        oldUID = subtask.UID
+        subtask.UID = "new-uid"
+        self.assertIs( manager.findTaskByUID( oldUID ), None )
+        self.assertIs( manager.findTaskByUID( "new-uid" ), subtask )
+
+        newTask = Task( "task2" )
+        manager.replaceTask( task, newTask )
+        self.assertIs( manager.findTaskByUID( task.UID ), None )
+        self.assertIs( manager.findTaskByUID( "new-uid" ), None )
+        self.assertIs( manager.findTaskByUID( newTask.UID ), newTask )
+
+        manager.removeTask( newTask )
+        self.assertIs( manager.findTaskByUID( newTask.UID ), None )
+        self.assertTrue( manager._taskUIDIndex.isValid() )
+
+    def test_manager_findToDoByUID(self):
+        manager = Manager()
+        todo = manager.addToDo( ToDo( "todo1" ) )
+        self.assertIs( manager.findToDoByUID( todo.UID ), todo )
+        self.assertIs( manager.findTaskByUID( todo.UID ), None )
+
+        subtodo = ToDo( "subtodo" )
+        manager.insertToDo( subtodo, [0, 0] )
+        self.assertIs( manager.findToDoByUID( subtodo.UID ), subtodo )
+
+        manager.removeToDo( subtodo )
+        self.assertIs( manager.findToDoByUID( subtodo.UID ), None )
@@ -23,6 +23,11 @@
 
 
 import unittest
+from unittest import mock
+
+import os
+import tempfile
+import datetime
 
 import hanlendar.persist as persist
 
@@ -91,3 +96,77 @@ class RenamingUnpicklerTest(unittest.TestCase):
 
         self.assertEqual( module, "bbb" )
         self.assertEqual( name, "xxx" )
+
+
+class ObjectStoreTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            dataFile = os.path.join( dataDir, "data.obj" )
+            store = persist.ObjectStore()
+            self.assertTrue( store.store( [ 1, 2 ], dataFile ) )
+            self.assertEqual( store.getDigest( dataFile ), persist.calculate_checksum( dataFile ) )
+
+            with mock.patch( "filecmp.cmp" ) as cmpMock:
+                self.assertFalse( store.store( [ 1, 2 ], dataFile ) )
+                self.assertTrue( store.store( [ 3 ], dataFile ) )
+                cmpMock.assert_not_called()
+            self.assertEqual( persist.load_object( dataFile ), [ 3 ] )
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            dataFile = os.path.join( dataDir, "data.obj" )
+            persist.store_object( [ 1, 2 ], dataFile )
+            store = persist.ObjectStore()
+            self.assertEqual( store.load( dataFile ), [ 1, 2 ] )
+            with mock.patch( "filecmp.cmp" ) as cmpMock:
+                self.assertFalse( store.store( [ 1, 2 ], dataFile ) )
+                cmpMock.assert_not_called()
+
+
+class BackupTest(unittest.TestCase):
+    def setUp(self):
+        ## Called before testfunction is executed
+        pass
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        pass
+
+    def test_convert_legacy_backups(self):
+        with tempfile.TemporaryDirectory() as dataDir:
+            for fileName in [ "data.zip", "data.zip.1", "data.zip.2" ]:
+                with open( os.path.join( dataDir, fileName ), 'w' ) as fp:
+                    fp.write( fileName )
+            persist.convert_legacy_backups( dataDir )
+            backups = persist.list_backups( dataDir )
+            contents = list()
+            for entry in backups:
+                with open( entry.path ) as fp:
+                    contents.append( fp.read() )
+            self.assertEqual( contents, [ "data.zip", "data.zip.1", "data.zip.2" ] )
+
+    def test_RetentionPolicy(self):
+        currTime = datetime.datetime( 2020, 6, 30, 12, 0 )
+        times = [ currTime - datetime.timedelta( hours=1 ),         ## today
+                  currTime - datetime.timedelta( hours=2 ),         ## today
+                  currTime - datetime.timedelta( days=1 ),          ## daily
+                  currTime - datetime.timedelta( days=1, hours=1 ), ## the same day
+                  currTime - datetime.timedelta( days=40 ),         ## weekly: 2020-05-21
+                  currTime - datetime.timedelta( days=41 ),         ## the same week
+                  currTime - datetime.timedelta( days=50 ) ]        ## other week
+        backups = [ persist.BackupEntry( len( times ) - i, backupTime, None ) for i, backupTime in enumerate( times ) ]
+        policy = persist.RetentionPolicy( keepAllDays=1, dailyDays=30 )
+        removed = policy.findRemoved( backups, currTime )
+        self.assertEqual( [ entry.sequence for entry in removed ], [ 4, 2 ] )
+
+        policy = persist.RetentionPolicy( keepAllDays=1, dailyDays=30, weeklyWeeks=2 )
+        removed = policy.findRemoved( backups, currTime )
+        self.assertEqual( [ entry.sequence for entry in removed ], [ 4, 2, 1 ] )